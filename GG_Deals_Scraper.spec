@@ -6,6 +6,10 @@ import importlib
 
 block_cipher = None
 
+# GG_DEALS_ONEDIR=1 builds a folder instead of a single file: no unpacking to
+# _MEIPASS on every launch, so cold start is just the imports
+ONEDIR = os.environ.get("GG_DEALS_ONEDIR") == "1"
+
 # Locate the undetected_chromedriver package so we can bundle it
 uc_pkg = os.path.dirname(importlib.import_module("undetected_chromedriver").__file__)
 
@@ -37,11 +41,32 @@ a = Analysis(
         "selenium.webdriver.support.expected_conditions",
         "selenium.common.exceptions",
         "scraper",
+        "paths",
+        "price_cache",
+        "http_engine",
+        "async_engine",
+        "pacing",
+        "results_log",
+        "events",
+        "checkpoint",
+        "driver_pool",
+        "matcher",
+        "title_index",
+        "metrics",
+        "coordinator",
+        "retry",
+        "governor",
+        "results_index",
+        "startup",
+        "price_history",
+        "inflight",
+        "jobs",
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Never imported; keeps them out of the archive unpacked at every launch
+    excludes=["tkinter", "test", "pydoc_data"],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -53,10 +78,9 @@ pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
+    *([] if ONEDIR else [a.binaries, a.zipfiles, a.datas]),
     [],
+    exclude_binaries=ONEDIR,
     name="GG Deals Scraper",
     debug=False,
     bootloader_ignore_signals=False,
@@ -70,3 +94,15 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+if ONEDIR:
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        name="GG Deals Scraper",
+    )
@@ -1,3 +1,6 @@
+import time
+_STARTED = time.perf_counter()   # before the imports below, for --startup-report
+
 import json
 import os
 import sys
@@ -5,7 +8,14 @@ import threading
 import webbrowser
 import atexit
 from flask import Flask, render_template, jsonify, Response, request
-import time
+
+import checkpoint
+import driver_pool
+import jobs
+import metrics
+from events import EventBus, TERMINAL_STATUSES
+from results_index import ResultsIndex, compare, TOP_N
+from results_log import delete_results, log_path
 
 
 def _get_base_dirs():
@@ -31,18 +41,40 @@ GAMES_FILE = os.path.join(DATA_DIR, "games.txt")
 
 app = Flask(__name__, template_folder=os.path.join(BUNDLE_DIR, "templates"))
 
-# ---- Per-tab scraper state ----
+# ---- Run storage: one per tab, one per job ----
+def _new_store(name, results_file, progress_file):
+    """Files, progress events and results index of one tab or job."""
+    return {
+        "name": name,
+        "job": None,               # latest Job run on this store
+        "results_file": results_file,
+        "progress_file": progress_file,
+        "events": EventBus(),
+        "index": ResultsIndex(results_file),
+    }
+
+
 TABS = {}
 for _tab_name in ("trader", "my"):
-    TABS[_tab_name] = {
-        "thread": None,
-        "running": False,
-        "stop_event": threading.Event(),
-        "results_file": os.path.join(DATA_DIR, f"{_tab_name}_results.json"),
-        "progress_file": os.path.join(DATA_DIR, f"{_tab_name}_progress.json"),
-    }
+    TABS[_tab_name] = _new_store(_tab_name, os.path.join(DATA_DIR, f"{_tab_name}_results.json"),
+                                 os.path.join(DATA_DIR, f"{_tab_name}_progress.json"))
 
 VALID_TABS = set(TABS.keys())
+ENGINES = ("browser", "http")
+JOBS_DIR = os.path.join(DATA_DIR, "jobs")
+
+# Also mirror progress to *_progress.json (only needed for "Load Previous" after a restart)
+PERSIST_PROGRESS = True
+
+# Background pre-warm when the page opens: "imports" loads the scraper modules for the
+# selected engine, "browser" also launches a warm Chrome into the pool, "off" disables it
+PREWARM = os.environ.get("GG_DEALS_PREWARM", "imports")
+
+# Shared secret remote workers must send (X-Worker-Token) when set
+WORKER_TOKEN = os.environ.get("GG_DEALS_WORKER_TOKEN")
+
+# Workers all running jobs (tabs included) may use at once; further jobs queue
+WORKER_BUDGET = int(os.environ.get("GG_DEALS_WORKER_BUDGET", jobs.DEFAULT_BUDGET))
 
 
 def _get_tab(tab):
@@ -50,129 +82,457 @@ def _get_tab(tab):
     return TABS.get(tab)
 
 
+def _get_job_store(job_id):
+    """Store of a known job, or None."""
+    job = SCHEDULER.get(job_id)
+    return job.store if job is not None else None
+
+
+def _is_active(store):
+    """True while the store's latest job is queued or running."""
+    job = store["job"]
+    return job is not None and job.active
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
 
 
+def _publisher(t):
+    """on_event for a run: rows go into the tab's results index, then out to SSE clients."""
+    index, bus = t["index"], t["events"]
+
+    def on_event(payload):
+        index.apply(payload.get("rows"))
+        bus.publish(payload)
+    return on_event
+
+
+def _not_modified(index):
+    return request.headers.get("If-None-Match") == index.etag()
+
+
+def _results(t):
+    index = t["index"]
+    index.refresh()
+    if _not_modified(index):
+        return "", 304, {"ETag": index.etag()}
+    # Served from the in-memory index, which includes the rows of a run in progress
+    resp = jsonify(index.all_results())
+    resp.headers["ETag"] = index.etag()
+    resp.headers["Cache-Control"] = "no-cache"   # revalidate with If-None-Match
+    return resp
+
+
 @app.route("/api/results/<tab>")
 def get_results(tab):
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
-    if os.path.exists(t["results_file"]):
-        with open(t["results_file"], "r", encoding="utf-8") as f:
-            results = json.load(f)
-        return jsonify(results)
-    return jsonify([])
-
-
-@app.route("/api/progress/<tab>")
-def get_progress(tab):
+    return _results(t)
+
+
+def _query(t):
+    index = t["index"]
+    index.refresh()
+    if _not_modified(index):
+        return "", 304, {"ETag": index.etag()}
+    args = request.args
+    try:
+        page = index.query(
+            offset=max(0, args.get("offset", 0, type=int)),
+            limit=max(0, args.get("limit", 100, type=int)),
+            show=args.get("filter", "all"),
+            min_confidence=args.get("min_confidence", None, type=float),
+            q=args.get("q", ""),
+            sort=args.get("sort", "idx"),
+            direction="desc" if args.get("dir") == "desc" else "asc",
+            since=args.get("since", None, type=int),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    resp = jsonify(page)
+    resp.headers["ETag"] = index.etag()
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@app.route("/api/results/<tab>/query")
+def query_results(tab):
+    """One page of filtered, sorted results (plus the match count and summary stats).
+
+    Query args: offset, limit (0 = all), filter=all|found|missing, min_confidence,
+    q (text search), sort=idx|name|price|confidence, dir=asc|desc, since=<version>.
+    """
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
+    return _query(t)
+
+
+def _progress(t):
+    latest = t["events"].latest()
+    if latest is not None:
+        return {k: v for k, v in latest.items() if k != "rows"}
     if os.path.exists(t["progress_file"]):
         with open(t["progress_file"], "r", encoding="utf-8") as f:
-            progress = json.load(f)
-        return jsonify(progress)
-    return jsonify({"current": 0, "total": 0, "game": "", "status": "idle", "percent": 0})
+            return json.load(f)
+    return {"current": 0, "total": 0, "game": "", "status": "idle", "percent": 0}
 
 
-@app.route("/api/progress-stream/<tab>")
-def progress_stream(tab):
-    """Server-Sent Events stream for real-time progress updates."""
+@app.route("/api/progress/<tab>")
+def get_progress(tab):
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
-    progress_file = t["progress_file"]
+    return jsonify(_progress(t))
+
+
+def _stream(t):
+    bus = t["events"]
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    after = int(last_id) if last_id and last_id.isdigit() else None
 
     def generate():
-        last_data = None
-        start_time = time.time()
-        stale_count = 0
+        nonlocal after
+        if bus.truncated(after):
+            # History no longer covers the gap; have the client refetch the full results
+            yield "event: resync\ndata: {}\n\n"
+            after = None
+        idle = 0
         while True:
-            if time.time() - start_time > 600:
-                break
-            try:
-                if os.path.exists(progress_file):
-                    with open(progress_file, "r", encoding="utf-8") as f:
-                        data = f.read()
-                    if data != last_data:
-                        last_data = data
-                        stale_count = 0
-                        yield f"data: {data}\n\n"
-                        parsed = json.loads(data)
-                        if parsed.get("status") in ("completed", "stopped", "error"):
-                            break
-                    else:
-                        stale_count += 1
-                else:
-                    stale_count += 1
-
-                if stale_count > 10 and not t["running"]:
-                    break
-
-                time.sleep(0.5)
-            except Exception:
-                time.sleep(1)
-
-    return Response(generate(), mimetype="text/event-stream")
+            events = bus.wait(after, timeout=15.0)
+            if not events:
+                if not _is_active(t):
+                    idle += 1
+                    if idle >= 2:
+                        break
+                yield ": keepalive\n\n"
+                continue
+            idle = 0
+            for event_id, payload in events:
+                after = event_id
+                yield f"id: {event_id}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                if payload.get("status") in TERMINAL_STATUSES:
+                    return
+
+    return Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
-@app.route("/api/start/<tab>", methods=["POST"])
-def start_scraper(tab):
+@app.route("/api/progress-stream/<tab>")
+def progress_stream(tab):
+    """Server-Sent Events stream of progress events pushed by the scraper.
+
+    Each event carries only the rows completed since the previous one.  A
+    reconnecting client sends Last-Event-ID and resumes where it left off;
+    without it the current run is replayed from the start.
+    """
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
+    return _stream(t)
 
-    if t["running"]:
-        return jsonify({"error": "Scraper is already running for this tab"}), 409
 
-    data = request.json or {}
-    workers = max(1, int(data.get("workers", 3)))
-    games_text = data.get("games", "").strip()
-    if not games_text:
-        return jsonify({"error": "No games provided"}), 400
+# ---- Jobs: every run goes through the scheduler ----
+
+def _run_options(data):
+    """Validate the start options shared by a tab's Start and POST /api/jobs.
+
+    Returns (options, error): scrape_prices keyword arguments plus
+    ``distributed`` and ``concurrency``, or an error message for a 400 reply.
+    """
+    engine = data.get("engine", "browser")
+    if engine not in ENGINES:
+        return None, f"Unknown engine '{engine}'"
+    # Optional: number of in-flight lookups for the asyncio runner
+    concurrency = data.get("concurrency")
+    # Search simplified/base-title query variants alongside the original ("off", "on", "base")
+    speculate = data.get("speculate", "off")
+    if speculate not in ("off", "on", "base"):
+        return None, f"Unknown speculate mode '{speculate}'"
+    # "lean" Chrome: eager loads, images/fonts/media/trackers blocked, smaller window
+    profile = data.get("profile", "full")
+    if profile not in ("full", "lean"):
+        return None, f"Unknown profile '{profile}'"
+    # Incremental refresh: "stale" re-scrapes only titles whose price likely moved and
+    # serves the rest from the price history (optionally capped in games and seconds)
+    refresh = data.get("refresh", "full")
+    if refresh not in ("full", "stale"):
+        return None, f"Unknown refresh mode '{refresh}'"
+    refresh_budget = data.get("refresh_budget")
+    refresh_seconds = data.get("refresh_seconds")
 
     seen = set()
     games_list = []
-    for line in games_text.splitlines():
+    for line in data.get("games", "").strip().splitlines():
         name = line.strip()
         if name and name.lower() not in seen:
             seen.add(name.lower())
             games_list.append(name)
 
-    stop_event = t["stop_event"]
-    stop_event.clear()
-    results_file = t["results_file"]
-    progress_file = t["progress_file"]
-    label = f"{tab.capitalize()}/"
-
-    def run_scraper():
-        t["running"] = True
-        try:
+    return {
+        "games_list": games_list,
+        "resume": bool(data.get("resume", False)),
+        # Never more workers than the scheduler's budget (the rest would only queue)
+        "workers": min(max(1, int(data.get("workers", 3))), SCHEDULER.budget),
+        "force_refresh": bool(data.get("force_refresh", False)),
+        "engine": engine,
+        "concurrency": max(1, int(concurrency)) if concurrency else None,
+        # Total tries per game before it is dead-lettered (lookups that raised only)
+        "max_attempts": max(1, int(data.get("max_attempts", 3))),
+        # Coordinator mode: hand the games to remote worker processes (see coordinator.py)
+        "distributed": bool(data.get("distributed", False)),
+        "speculate": speculate,
+        "profile": profile,
+        "refresh": refresh,
+        "refresh_budget": max(0, int(refresh_budget)) if refresh_budget not in (None, "") else None,
+        "refresh_seconds": max(1.0, float(refresh_seconds)) if refresh_seconds not in (None, "") else None,
+    }, None
+
+
+def _run_job(job):
+    """Scheduler runner: one scrape run on the job's store; returns its final status."""
+    t = job.store
+    opts = dict(job.options)
+    distributed = opts.pop("distributed")
+    concurrency = opts.pop("concurrency")
+    progress_file = t["progress_file"] if PERSIST_PROGRESS else False
+    try:
+        if distributed:
+            from coordinator import coordinate_prices as scrape_prices
+            extra = {"name": job.key or job.id}
+        elif concurrency:
+            from async_engine import scrape_prices
+            extra = {"concurrency": concurrency}
+        else:
             from scraper import scrape_prices
-            scrape_prices(
-                headless=False,
-                games_list=games_list,
-                workers=workers,
-                output_file=results_file,
-                progress_file=progress_file,
-                stop_event=stop_event,
-                label=label,
-            )
-        except Exception as e:
-            error_data = {"current": 0, "total": 0, "game": str(e), "status": "error", "percent": 0}
+            extra = {}
+        scrape_prices(
+            headless=False,
+            output_file=t["results_file"],
+            progress_file=progress_file,
+            stop_event=job.stop_event,
+            label=f"{t['name'].capitalize()}/",
+            on_event=_publisher(t),
+            **opts,
+            **extra,
+        )
+    except Exception as e:
+        job.error = str(e)
+        error_data = {"current": 0, "total": 0, "game": str(e), "status": "error", "percent": 0}
+        t["events"].publish(dict(error_data, rows=[]))
+        if progress_file:
             with open(progress_file, "w", encoding="utf-8") as f:
                 json.dump(error_data, f)
-        finally:
-            t["running"] = False
+        return "error"
+    return "stopped" if job.stop_event.is_set() else "completed"
+
+
+def _drop_job_files(job):
+    """Delete a pruned job's files under jobs/ (tab runs keep theirs)."""
+    t = job.store
+    if t is None or any(t is tab for tab in TABS.values()):
+        return
+    checkpoint.remove_files([t["progress_file"]] + checkpoint.run_files(t["results_file"]))
+
+
+SCHEDULER = jobs.JobScheduler(_run_job, budget=WORKER_BUDGET, on_prune=_drop_job_files)
+
+
+def _submit(t, data, key=None, priority=0, job_id=None):
+    """Queue a run on store ``t``.  Returns (job, None) or (None, error reply)."""
+    try:
+        opts, error = _run_options(data)
+    except (TypeError, ValueError) as e:
+        return None, (jsonify({"error": f"Bad option: {e}"}), 400)
+    if error:
+        return None, (jsonify({"error": error}), 400)
+    if opts["resume"]:
+        if not checkpoint.is_resumable(checkpoint.load_run(t["results_file"])):
+            return None, (jsonify({"error": "No unfinished run to resume"}), 404)
+    elif not opts["games_list"]:
+        return None, (jsonify({"error": "No games provided"}), 400)
+
+    def on_submit(job):
+        # Runs before the job can start, so SSE clients never see a stale idle store
+        t["job"] = job
+        t["events"].reset()
+        t["index"].reset(fed=True)
+        t["events"].publish({"current": 0, "total": len(opts["games_list"]), "game": "",
+                             "status": "queued", "percent": 0, "job": job.id, "rows": []})
+
+    try:
+        job = SCHEDULER.submit(t["name"], workers=opts["workers"], priority=priority, options=opts,
+                               store=t, key=key, job_id=job_id, on_submit=on_submit,
+                               # Remote workers bring their own browsers
+                               cost=0 if opts["distributed"] else None)
+    except jobs.JobConflict as e:
+        return None, (jsonify({"error": str(e)}), 409)
+    return job, None
+
+
+def _job_info(job):
+    return dict(job.snapshot(), position=SCHEDULER.position(job), progress=_progress(job.store))
+
+
+def _cancel(job):
+    """Cancel a queued job (its SSE stream ends at once) or stop a running one."""
+    SCHEDULER.cancel(job.id)
+    metrics.inc("stop_requests_total")
+    if job.status == "cancelled":
+        progress = _progress(job.store)
+        job.store["events"].publish(dict(progress, status="stopped", rows=[]))
+    return {"status": "cancelled" if job.status == "cancelled" else "stop_requested", "job": job.id}
+
+
+@app.route("/api/start/<tab>", methods=["POST"])
+def start_scraper(tab):
+    """Start (or queue, when the worker budget is in use) a run on the tab."""
+    t = _get_tab(tab)
+    if not t:
+        return jsonify({"error": "Invalid tab"}), 400
+    job, error = _submit(t, request.json or {}, key=tab)
+    if error:
+        return error
+    if job.status == jobs.QUEUED:
+        return jsonify({"status": "queued", "job": job.id, "position": SCHEDULER.position(job)})
+    return jsonify({"status": "started", "job": job.id})
+
+
+@app.route("/api/jobs", methods=["GET", "POST"])
+def jobs_endpoint():
+    """GET: the scheduler and every known job.  POST: queue a job.
+
+    POST takes the tab Start options (games, workers, engine, ...) plus
+    ``name``, ``priority`` (higher starts first, FIFO among equals) and an
+    optional ``key`` (e.g. a customer id): only one job per key can be
+    queued or running.  Replies 202 with the job.
+    """
+    if request.method == "GET":
+        return jsonify({"scheduler": SCHEDULER.snapshot(),
+                        "jobs": [_job_info(j) for j in SCHEDULER.jobs()]})
+    data = request.json or {}
+    try:
+        priority = int(data.get("priority", 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "priority must be an integer"}), 400
+    job_id = jobs.new_job_id()
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    t = _new_store(str(data.get("name") or f"job-{job_id}"),
+                   os.path.join(JOBS_DIR, f"{job_id}_results.json"),
+                   os.path.join(JOBS_DIR, f"{job_id}_progress.json"))
+    job, error = _submit(t, data, key=data.get("key"), priority=priority, job_id=job_id)
+    if error:
+        return error
+    return jsonify(_job_info(job)), 202
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET", "DELETE"])
+def job_endpoint(job_id):
+    """GET: status, queue position and latest progress.  DELETE: cancel (as /cancel)."""
+    job = SCHEDULER.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if request.method == "DELETE":
+        return jsonify(_cancel(job))
+    return jsonify(_job_info(job))
+
+
+@app.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_job(job_id):
+    job = SCHEDULER.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if not job.active:
+        return jsonify({"error": f"Job is already {job.status}"}), 409
+    return jsonify(_cancel(job))
+
+
+@app.route("/api/jobs/<job_id>/results")
+def job_results(job_id):
+    t = _get_job_store(job_id)
+    if not t:
+        return jsonify({"error": "Unknown job"}), 404
+    return _results(t)
+
+
+@app.route("/api/jobs/<job_id>/results/query")
+def job_query(job_id):
+    """Same query args as /api/results/<tab>/query."""
+    t = _get_job_store(job_id)
+    if not t:
+        return jsonify({"error": "Unknown job"}), 404
+    return _query(t)
+
+
+@app.route("/api/jobs/<job_id>/progress")
+def job_progress(job_id):
+    t = _get_job_store(job_id)
+    if not t:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(_progress(t))
+
+
+@app.route("/api/jobs/<job_id>/progress-stream")
+def job_progress_stream(job_id):
+    t = _get_job_store(job_id)
+    if not t:
+        return jsonify({"error": "Unknown job"}), 404
+    return _stream(t)
+
 
-    t["thread"] = threading.Thread(target=run_scraper, daemon=True)
-    t["thread"].start()
+@app.route("/api/jobs/<job_id>/dead-letters")
+def job_dead_letters(job_id):
+    t = _get_job_store(job_id)
+    if not t:
+        return jsonify({"error": "Unknown job"}), 404
+    run = checkpoint.load_run(t["results_file"])
+    return jsonify(run.get("dead_letters", []) if run else [])
+
+
+@app.route("/api/compare")
+def compare_tabs():
+    """Running trade totals of both tabs: value, priced count, confident value, top titles.
 
-    return jsonify({"status": "started"})
+    Query args: top (titles per tab, at most TOP_N), min_confidence.  The
+    ETag changes only when either tab gets new rows.
+    """
+    trader, mine = TABS["trader"]["index"], TABS["my"]["index"]
+    trader.refresh()
+    mine.refresh()
+    top_n = min(max(0, request.args.get("top", 10, type=int)), TOP_N)
+    min_confidence = request.args.get("min_confidence", None, type=float)
+    etag = f'"{trader.tag()}.{mine.tag()}.{top_n}.{min_confidence}"'
+    if request.headers.get("If-None-Match") == etag:
+        return "", 304, {"ETag": etag}
+    resp = jsonify(compare(trader, mine, top_n=top_n, min_confidence=min_confidence))
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@app.route("/api/run/<tab>")
+def run_info(tab):
+    """Checkpoint ledger of the tab's latest run (done / failed / pending counts)."""
+    t = _get_tab(tab)
+    if not t:
+        return jsonify({"error": "Invalid tab"}), 400
+    info = checkpoint.summary(t["results_file"])
+    if info is None:
+        return jsonify({"run_id": None, "resumable": False})
+    return jsonify(info)
+
+
+@app.route("/api/dead-letters/<tab>")
+def dead_letters(tab):
+    """Games of the tab's latest run that failed every attempt, with their last error."""
+    t = _get_tab(tab)
+    if not t:
+        return jsonify({"error": "Invalid tab"}), 400
+    run = checkpoint.load_run(t["results_file"])
+    return jsonify(run.get("dead_letters", []) if run else [])
 
 
 @app.route("/api/stop/<tab>", methods=["POST"])
@@ -180,10 +540,9 @@ def stop_scraper(tab):
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
-    if not t["running"]:
+    if not _is_active(t):
         return jsonify({"error": "Scraper is not running"}), 409
-    t["stop_event"].set()
-    return jsonify({"status": "stop_requested"})
+    return jsonify(_cancel(t["job"]))
 
 
 @app.route("/api/status/<tab>")
@@ -191,7 +550,94 @@ def scraper_status(tab):
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
-    return jsonify({"running": t["running"]})
+    from governor import get_governor
+    gov = get_governor().snapshot()
+    # This tab's share plus the global picture (rate, tokens, browsers across tabs)
+    return jsonify({"running": _is_active(t), "job": _job_info(t["job"]) if t["job"] else None,
+                    "scheduler": SCHEDULER.snapshot(), "governor": dict(gov, tab=gov["tabs"].get(tab))})
+
+
+@app.route("/api/prewarm", methods=["GET", "POST"])
+def prewarm():
+    """POST {engine} when the page opens: load that engine's modules before the first Start."""
+    import startup
+    if request.method == "GET" or PREWARM == "off":
+        return jsonify(dict(startup.prewarm_state(), mode=PREWARM))
+    engine = (request.json or {}).get("engine", "browser")
+    if engine not in ENGINES:
+        return jsonify({"error": f"Unknown engine '{engine}'"}), 400
+    state = startup.prewarm(engine, launch=PREWARM == "browser")
+    return jsonify(dict(state, mode=PREWARM))
+
+
+@app.route("/api/pool")
+def pool_status():
+    """Warm browser pool shared by both tabs: leased/idle counts, reuse and recycling."""
+    stats = driver_pool.pool_stats()
+    if stats is None:
+        stats = {"max_size": driver_pool.DEFAULT_MAX_SIZE, "leased": 0, "idle": 0, "launching": 0,
+                 "created": 0, "reused": 0, "recycled": 0, "warmup_seconds_saved": 0.0}
+    return jsonify(stats)
+
+
+def _worker_denied():
+    return WORKER_TOKEN and request.headers.get("X-Worker-Token") != WORKER_TOKEN
+
+
+@app.route("/api/work")
+def work_status():
+    """Coordinated runs: queued/leased/remaining games and the workers serving them."""
+    import coordinator
+    return jsonify(coordinator.snapshot())
+
+
+@app.route("/api/work/lease", methods=["POST"])
+def work_lease():
+    if _worker_denied():
+        return jsonify({"error": "Bad worker token"}), 403
+    import coordinator
+    data = request.json or {}
+    worker = str(data.get("worker") or request.remote_addr)
+    max_items = min(max(1, int(data.get("max", coordinator.DEFAULT_BATCH))), coordinator.MAX_BATCH)
+    lease, active = coordinator.lease_any(worker, max_items)
+    return jsonify({"lease": lease, "active": active})
+
+
+@app.route("/api/work/heartbeat", methods=["POST"])
+def work_heartbeat():
+    if _worker_denied():
+        return jsonify({"error": "Bad worker token"}), 403
+    import coordinator
+    ok, revoked = coordinator.heartbeat((request.json or {}).get("lease_id", ""))
+    return jsonify({"ok": ok, "revoked": revoked})
+
+
+@app.route("/api/work/complete", methods=["POST"])
+def work_complete():
+    if _worker_denied():
+        return jsonify({"error": "Bad worker token"}), 403
+    import coordinator
+    data = request.json or {}
+    reports = [r for r in data.get("results") or [] if isinstance(r, dict) and "result" in r]
+    accepted, revoked = coordinator.complete(data.get("lease_id", ""), reports)
+    return jsonify({"accepted": accepted, "revoked": revoked})
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    """Counters and per-stage timing histograms in the Prometheus text format."""
+    return Response(metrics.prometheus_text(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/suggest")
+def suggest_titles():
+    """Autocomplete for the games textarea from titles seen in past lookups."""
+    q = request.args.get("q", "").strip()
+    if len(q) < 2:
+        return jsonify([])
+    limit = min(max(1, request.args.get("limit", 8, type=int)), 25)
+    from title_index import get_index
+    return jsonify(get_index().suggest(q, limit=limit))
 
 
 @app.route("/api/clear-results/<tab>", methods=["POST"])
@@ -199,9 +645,14 @@ def clear_results(tab):
     t = _get_tab(tab)
     if not t:
         return jsonify({"error": "Invalid tab"}), 400
-    for f in (t["results_file"], t["progress_file"]):
+    if _is_active(t):
+        return jsonify({"error": "Cannot clear while the scraper is running"}), 409
+    for f in (t["results_file"], log_path(t["results_file"]),
+              checkpoint.manifest_path(t["results_file"]), t["progress_file"]):
         if os.path.exists(f):
             os.remove(f)
+    t["events"].reset()
+    t["index"].reset()
     return jsonify({"status": "cleared"})
 
 
@@ -215,38 +666,44 @@ def delete_result(tab):
     search_name = data.get("search_name", "")
     if not search_name:
         return jsonify({"error": "Missing search_name"}), 400
+    if _is_active(t):
+        return jsonify({"error": "Cannot delete while the scraper is running"}), 409
 
-    if not os.path.exists(t["results_file"]):
+    # Also tombstones the row in the results log, which reloads and resumes read first
+    remaining = delete_results(t["results_file"], search_name)
+    if remaining is None:
         return jsonify({"error": "No results file"}), 404
+    t["index"].remove(search_name)
 
-    with open(t["results_file"], "r", encoding="utf-8") as f:
-        results = json.load(f)
-
-    updated = [r for r in results if r.get("search_name") != search_name]
-    with open(t["results_file"], "w", encoding="utf-8") as f:
-        json.dump(updated, f, ensure_ascii=False, indent=2)
-
-    return jsonify({"status": "deleted", "remaining": len(updated)})
+    return jsonify({"status": "deleted", "remaining": remaining})
 
 
 def cleanup():
-    """Remove runtime data files on shutdown."""
-    for t in TABS.values():
-        for f in (t["results_file"], t["progress_file"]):
-            try:
-                if os.path.exists(f):
-                    os.remove(f)
-            except Exception:
-                pass
-
-atexit.register(cleanup)
+    """Remove runtime data files on shutdown, keeping checkpoints of unfinished runs."""
+    stores = list(TABS.values())
+    stores += [j.store for j in SCHEDULER.jobs() if j.store not in stores]
+    for t in stores:
+        files = [t["progress_file"]]
+        if not checkpoint.is_resumable(checkpoint.load_run(t["results_file"])):
+            files += checkpoint.run_files(t["results_file"])
+        checkpoint.remove_files(files)
 
 
 if __name__ == "__main__":
     is_frozen = getattr(sys, "frozen", False)
+    # Only the served app cleans up; importing it (tests, benchmarks) must not delete the tabs' files
+    atexit.register(cleanup)
+
+    if "--startup-report" in sys.argv:
+        # Ready-to-serve point for cold-start tracking (python startup.py --exe=...)
+        import startup
+        print(json.dumps(startup.app_report(_STARTED)))
+        sys.exit(0)
 
     if is_frozen:
         # Auto-open the browser for end-users
         threading.Timer(1.5, lambda: webbrowser.open("http://127.0.0.1:5000")).start()
 
-    app.run(debug=not is_frozen, port=5000, threaded=True)
+    # GG_DEALS_HOST=0.0.0.0 lets workers on other machines reach the coordinator endpoints
+    app.run(debug=not is_frozen, host=os.environ.get("GG_DEALS_HOST", "127.0.0.1"), port=5000,
+            threaded=True)
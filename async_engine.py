@@ -0,0 +1,175 @@
+"""Asyncio runner: many in-flight lookups multiplexed over a few browsers.
+
+Selenium is blocking, so each lookup runs on a thread of a dedicated
+executor while the event loop only schedules them.  A semaphore bounds the
+number of in-flight lookups; lookups that need Chrome lease a warm driver
+from the shared pool (at most ``workers`` at a time per run).  With the HTTP engine most lookups never
+touch a driver, so ``concurrency`` can go well beyond the browser count.
+
+``scrape_prices`` takes the same arguments as scraper.scrape_prices (plus
+``concurrency``) and returns identical result dicts.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+import threading
+
+import metrics
+import scraper
+
+DEFAULT_HTTP_CONCURRENCY = 20
+
+
+class BrowserSlots:
+    """Caps how many drivers from the shared pool one run holds at a time."""
+
+    def __init__(self, count, headless, share=None, profile="full"):
+        self.headless = headless
+        self.share = share
+        self.profile = profile
+        self.pool = scraper.get_driver_pool()
+        self._sem = threading.BoundedSemaphore(count)
+
+    def lease(self):
+        """Block until this run has a free slot, then lease a warm driver."""
+        self._sem.acquire()
+        try:
+            return scraper.lease_driver(self.pool, self.headless, self.share, self.profile)
+        except Exception:
+            self._sem.release()
+            raise
+
+    def release(self, driver, info):
+        try:
+            return scraper.release_driver(self.pool, driver, info, self.share)
+        finally:
+            self._sem.release()
+
+
+async def scrape_prices_async(headless=False, games_list=None, workers=3, output_file=None,
+                              progress_file=None, stop_event=None, label="", use_cache=True,
+                              force_refresh=False, cache=None, engine="browser",
+                              extract="script", concurrency=None, fsync="interval",
+                              on_event=None, resume=False,
+                              max_attempts=scraper.DEFAULT_MAX_ATTEMPTS, refresh="full",
+                              refresh_budget=None, refresh_seconds=None, speculate="off",
+                              profile="full"):
+    """Async variant of scraper.scrape_prices.
+
+    ``workers`` is the number of Chrome instances; ``concurrency`` the number
+    of lookups in flight (defaults to ``workers`` for the browser engine and
+    DEFAULT_HTTP_CONCURRENCY for the HTTP engine).
+    """
+    if stop_event is None:
+        scraper.reset_stop()
+    else:
+        stop_event.clear()
+
+    # Before prepare_run: a bad option must not overwrite the manifest or truncate the log
+    scraper._check_modes(engine, extract, speculate, profile, refresh, use_cache)
+    run, results_dict, todo, log = scraper.prepare_run(games_list, output_file, resume=resume,
+                                                       fsync=fsync, label=label)
+    total = len(run["games"])
+
+    cache = scraper._resolve_cache(use_cache, cache)
+    index = scraper._resolve_index(use_cache)
+    history = scraper._resolve_history(use_cache)
+    http = scraper.HttpEngine(scraper.BASE_URL) if engine == "http" else None
+
+    stats = scraper._new_stats()
+    counter = [len(results_dict)]
+    tasks, served = scraper.plan_tasks(todo, history, refresh, refresh_budget, refresh_seconds)
+    scraper.serve_from_history(served, results_dict, counter, stats, log)
+    left = tasks.qsize()
+    timings = metrics.start_run(label)
+    retries = scraper._new_retries(output_file, run, max_attempts)
+    share = scraper.join_governor(label)
+    restored = [{"idx": i, "result": r} for i, r in sorted(results_dict.items())]
+    scraper.update_progress(len(results_dict), total, "", "starting", progress_file=progress_file,
+                            stats=stats, on_event=on_event, rows=restored)
+
+    browsers = max(1, min(workers, left))
+    if concurrency is None:
+        concurrency = DEFAULT_HTTP_CONCURRENCY if engine == "http" else browsers
+    concurrency = max(1, min(concurrency, left))
+    if served:
+        print(f"Serving {len(served)} game(s) from price history {label}")
+    print(f"Starting {concurrency} async {engine} lookup(s) over {browsers} browser(s) "
+          f"for {left} of {total} games... {label}")
+
+    slots = BrowserSlots(browsers, headless, share, profile)
+    prefix = f"[{label}Async]"
+
+    def run_one(idx, game_name):
+        # Executor threads are reused across games; bind each call to its thread's recorder
+        metrics.bind(timings, f"{label}{threading.current_thread().name}")
+        done = scraper.process_game(
+            idx, game_name, slots.lease, slots.release, retries=retries, stats=stats,
+            prefix=prefix, http=http, cache=cache, force_refresh=force_refresh, extract=extract,
+            index=index, share=share, history=history, speculate=speculate)
+        if done is None:
+            return
+        result, info = done
+        scraper.record_result(idx, result, results_dict, counter, total, stats=stats,
+                              info=info, prefix=prefix, output_file=output_file,
+                              progress_file=progress_file, log=log, on_event=on_event)
+
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+    pending = set()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scrape")
+
+    def fresh():
+        try:
+            return tasks.get_nowait()
+        except Empty:
+            return None
+
+    try:
+        while not scraper._is_stopped(stop_event):
+            # Due retries go first; once the list is exhausted, wait for in-flight
+            # lookups and scheduled retries before finishing
+            item = retries.pop_due() or fresh()
+            if item is None:
+                if not pending and not retries.pending():
+                    break
+                await asyncio.sleep(min(0.5, retries.wait_time() or 0.5))
+                continue
+            idx, game_name = item
+            await sem.acquire()
+            if scraper._is_stopped(stop_event):
+                sem.release()
+                break
+            fut = loop.run_in_executor(executor, run_one, idx, game_name)
+            pending.add(fut)
+            fut.add_done_callback(pending.discard)
+            fut.add_done_callback(lambda _f: sem.release())
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        executor.shutdown(wait=True)
+        share.leave()
+    if not scraper._is_stopped(stop_event):
+        scraper._budget_leftovers(tasks, history, results_dict, counter, stats, log, label)
+
+    return scraper.finish_run(results_dict, counter, total, stats, stop_event=stop_event,
+                              output_file=output_file, progress_file=progress_file,
+                              cache=cache, label=label, log=log, on_event=on_event, run=run,
+                              timings=timings, profile=profile)
+
+
+def scrape_prices(headless=False, games_list=None, workers=3, output_file=None,
+                  progress_file=None, stop_event=None, label="", use_cache=True,
+                  force_refresh=False, cache=None, engine="browser", extract="script",
+                  concurrency=None, fsync="interval", on_event=None, resume=False,
+                  max_attempts=scraper.DEFAULT_MAX_ATTEMPTS, refresh="full", refresh_budget=None,
+                  refresh_seconds=None, speculate="off", profile="full"):
+    """Blocking wrapper around scrape_prices_async (same signature as scraper.scrape_prices)."""
+    return asyncio.run(scrape_prices_async(
+        headless=headless, games_list=games_list, workers=workers, output_file=output_file,
+        progress_file=progress_file, stop_event=stop_event, label=label, use_cache=use_cache,
+        force_refresh=force_refresh, cache=cache, engine=engine, extract=extract,
+        concurrency=concurrency, fsync=fsync, on_event=on_event, resume=resume,
+        max_attempts=max_attempts, refresh=refresh, refresh_budget=refresh_budget,
+        refresh_seconds=refresh_seconds, speculate=speculate, profile=profile,
+    ))
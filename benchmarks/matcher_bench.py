@@ -0,0 +1,176 @@
+"""Microbenchmark: matcher.Query against the original name_similarity.
+
+Builds a few thousand (search title, result title) pairs from real game
+titles and the kinds of variants gg.deals returns (editions, platform tags,
+punctuation, typos, unrelated neighbours), then reports throughput and how
+often each kernel lands on the same side of the 0.3/0.4/0.85/0.95 thresholds.
+
+    python benchmarks/matcher_bench.py [--rounds=5] [--json]
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matcher  # noqa: E402
+from benchmarks.titles import TITLES  # noqa: E402
+
+THRESHOLDS = (0.3, 0.4, 0.85, 0.95)
+
+
+SUFFIXES = [" - Deluxe Edition", ": Game of the Year Edition", " (PC)", " Complete Edition",
+            " Soundtrack", " - Season Pass", " PS4", " Xbox One", " Definitive Edition"]
+
+
+def legacy_normalize(name):
+    """normalize_name as it was before matcher.py (patterns compiled per call)."""
+    s = name.lower()
+    s = re.sub(r'\b(ps[345]|xbox|switch|pc|mac|linux)\b', '', s)
+    s = re.sub(r'[^\w\s]', ' ', s)
+    s = re.sub(r'\s+', ' ', s).strip()
+    return s
+
+
+def legacy_similarity(search_name, result_name):
+    """name_similarity as it was before matcher.py."""
+    a = legacy_normalize(search_name)
+    b = legacy_normalize(result_name)
+    if a == b:
+        return 1.0
+    if a in b or b in a:
+        return max(0.85, SequenceMatcher(None, a, b).ratio())
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _typo(rng, title):
+    if len(title) < 4:
+        return title
+    i = rng.randrange(len(title) - 1)
+    return title[:i] + title[i + 1] + title[i] + title[i + 2:]
+
+
+def build_searches(seed=0):
+    """Return [(search title, [8 result titles])], like one gg.deals result page each."""
+    rng = random.Random(seed)
+    searches = []
+    for title in TITLES:
+        queries = [title, title.lower(), _typo(rng, title), re.sub(r"[:\-']", "", title)]
+        for q in queries:
+            page = [title + rng.choice(SUFFIXES), title, _typo(rng, title)]
+            page += rng.sample(TITLES, 5)
+            rng.shuffle(page)
+            searches.append((q, page))
+    return searches
+
+
+def legacy_best(query, page):
+    """The old _score_candidates loop: first candidate with the top score, stop at 0.95."""
+    best_i, best_score = None, 0.0
+    for i, name in enumerate(page):
+        score = legacy_similarity(query, name)
+        if score > best_score:
+            best_i, best_score = i, score
+        if score >= 0.95:
+            break
+    return best_i, best_score
+
+
+def _time(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _flips(reference, scores):
+    return {str(t): sum((x >= t) != (y >= t) for x, y in zip(reference, scores)) for t in THRESHOLDS}
+
+
+def run(rounds=5):
+    searches = build_searches()
+    pairs = sum(len(page) for _, page in searches)
+    report = {"pairs": pairs, "searches": len(searches), "kernel": matcher.KERNEL}
+
+    def legacy_scores():
+        return [legacy_similarity(q, r) for q, page in searches for r in page]
+
+    def legacy_picks():
+        return [legacy_best(q, page) for q, page in searches]
+
+    def batched_scores():
+        return [s for q, page in searches for s in matcher.Query(q).scores(page)]
+
+    def batched_picks():
+        return [matcher.Query(q).best(page) for q, page in searches]
+
+    reference = legacy_scores()
+    picks = legacy_picks()
+    t_legacy = _time(legacy_scores, rounds)
+    t_legacy_best = _time(legacy_picks, rounds)
+    matcher.normalize.cache_clear()
+    t_cold = _time(batched_scores, 1)
+    t_scores = _time(batched_scores, rounds)
+    t_best = _time(batched_picks, rounds)
+    scores = batched_scores()
+
+    report["scores"] = {
+        "legacy_pairs_per_sec": round(pairs / t_legacy),
+        "matcher_pairs_per_sec_cold": round(pairs / t_cold),
+        "matcher_pairs_per_sec": round(pairs / t_scores),
+        "speedup": round(t_legacy / t_scores, 2),
+        "max_abs_diff": round(max(abs(x - y) for x, y in zip(reference, scores)), 6),
+        "threshold_flips": _flips(reference, scores),
+    }
+    report["best_match"] = {
+        "legacy_searches_per_sec": round(len(searches) / t_legacy_best),
+        "matcher_searches_per_sec": round(len(searches) / t_best),
+        "speedup": round(t_legacy_best / t_best, 2),
+        "different_picks": sum(p != q for p, q in zip(picks, batched_picks())),
+    }
+
+    # The LCS ratio on its own, as a score: fast, but not the same scale
+    ratios = []
+    for q, page in searches:
+        query = matcher.Query(q)
+        for r in page:
+            a, b = query.norm, matcher.normalize(r)
+            ratio = 1.0 if a == b else query.lcs_ratio(b)
+            if a != b and (a in b or b in a):
+                ratio = max(matcher.CONTAINS_FLOOR, ratio)
+            ratios.append(ratio)
+    report["lcs_ratio_as_score"] = {
+        "max_abs_diff": round(max(abs(x - y) for x, y in zip(reference, ratios)), 4),
+        "threshold_flips": _flips(reference, ratios),
+    }
+    return report
+
+
+def main(argv):
+    rounds = 5
+    for arg in argv:
+        if arg.startswith("--rounds="):
+            rounds = int(arg.split("=", 1)[1])
+    report = run(rounds)
+    if "--json" in argv:
+        print(json.dumps(report, indent=2))
+        return
+    s, b, r = report["scores"], report["best_match"], report["lcs_ratio_as_score"]
+    print(f"{report['pairs']} pairs over {report['searches']} searches (bound kernel: {report['kernel']})")
+    print(f"  scores:     legacy {s['legacy_pairs_per_sec']} pairs/s, matcher {s['matcher_pairs_per_sec']} "
+          f"pairs/s (x{s['speedup']}, cold {s['matcher_pairs_per_sec_cold']}/s), "
+          f"max diff {s['max_abs_diff']}, flips {s['threshold_flips']}")
+    print(f"  best match: legacy {b['legacy_searches_per_sec']} searches/s, matcher "
+          f"{b['matcher_searches_per_sec']} searches/s (x{b['speedup']}), "
+          f"{b['different_picks']} different picks")
+    print(f"  LCS ratio used directly as the score: max diff {r['max_abs_diff']}, flips {r['threshold_flips']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
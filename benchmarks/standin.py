@@ -0,0 +1,219 @@
+"""Local stand-in for gg.deals, for benchmarks.
+
+Serves search pages (``/games/?title=``) and game pages (``/game/<slug>/``)
+in the markup the scraper reads (.hoverable-box, a.full-link, span.price,
+.game-header-current-prices), generated from a catalogue of titles.  Pages
+recorded from the live site can be dropped into a directory as
+``<quote_plus(query)>.html`` and are served verbatim instead.
+
+Latency, error rate and challenge rate are configurable; challenges are 503
+"Just a moment..." pages like Cloudflare's.
+
+    python benchmarks/standin.py [--port=8765] [--latency=0.02] [--challenge-rate=0.01]
+
+then run the scraper against it with ``GG_DEALS_URL=http://127.0.0.1:8765``.
+"""
+import hashlib
+import html
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+CHALLENGE_PAGE = (
+    "<!DOCTYPE html><html><head><title>Just a moment...</title></head>"
+    "<body><div id=\"challenge-form\" class=\"cf-challenge\">Checking your browser</div></body></html>"
+)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _slug(name):
+    return "-".join(_WORD_RE.findall(name.lower()))
+
+
+def _price(name):
+    cents = int(hashlib.md5(name.encode("utf-8")).hexdigest()[:6], 16) % 6000
+    return f"${cents / 100:.2f}" if cents else "Free"
+
+
+class Catalogue:
+    """Titles searchable by word, the way gg.deals' search roughly behaves."""
+
+    def __init__(self, titles):
+        self.titles = list(dict.fromkeys(titles))
+        self.by_slug = {_slug(t): t for t in self.titles}
+        self._by_word = {}
+        for t in self.titles:
+            for w in set(_WORD_RE.findall(t.lower())):
+                self._by_word.setdefault(w, []).append(t)
+
+    def search(self, query, limit=8):
+        words = _WORD_RE.findall(query.lower())
+        if not words:
+            return []
+        counts = {}
+        for w in words:
+            for t in self._by_word.get(w, ())[:200]:
+                counts[t] = counts.get(t, 0) + 1
+        q = query.lower()
+        ranked = sorted(counts, key=lambda t: (t.lower() != q, -counts[t], len(t)))
+        return ranked[:limit]
+
+
+def search_page(titles):
+    boxes = []
+    for name in titles:
+        esc = html.escape(name)
+        boxes.append(
+            f'<div class="hoverable-box"><a class="full-link" aria-label="Go to: {esc}" '
+            f'href="/game/{_slug(name)}/"></a><div class="game-info-title">{esc}</div>'
+            f'<div class="price-wrap"><span class="price">{_price(name)}</span></div></div>'
+        )
+    body = "".join(boxes) or '<div class="no-results">No results</div>'
+    return f"<!DOCTYPE html><html><head><title>Search | GG.deals</title></head><body>{body}</body></html>"
+
+
+def game_page(name):
+    esc = html.escape(name)
+    return (
+        f"<!DOCTYPE html><html><head><title>{esc} | GG.deals</title></head><body>"
+        f'<h1>{esc}</h1><div class="game-header-current-prices">'
+        f'<span class="price">{_price(name)}</span></div></body></html>'
+    )
+
+
+class StandIn:
+    """Threaded local server; ``start()`` returns its base URL."""
+
+    def __init__(self, titles, latency=0.02, jitter=0.01, error_rate=0.0, challenge_rate=0.0,
+                 recorded_dir=None, port=0, seed=0):
+        self.catalogue = Catalogue(titles)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.challenge_rate = challenge_rate
+        self.recorded_dir = recorded_dir
+        self.port = port
+        self.stats = {"requests": 0, "errors": 0, "challenges": 0, "recorded": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _roll(self):
+        with self._lock:
+            self.stats["requests"] += 1
+            r = self._rng.random()
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        if r < self.challenge_rate:
+            kind = "challenges"
+        elif r < self.challenge_rate + self.error_rate:
+            kind = "errors"
+        else:
+            return delay, None
+        with self._lock:
+            self.stats[kind] += 1
+        return delay, kind
+
+    def _recorded(self, query):
+        if not self.recorded_dir:
+            return None
+        path = os.path.join(self.recorded_dir, quote_plus(query) + ".html")
+        if not os.path.exists(path):
+            return None
+        with self._lock:
+            self.stats["recorded"] += 1
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def respond(self, path):
+        """Return (status, html) for a request path, after the simulated latency."""
+        delay, fault = self._roll()
+        if delay:
+            time.sleep(delay)
+        if fault == "challenges":
+            return 503, CHALLENGE_PAGE
+        if fault == "errors":
+            return 500, "<html><body>Internal Server Error</body></html>"
+        parts = urlsplit(path)
+        if parts.path.rstrip("/") == "/games":
+            query = parse_qs(parts.query).get("title", [""])[0]
+            page = self._recorded(query)
+            return 200, page if page is not None else search_page(self.catalogue.search(query))
+        if parts.path.startswith("/game/"):
+            name = self.catalogue.by_slug.get(parts.path[len("/game/"):].strip("/"))
+            if name is None:
+                return 404, "<html><body>Not found</body></html>"
+            return 200, game_page(name)
+        return 200, "<!DOCTYPE html><html><head><title>GG.deals</title></head><body></body></html>"
+
+    def start(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle plus
+            # delayed ACKs add ~40 ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, page = standin.respond(self.path)
+                data = page.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _arg(argv, name, default, cast=str):
+    for a in argv:
+        if a.startswith(f"--{name}="):
+            return cast(a.split("=", 1)[1])
+    return default
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks.titles import game_list
+
+    argv = sys.argv[1:]
+    server = StandIn(
+        game_list(_arg(argv, "titles", 10000, int)),
+        latency=_arg(argv, "latency", 0.02, float),
+        error_rate=_arg(argv, "error-rate", 0.0, float),
+        challenge_rate=_arg(argv, "challenge-rate", 0.0, float),
+        recorded_dir=_arg(argv, "recorded", None),
+        port=_arg(argv, "port", 8765, int),
+    )
+    print(f"gg.deals stand-in on {server.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,361 @@
+"""End-to-end benchmark of scrape_prices against the local gg.deals stand-in.
+
+For every (list size, worker count) pair this runs a full scrape against
+benchmarks/standin.py and records games/sec, p50/p95/p99 per-game latency,
+CPU and RSS per worker, and the time spent writing results and publishing
+SSE progress events (plus the Flask results/progress endpoints when Flask
+is installed).  Everything is written to one JSON file so runs can be
+diffed between commits.
+
+    python benchmarks/suite.py [--sizes=100,1000,10000] [--workers=1,4,8]
+                               [--engine=http] [--runner=threaded|async]
+                               [--latency=0.02] [--error-rate=0] [--challenge-rate=0]
+                               [--pacing=off|on] [--fsync=interval] [--recorded=DIR]
+                               [--profiles=full,lean]
+                               [--out=bench_results.json] [--quiet]
+
+The browser engine needs Chrome; the HTTP engine only launches it for
+challenge pages, so keep ``--challenge-rate=0`` on machines without Chrome.
+``--profiles=full,lean`` repeats every run per Chrome profile and reports
+KB transferred and page-load time per browser lookup for each.
+The price cache and title index are left out so every game hits the server.
+"""
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import governor  # noqa: E402
+import pacing  # noqa: E402
+import results_log  # noqa: E402
+import scraper  # noqa: E402
+from benchmarks.standin import StandIn, _arg  # noqa: E402
+from benchmarks.titles import game_list  # noqa: E402
+from events import EventBus  # noqa: E402
+from results_index import ResultsIndex  # noqa: E402
+
+
+def percentiles(values, points=(50, 95, 99)):
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    out = {}
+    for p in points:
+        k = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        out[f"p{p}"] = round(ordered[k] * 1000, 2)   # milliseconds
+    return out
+
+
+def _rss_mb():
+    """Current resident set size (Linux /proc), else the peak from getrusage, else None."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform != "darwin" else peak / 2 ** 20
+
+
+class Probe:
+    """Times lookups, result writes and event publishing during one run."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.page_bytes = []      # per browser lookup
+        self.page_loads = []
+        self.thread_cpu = {}      # thread ident -> CPU seconds in lookups + recording
+        self.write_times = []
+        self.publish_times = []
+        self.rss_peak = 0.0
+        self._saved = []
+
+    def _patch(self, owner, name, wrapper):
+        original = getattr(owner, name)
+        self._saved.append((owner, name, original))
+        setattr(owner, name, wrapper(original))
+
+    def install(self):
+        probe = self
+
+        def timed_lookup(fn):
+            def wrapper(*args, **kwargs):
+                cpu, start = time.thread_time(), time.perf_counter()
+                result, info = fn(*args, **kwargs)
+                elapsed = time.perf_counter() - start
+                probe._add_cpu(time.thread_time() - cpu)
+                with probe.lock:
+                    probe.latencies.append(elapsed)
+                    probe.errors += bool(info.get("error"))
+                    if info.get("pages"):
+                        probe.page_bytes.append(info["bytes"])
+                        probe.page_loads.append(info["page_load"])
+                return result, info
+            return wrapper
+
+        def timed_record(fn):
+            def wrapper(*args, **kwargs):
+                cpu = time.thread_time()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    probe._add_cpu(time.thread_time() - cpu)
+            return wrapper
+
+        def timed_append(fn):
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    with probe.lock:
+                        probe.write_times.append(time.perf_counter() - start)
+            return wrapper
+
+        self._patch(scraper, "lookup_game", timed_lookup)
+        self._patch(scraper, "record_result", timed_record)
+        self._patch(results_log.ResultsLog, "append", timed_append)
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._saved):
+            setattr(owner, name, original)
+        self._saved = []
+
+    def _add_cpu(self, seconds):
+        ident = threading.get_ident()
+        with self.lock:
+            self.thread_cpu[ident] = self.thread_cpu.get(ident, 0.0) + seconds
+
+    def publisher(self, bus):
+        def on_event(payload):
+            start = time.perf_counter()
+            bus.publish(payload)
+            with self.lock:
+                self.publish_times.append(time.perf_counter() - start)
+        return on_event
+
+
+def _sse_subscriber(bus, stop, out):
+    """Drain the bus the way app.progress_stream does and time the serialization."""
+    after, serialize, events, size = None, 0.0, 0, 0
+    while not stop.is_set():
+        for event_id, payload in bus.wait(after, timeout=0.2):
+            after = event_id
+            start = time.perf_counter()
+            frame = f"id: {event_id}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+            serialize += time.perf_counter() - start
+            events += 1
+            size += len(frame)
+    out.update(events=events, serialize_ms=round(serialize * 1000, 2),
+               bytes=size, avg_frame_bytes=round(size / events) if events else 0)
+
+
+def _rss_sampler(probe, stop):
+    while not stop.is_set():
+        probe.rss_peak = max(probe.rss_peak, _rss_mb())
+        stop.wait(0.1)
+
+
+def _endpoint_timings(output_file, rounds=20):
+    """Latency of the Flask results/progress endpoints over the finished run, if Flask is here."""
+    try:
+        import app as webapp
+    except ImportError:
+        return None
+    tab = webapp.TABS["trader"]
+    saved = tab["results_file"], tab["index"]
+    # The endpoints read the tab's ResultsIndex, so point both at the run's file
+    tab["results_file"], tab["index"] = output_file, ResultsIndex(output_file)
+    client = webapp.app.test_client()
+    timings = {}
+    try:
+        for name, url in (("results", "/api/results/trader"), ("progress", "/api/progress/trader")):
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                client.get(url)
+                samples.append(time.perf_counter() - start)
+            timings[name] = percentiles(samples)
+    finally:
+        tab["results_file"], tab["index"] = saved
+    return timings
+
+
+def run_one(games, workers, engine, runner, fsync, concurrency=None, quiet=False, profile="full"):
+    probe = Probe()
+    bus = EventBus()
+    stop = threading.Event()
+    sse = {}
+    rss_before = _rss_mb()
+    threads = [threading.Thread(target=_sse_subscriber, args=(bus, stop, sse), daemon=True)]
+    if rss_before is not None:
+        threads.append(threading.Thread(target=_rss_sampler, args=(probe, stop), daemon=True))
+    probe.install()
+    for t in threads:
+        t.start()
+
+    workdir = tempfile.mkdtemp(prefix="ggbench-")
+    output_file = os.path.join(workdir, "results.json")
+    kwargs = dict(headless=True, games_list=games, workers=workers, output_file=output_file,
+                  progress_file=False, stop_event=threading.Event(), use_cache=False,
+                  engine=engine, fsync=fsync, on_event=probe.publisher(bus), profile=profile)
+    if runner == "async":
+        from async_engine import scrape_prices
+        if concurrency:
+            kwargs["concurrency"] = concurrency
+    else:
+        scrape_prices = scraper.scrape_prices
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    try:
+        # The scraper logs a line per game; --quiet keeps that off the terminal
+        with contextlib.redirect_stdout(open(os.devnull, "w")) if quiet else contextlib.nullcontext():
+            results = scrape_prices(**kwargs)
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        probe.uninstall()
+        stop.set()
+        for t in threads:
+            t.join()
+
+    per_thread = list(probe.thread_cpu.values())
+    matched = sum(1 for r in results if r.get("price") is not None)
+    report = {
+        "games": len(games),
+        "workers": workers,
+        "runner": runner,
+        "engine": engine,
+        "fsync": fsync,
+        "profile": profile,
+        "wall_seconds": round(wall, 3),
+        "games_per_sec": round(len(games) / wall, 2) if wall else None,
+        "matched": matched,
+        "errors": probe.errors,
+        "latency_ms": percentiles(probe.latencies),
+        "cpu": {
+            "process_seconds": round(cpu, 3),
+            "per_worker_seconds_mean": round(sum(per_thread) / len(per_thread), 3) if per_thread else 0,
+            "per_worker_seconds_max": round(max(per_thread), 3) if per_thread else 0,
+            "threads": len(per_thread),
+        },
+        # None where neither /proc nor getrusage is available (Windows)
+        "rss_mb": {
+            "before": round(rss_before, 1),
+            "peak": round(probe.rss_peak, 1),
+            "per_worker": round(max(0.0, probe.rss_peak - rss_before) / workers, 2),
+        } if rss_before is not None else None,
+        "writes": {
+            "count": len(probe.write_times),
+            "total_ms": round(sum(probe.write_times) * 1000, 2),
+            **percentiles(probe.write_times),
+        },
+        "sse": {
+            "publish_total_ms": round(sum(probe.publish_times) * 1000, 2),
+            **percentiles(probe.publish_times),
+            **sse,
+        },
+        "pages": {
+            "browser_lookups": len(probe.page_bytes),
+            "kb_per_lookup": (round(sum(probe.page_bytes) / len(probe.page_bytes) / 1024, 1)
+                              if probe.page_bytes else None),
+            "load_ms": percentiles(probe.page_loads),
+        },
+        "endpoints_ms": _endpoint_timings(output_file),
+    }
+    return report
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv):
+    sizes = [int(x) for x in _arg(argv, "sizes", "100,1000,10000").split(",")]
+    worker_counts = [int(x) for x in _arg(argv, "workers", "1,4,8").split(",")]
+    engine = _arg(argv, "engine", "http")
+    runner = _arg(argv, "runner", "threaded")
+    concurrency = _arg(argv, "concurrency", None, int)
+    fsync = _arg(argv, "fsync", "interval")
+    profiles = _arg(argv, "profiles", "full").split(",")
+    out_path = _arg(argv, "out", os.path.join(ROOT, "bench_results.json"))
+    config = {
+        "latency": _arg(argv, "latency", 0.02, float),
+        "error_rate": _arg(argv, "error-rate", 0.0, float),
+        "challenge_rate": _arg(argv, "challenge-rate", 0.0, float),
+        "pacing": _arg(argv, "pacing", "off"),
+    }
+
+    catalogue = game_list(max(sizes))
+    server = StandIn(catalogue, latency=config["latency"], error_rate=config["error_rate"],
+                     challenge_rate=config["challenge_rate"], recorded_dir=_arg(argv, "recorded", None))
+    scraper.BASE_URL = server.start()
+    host = urlsplit(scraper.BASE_URL).hostname
+
+    runs = []
+    try:
+        for size in sizes:
+            for workers in worker_counts:
+                for profile in profiles:
+                    if config["pacing"] == "off":
+                        pacing.configure_pacer(host, initial=0.0, minimum=0.0)
+                        governor.configure_governor(rate=None)
+                    else:
+                        pacing.configure_pacer(host)
+                        governor.configure_governor()
+                    print(f"== {size} games, {workers} worker(s), {engine}/{runner}, {profile} profile")
+                    report = run_one(catalogue[:size], workers, engine, runner, fsync, concurrency,
+                                     quiet="--quiet" in argv, profile=profile)
+                    rss = f", peak RSS {report['rss_mb']['peak']} MB" if report["rss_mb"] else ""
+                    print(f"   {report['games_per_sec']} games/s, latency {report['latency_ms']}, "
+                          f"{report['errors']} error(s){rss}")
+                    if report["pages"]["browser_lookups"]:
+                        print(f"   {report['pages']['kb_per_lookup']} KB and page load "
+                              f"{report['pages']['load_ms']} per browser lookup")
+                    runs.append(report)
+    finally:
+        server.stop()
+
+    doc = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "engine": engine,
+            "runner": runner,
+            "fsync": fsync,
+            "server": dict(config, **server.stats),
+        },
+        "runs": runs,
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    print(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
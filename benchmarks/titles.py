@@ -0,0 +1,65 @@
+"""Real game titles shared by the benchmarks."""
+
+TITLES = [
+    "Frostpunk", "Frostpunk 2", "Celeste", "Hollow Knight", "Hades", "Hades II",
+    "Half-Life: Alyx", "Half-Life 2", "Portal 2", "Stardew Valley", "Terraria",
+    "The Witcher 3: Wild Hunt", "Cyberpunk 2077", "Red Dead Redemption 2",
+    "Grand Theft Auto V", "Disco Elysium", "Slay the Spire", "Dead Cells",
+    "Baldur's Gate 3", "Divinity: Original Sin 2", "Subnautica", "Subnautica: Below Zero",
+    "Outer Wilds", "Return of the Obra Dinn", "Inside", "Limbo", "Cuphead",
+    "Ori and the Blind Forest", "Ori and the Will of the Wisps", "Dark Souls III",
+    "Elden Ring", "Sekiro: Shadows Die Twice", "Monster Hunter: World", "Doom Eternal",
+    "DOOM (2016)", "Wolfenstein II: The New Colossus", "Prey", "Dishonored 2",
+    "Deus Ex: Mankind Divided", "Mass Effect Legendary Edition", "Dragon Age: Inquisition",
+    "Fallout 4", "Fallout: New Vegas", "The Elder Scrolls V: Skyrim Special Edition",
+    "Starfield", "XCOM 2", "Civilization VI", "Sid Meier's Civilization V",
+    "Stellaris", "Crusader Kings III", "Europa Universalis IV", "Hearts of Iron IV",
+    "Cities: Skylines", "Factorio", "RimWorld", "Oxygen Not Included", "Satisfactory",
+    "Kerbal Space Program", "Don't Starve Together", "Risk of Rain 2", "Enter the Gungeon",
+    "The Binding of Isaac: Rebirth", "Into the Breach", "FTL: Faster Than Light",
+    "Darkest Dungeon", "Darkest Dungeon II", "Pillars of Eternity II: Deadfire",
+    "Tyranny", "Pathfinder: Wrath of the Righteous", "Shadowrun: Dragonfall",
+    "Wasteland 3", "Disco Elysium - The Final Cut", "Control", "Alan Wake 2",
+    "Quantum Break", "Max Payne 3", "Batman: Arkham Knight", "Middle-earth: Shadow of War",
+    "Assassin's Creed Odyssey", "Far Cry 5", "Watch Dogs 2", "Tom Clancy's Rainbow Six Siege",
+    "Rocket League", "It Takes Two", "A Way Out", "Unravel Two", "Psychonauts 2",
+    "Tunic", "Death's Door", "Hyper Light Drifter", "Katana ZERO", "Hotline Miami 2: Wrong Number",
+    "Shovel Knight: Treasure Trove", "Spelunky 2", "Noita", "Vampire Survivors",
+    "Inscryption", "Loop Hero", "Tooth and Tail", "Owlboy", "Axiom Verge 2",
+    "Bloodstained: Ritual of the Night", "Hollow Knight: Silksong", "Blasphemous 2",
+    "Sea of Stars", "Chained Echoes", "Octopath Traveler II", "Persona 5 Royal",
+    "Yakuza: Like a Dragon", "Like a Dragon: Infinite Wealth", "NieR:Automata",
+    "Final Fantasy VII Remake Intergrade", "Tales of Arise", "Dragon Quest XI S",
+    "Monster Hunter Rise: Sunbreak", "Street Fighter 6", "Tekken 8", "Mortal Kombat 1",
+    "Forza Horizon 5", "Euro Truck Simulator 2", "American Truck Simulator",
+    "Microsoft Flight Simulator", "Planet Coaster", "Planet Zoo", "Two Point Hospital",
+    "Jurassic World Evolution 2", "Frostpunk: Game of the Year Edition", "Dyson Sphere Program",
+    "Valheim", "Grounded", "The Forest", "Sons of the Forest", "Raft", "Green Hell",
+    "Phasmophobia", "Lethal Company", "Deep Rock Galactic", "Left 4 Dead 2",
+    "Payday 2", "Borderlands 3", "Tiny Tina's Wonderlands", "Titanfall 2",
+    "Apex Legends", "Counter-Strike 2", "Team Fortress 2", "Dota 2",
+    "Age of Empires II: Definitive Edition", "Age of Mythology: Retold", "StarCraft II",
+    "Warhammer 40,000: Dawn of War II", "Total War: WARHAMMER III", "Total War: Three Kingdoms",
+]
+
+
+EDITIONS = ["", " - Deluxe Edition", ": Game of the Year Edition", " Complete Edition",
+            " Definitive Edition", " - Season Pass", " Soundtrack", " Remastered"]
+
+
+def game_list(size):
+    """``size`` distinct titles: the real ones first, then edition/sequel variants."""
+    out, seen = [], set()
+    n = 0
+    while len(out) < size:
+        edition = EDITIONS[n % len(EDITIONS)]
+        sequel = "" if n < len(EDITIONS) else f" {n // len(EDITIONS) + 1}"
+        for title in TITLES:
+            name = f"{title}{sequel}{edition}"
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                out.append(name)
+                if len(out) == size:
+                    break
+        n += 1
+    return out
@@ -0,0 +1,122 @@
+"""Run manifests for resumable scrapes.
+
+A run is described by ``<results>.run.json`` (run id, the full games list,
+status) and its task ledger is the append-only results log next to it:
+every index with a "done" record is finished, "failed" ones are retried on
+resume, and everything else is still pending.
+"""
+import json
+import os
+import time
+import uuid
+
+from results_log import DELETED, log_path, read_records
+
+
+def manifest_path(output_file):
+    root, _ = os.path.splitext(output_file)
+    return root + ".run.json"
+
+
+def new_run(output_file, games):
+    run = {
+        "run_id": uuid.uuid4().hex[:12],
+        "games": list(games),
+        "status": "running",
+        "started_at": time.time(),
+    }
+    save_run(output_file, run)
+    return run
+
+
+def load_run(output_file):
+    path = manifest_path(output_file)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_run(output_file, run):
+    path = manifest_path(output_file)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(run, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def mark_run(output_file, run, status):
+    run["status"] = status
+    run["finished_at"] = time.time()
+    save_run(output_file, run)
+
+
+def add_dead_letter(output_file, run, entry):
+    """Record a game that failed every attempt (see retry.py) in the manifest."""
+    run.setdefault("dead_letters", []).append(entry)
+    save_run(output_file, run)
+
+
+def is_resumable(run):
+    return run is not None and run.get("status") != "completed"
+
+
+def run_files(output_file):
+    """The results file plus the log and manifest kept next to it."""
+    return [output_file, log_path(output_file), manifest_path(output_file)]
+
+
+def remove_files(paths):
+    """Delete whichever of ``paths`` exist, ignoring errors."""
+    for path in paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def ledger(output_file, run=None):
+    """Return {"done": {idx: result}, "failed": {idx: result}, "pending": [idx, ...],
+    "deleted": {idx, ...}}; rows the user deleted are neither done nor pending."""
+    run = run or load_run(output_file)
+    done, failed, deleted = {}, {}, set()
+    path = log_path(output_file)
+    if os.path.exists(path):
+        for idx, status, result in read_records(path):
+            done.pop(idx, None)
+            failed.pop(idx, None)
+            deleted.discard(idx)
+            if status == DELETED:
+                deleted.add(idx)
+            elif status == "failed":
+                failed[idx] = result
+            else:
+                done[idx] = result
+    total = len(run["games"]) if run else 0
+    pending = [i for i in range(total) if i not in done and i not in failed and i not in deleted]
+    return {"done": done, "failed": failed, "pending": pending, "deleted": deleted}
+
+
+def summary(output_file):
+    """Small JSON-able description of the tab's latest run, or None."""
+    run = load_run(output_file)
+    if run is None:
+        return None
+    led = ledger(output_file, run)
+    if run.get("status") == "completed":
+        # The ledger log is compacted away once a run completes
+        led = {"done": run["games"], "failed": {}, "pending": [], "deleted": ()}
+    return {
+        "run_id": run["run_id"],
+        "status": run.get("status"),
+        "total": len(run["games"]),
+        "done": len(led["done"]) + len(led["deleted"]),
+        "failed": len(led["failed"]),
+        "pending": len(led["pending"]),
+        "dead_letters": len(run.get("dead_letters", [])),
+        "resumable": is_resumable(run),
+    }
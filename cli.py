@@ -0,0 +1,365 @@
+"""Headless batch mode: stream titles in, stream priced results out.
+
+    python cli.py [FILE|-] [--format=jsonl|csv] [--engine=browser|http]
+                  [--workers=3] [--rate=2] [--attempts=3] [--extract=script] [--speculate=off|on|base]
+                  [--profile=full|lean] [--no-cache] [--refresh] [--headless] [--keep-duplicates]
+                  [--cache-ttl=SECONDS] [--cache-max=N] [--summary=text|json|none] [--quiet]
+
+Titles are read one per line from FILE (stdin when omitted or ``-``) while
+the lookups run, through a small bounded queue, so huge lists and pipes
+never sit in memory.  Each result is written to stdout as soon as its game
+completes (JSON Lines or CSV, in completion order; ``idx`` is the title's
+position in the input).  Scraper logging goes to stderr (``--quiet`` drops
+it) and a summary follows on stderr at the end.
+
+``--rate`` caps requests per second (``0`` lifts the limit and the pacing).
+``--cache-ttl`` and ``--cache-max`` override the price cache's TTL and size
+cap (``0`` = never expire / unbounded; defaults from GG_DEALS_CACHE_TTL and
+GG_DEALS_CACHE_MAX_ENTRIES, else 6 h and 20000).
+Exit status: 0 when every lookup went through (found or not), 1 when some
+failed after all attempts, 2 for bad arguments or input, 130 when
+interrupted.  Nothing here imports Flask or the web UI.
+"""
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from queue import Queue, Empty, Full
+from urllib.parse import urlsplit
+
+import governor
+import metrics
+import pacing
+import scraper
+from retry import RetryScheduler, DEFAULT_MAX_ATTEMPTS
+
+FORMATS = ("jsonl", "csv")
+SUMMARIES = ("text", "json", "none")
+CSV_FIELDS = ("idx", "search_name", "matched_name", "price", "price_value", "url",
+              "match_confidence", "cached", "error")
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class UsageError(Exception):
+    pass
+
+
+def parse_args(argv):
+    opts = {
+        "input": "-",
+        "format": "jsonl",
+        "engine": "browser",
+        "extract": "script",
+        "speculate": "off",
+        "profile": "full",
+        "workers": 3,
+        "rate": None,
+        "cache_ttl": None,
+        "cache_max": None,
+        "attempts": DEFAULT_MAX_ATTEMPTS,
+        "use_cache": True,
+        "force_refresh": False,
+        "headless": False,
+        "dedupe": True,
+        "summary": "text",
+        "quiet": False,
+    }
+    flags = {"--no-cache": ("use_cache", False), "--refresh": ("force_refresh", True),
+             "--headless": ("headless", True), "--keep-duplicates": ("dedupe", False),
+             "--quiet": ("quiet", True)}
+    casts = {"format": str, "engine": str, "extract": str, "speculate": str, "profile": str, "workers": int,
+             "rate": float, "attempts": int, "summary": str, "cache_ttl": int, "cache_max": int}
+    positional = []
+    for arg in argv:
+        if arg in flags:
+            key, value = flags[arg]
+            opts[key] = value
+        elif arg.startswith("--") and "=" in arg:
+            name, value = arg[2:].split("=", 1)
+            key = name.replace("-", "_")
+            if key not in casts:
+                raise UsageError(f"Unknown option --{name}")
+            try:
+                opts[key] = casts[key](value)
+            except ValueError:
+                raise UsageError(f"Bad value for --{name}: {value!r}")
+        elif arg.startswith("--"):
+            raise UsageError(f"Unknown option {arg}")
+        else:
+            positional.append(arg)
+    if len(positional) > 1:
+        raise UsageError("Expected at most one input file")
+    if positional:
+        opts["input"] = positional[0]
+    if opts["format"] not in FORMATS:
+        raise UsageError(f"Unknown format '{opts['format']}' (expected one of {', '.join(FORMATS)})")
+    if opts["summary"] not in SUMMARIES:
+        raise UsageError(f"Unknown summary '{opts['summary']}' (expected one of {', '.join(SUMMARIES)})")
+    if opts["workers"] < 1 or opts["attempts"] < 1:
+        raise UsageError("--workers and --attempts must be at least 1")
+    if opts["rate"] is not None and opts["rate"] < 0:
+        raise UsageError("--rate must be 0 (unlimited) or more")
+    if any(opts[k] is not None and opts[k] < 0 for k in ("cache_ttl", "cache_max")):
+        raise UsageError("--cache-ttl and --cache-max must be 0 (no limit) or more")
+    try:
+        scraper._check_modes(opts["engine"], opts["extract"], opts["speculate"], opts["profile"])
+    except ValueError as e:
+        raise UsageError(str(e))
+    return opts
+
+
+def read_titles(lines, dedupe=True):
+    """Yield stripped, non-empty titles (first spelling of each, like load_games)."""
+    seen = set()
+    for line in lines:
+        title = line.strip()
+        if not title:
+            continue
+        if dedupe:
+            key = title.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+        yield title
+
+
+class ResultWriter:
+    """Thread-safe JSON Lines / CSV writer that flushes after every row."""
+
+    def __init__(self, stream, fmt="jsonl"):
+        self.stream = stream
+        self.fmt = fmt
+        self._lock = threading.Lock()
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+            stream.flush()
+
+    def write(self, idx, result, info):
+        row = dict(result, idx=idx, cached=bool(info.get("cached")), error=info.get("error"))
+        with self._lock:
+            if self._csv is not None:
+                self._csv.writerow(row)
+            else:
+                self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+
+class BatchRun:
+    """Reader thread -> bounded queue -> worker threads -> ResultWriter."""
+
+    def __init__(self, opts, writer):
+        self.opts = opts
+        self.writer = writer
+        self.stop = threading.Event()
+        self.tasks = Queue(maxsize=opts["workers"] * 4)
+        self.read_done = threading.Event()
+        self.read_error = None
+        self.retries = RetryScheduler(max_attempts=opts["attempts"])
+        self.stats = scraper._new_stats()
+        self.stats.update({"read": 0, "done": 0, "found": 0, "failed": 0})
+        self._lock = threading.Lock()
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def reader(self, lines):
+        try:
+            for idx, title in enumerate(read_titles(lines, self.opts["dedupe"])):
+                while not self.stop.is_set():
+                    try:
+                        self.tasks.put((idx, title), timeout=0.5)
+                        break
+                    except Full:
+                        continue
+                if self.stop.is_set():
+                    break
+                self._count("read")
+        except (OSError, UnicodeDecodeError) as e:
+            self.read_error = e
+            print(f"[CLI] Could not read input: {e}", file=sys.stderr)
+        finally:
+            self.read_done.set()
+
+    def _next(self):
+        """Next (idx, title): due retries first; None once input and retries are drained."""
+        while not self.stop.is_set():
+            item = self.retries.pop_due()
+            if item is not None:
+                return item
+            wait = self.retries.wait_time()
+            try:
+                return self.tasks.get(timeout=min(0.2, wait) if wait is not None else 0.2)
+            except Empty:
+                pass
+            if self.read_done.is_set() and self.tasks.empty() and not self.retries.pending():
+                return None
+        return None
+
+    def worker(self, worker_id, http, cache, index, share, timings):
+        prefix = f"[CLI/Worker {worker_id}]"
+        pool = scraper.get_driver_pool()
+        metrics.bind(timings, f"CLI/Worker {worker_id}")
+        opts = self.opts
+        try:
+            while True:
+                item = self._next()
+                if item is None:
+                    break
+                idx, title = item
+                done = scraper.process_game(
+                    idx, title,
+                    lambda: scraper.lease_driver(pool, opts["headless"], share, opts["profile"]),
+                    lambda driver, info: scraper.release_driver(pool, driver, info, share),
+                    retries=self.retries, stats=self.stats, prefix=prefix, http=http,
+                    cache=cache, force_refresh=opts["force_refresh"], extract=opts["extract"],
+                    index=index, share=share, speculate=opts["speculate"])
+                if done is None:
+                    continue
+                result, info = done
+                self.writer.write(idx, result, info)
+                self._count("done")
+                if info.get("error"):
+                    self._count("failed")
+                elif result["price"] is not None:
+                    self._count("found")
+                metrics.inc("games_processed_total")
+        finally:
+            metrics.bind(None, None)
+
+    def run(self, lines):
+        opts = self.opts
+        cache = scraper._resolve_cache(opts["use_cache"], None)
+        index = scraper._resolve_index(opts["use_cache"])
+        http = scraper.HttpEngine(scraper.BASE_URL) if opts["engine"] == "http" else None
+        timings = metrics.start_run("cli")
+        share = scraper.join_governor("cli")
+        started = time.monotonic()
+
+        threads = [threading.Thread(target=self.reader, args=(lines,), daemon=True)]
+        for wid in range(opts["workers"]):
+            threads.append(threading.Thread(
+                target=self.worker, args=(wid + 1, http, cache, index, share, timings), daemon=True))
+        for t in threads:
+            t.start()
+        interrupted = False
+        try:
+            for t in threads[1:]:
+                while t.is_alive():
+                    t.join(0.5)
+        except KeyboardInterrupt:
+            interrupted = True
+            print("[CLI] Stopping after the current games...", file=sys.stderr)
+            self.stop.set()
+            for t in threads[1:]:
+                t.join()
+        share.leave()
+        metrics.finish_run(timings)
+        return self.summary(time.monotonic() - started, interrupted, timings)
+
+    def summary(self, elapsed, interrupted, timings):
+        s = self.stats
+        looked_up = s["cache_hits"] + s["cache_misses"]
+        browsed = s["browser_lookups"]
+        return {
+            "status": "interrupted" if interrupted else "completed",
+            "read": s["read"],
+            "done": s["done"],
+            "found": s["found"],
+            "not_found": s["done"] - s["found"] - s["failed"],
+            "failed": s["failed"],
+            "retries": s["retries"],
+            "coalesced": s["coalesced"],
+            "speculated": s["speculated"],
+            "speculation_wins": s["speculation_wins"],
+            "elapsed_seconds": round(elapsed, 2),
+            "games_per_sec": round(s["done"] / elapsed, 2) if elapsed > 0 else 0.0,
+            "cache_hits": s["cache_hits"],
+            "cache_hit_rate": round(s["cache_hits"] / looked_up, 3) if looked_up else 0.0,
+            "index_hits": s["index_hits"],
+            "wait_seconds": round(s["wait_seconds"], 2),
+            "work_seconds": round(s["work_seconds"], 2),
+            "profile": self.opts["profile"],
+            "browser_lookups": browsed,
+            "kb_per_lookup": round(s["bytes_transferred"] / browsed / 1024, 1) if browsed else None,
+            "page_load_per_lookup": round(s["page_load_seconds"] / browsed, 3) if browsed else None,
+            "stages": timings.summary(per_worker=False)["stages"],
+        }
+
+
+def _limit_rate(rate):
+    """--rate: a fixed request cap for the governor (AIMD may only lower it); 0 = unlimited."""
+    if rate is None:
+        return
+    if rate == 0:
+        pacing.configure_pacer(urlsplit(scraper.BASE_URL).hostname, initial=0.0, minimum=0.0)
+        governor.configure_governor(rate=None)
+    else:
+        governor.configure_governor(rate=rate, max_rate=rate, min_rate=min(rate, 0.2),
+                                    burst=max(1, min(3, int(rate))))
+
+
+def _print_summary(summary, style):
+    if style == "json":
+        print(json.dumps(summary), file=sys.stderr)
+    elif style == "text":
+        print(f"[CLI] {summary['status']}: {summary['done']}/{summary['read']} games in "
+              f"{summary['elapsed_seconds']}s ({summary['games_per_sec']} games/s), "
+              f"{summary['found']} priced, {summary['not_found']} not found, "
+              f"{summary['failed']} failed, {summary['retries']} retried, "
+              f"cache hit rate {summary['cache_hit_rate']:.0%}", file=sys.stderr)
+        if summary["browser_lookups"]:
+            print(f"[CLI] {summary['profile']} profile: {summary['kb_per_lookup']} KB and "
+                  f"{summary['page_load_per_lookup']}s of page load per browser lookup", file=sys.stderr)
+
+
+def main(argv, stdin=None, stdout=None):
+    """Run a batch; returns the exit status."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    try:
+        opts = parse_args(argv)
+    except UsageError as e:
+        print(f"cli.py: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        source = stdin if opts["input"] == "-" else open(opts["input"], "r", encoding="utf-8")
+    except OSError as e:
+        print(f"cli.py: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    _limit_rate(opts["rate"])
+    if opts["use_cache"] and (opts["cache_ttl"] is not None or opts["cache_max"] is not None):
+        from price_cache import configure_cache
+        configure_cache(ttl=opts["cache_ttl"], max_entries=opts["cache_max"])
+    writer = ResultWriter(stdout, opts["format"])
+    batch = BatchRun(opts, writer)
+    # stdout carries results only: the scraper's progress prints go to stderr (or nowhere)
+    saved = sys.stdout
+    sys.stdout = open(os.devnull, "w") if opts["quiet"] else sys.stderr
+    try:
+        summary = batch.run(source)
+    finally:
+        if sys.stdout is not sys.stderr:
+            sys.stdout.close()
+        sys.stdout = saved
+        if source is not stdin:
+            source.close()
+    _print_summary(summary, opts["summary"])
+    if summary["status"] == "interrupted":
+        return EXIT_INTERRUPTED
+    if batch.read_error is not None:
+        return EXIT_USAGE
+    return EXIT_FAILURES if summary["failed"] else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,497 @@
+"""Distributed scraping: the app hands out leased batches to worker processes.
+
+In coordinator mode a tab's run keeps its task ledger (the checkpointed
+results log) in the app, but scrapes nothing itself.  Worker processes,
+started with ``python scraper.py --worker --coordinator=http://host:5000``
+on this or other machines, lease small batches over HTTP, heartbeat while
+they work and report each game as it finishes.  Finished games go through
+``scraper.record_result``, so progress, results files and the SSE stream
+behave exactly as in a local run.
+
+A lease that is not heartbeated for ``lease_seconds`` expires and its games
+are re-queued.  When the queue runs dry, idle workers steal the unstarted
+tail of the largest outstanding lease; the first report for a game wins and
+the losing worker learns about it from its next heartbeat or report.
+Games whose lookup raised on the worker are re-leased after a backoff, as
+in a local run (see retry.py).
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+import scraper
+from retry import RetryScheduler
+
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_BATCH = 5
+MAX_BATCH = 50
+TOKEN_HEADER = "X-Worker-Token"
+
+
+class Coordinator:
+    """Leases, heartbeats and completions for one run's remaining games."""
+
+    def __init__(self, name, todo, on_result, lease_seconds=DEFAULT_LEASE_SECONDS, retries=None):
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.retries = retries or RetryScheduler(max_attempts=1)
+        self._on_result = on_result
+        self._remaining = dict(todo)           # idx -> game still to finish
+        self._queue = deque(idx for idx, _ in todo)
+        self._owner = {}                       # idx -> lease id holding it
+        self._leases = {}                      # lease id -> {"worker", "items", "expires"}
+        self._workers = {}                     # worker id -> {"last_seen", "completed"}
+        self._recording = 0                    # accepted reports not yet recorded
+        self._counts = {"leased_total": 0, "requeued": 0, "stolen": 0, "duplicates": 0, "retried": 0}
+        self._cond = threading.Condition()
+
+    # ---- worker-facing ----
+
+    def lease(self, worker, max_items=DEFAULT_BATCH):
+        """Lease up to ``max_items`` games to ``worker``; None when there is nothing to hand out."""
+        now = time.monotonic()
+        with self._cond:
+            self._reap(now)
+            self._seen(worker, now)
+            items = []
+            while len(items) < max_items:
+                due = self.retries.pop_due()
+                if due is None:
+                    break
+                if due[0] in self._remaining and due[0] not in self._owner:
+                    items.append(due[0])
+            while self._queue and len(items) < max_items:
+                idx = self._queue.popleft()
+                if idx in self._remaining and idx not in self._owner:
+                    items.append(idx)
+            if not items:
+                items = self._steal(max_items)
+            if not items:
+                return None
+            lease_id = uuid.uuid4().hex
+            self._leases[lease_id] = {"worker": worker, "items": items,
+                                      "expires": now + self.lease_seconds}
+            for idx in items:
+                self._owner[idx] = lease_id
+            self._counts["leased_total"] += len(items)
+            return {"lease_id": lease_id, "lease_seconds": self.lease_seconds,
+                    "items": [[idx, self._remaining[idx]] for idx in items]}
+
+    def heartbeat(self, lease_id):
+        """Extend a lease; returns (alive, revoked indexes the worker should skip)."""
+        now = time.monotonic()
+        with self._cond:
+            self._reap(now)
+            lease = self._leases.get(lease_id)
+            if lease is None:
+                return False, []
+            lease["expires"] = now + self.lease_seconds
+            self._seen(lease["worker"], now)
+            return True, self._revoked(lease_id, lease)
+
+    def complete(self, lease_id, reports):
+        """Record finished games; ``reports`` is [{"idx", "result", "info"}, ...].
+
+        Returns (accepted count, revoked indexes of the lease).
+        """
+        accepted = []
+        with self._cond:
+            lease = self._leases.get(lease_id)
+            who = lease["worker"] if lease is not None else "expired lease"
+            for rep in reports:
+                idx = rep.get("idx")
+                if idx not in self._remaining:
+                    self._counts["duplicates"] += 1
+                    continue
+                self._owner.pop(idx, None)
+                info = rep.get("info") or {}
+                if info.get("error") and self._retry_later(idx, who, info):
+                    continue
+                del self._remaining[idx]
+                accepted.append(rep)
+            if lease is not None:
+                worker = self._workers.get(lease["worker"])
+                if worker is not None:
+                    worker["completed"] += len(accepted)
+                    worker["last_seen"] = time.monotonic()
+                revoked = self._revoked(lease_id, lease)
+                if all(self._owner.get(i) != lease_id for i in lease["items"]):
+                    del self._leases[lease_id]
+            else:
+                revoked = []
+            self._recording += len(accepted)
+        # Record outside the lock: writing results and publishing events is the slow part
+        try:
+            for rep in accepted:
+                self._on_result(rep["idx"], rep["result"], rep.get("info") or {}, who)
+        finally:
+            if accepted:
+                with self._cond:
+                    self._recording -= len(accepted)
+                    self._cond.notify_all()
+        return len(accepted), revoked
+
+    # ---- run-facing ----
+
+    def wait(self, timeout):
+        """Block until every game is finished and recorded (True) or ``timeout`` passes."""
+        with self._cond:
+            self._reap(time.monotonic())
+            if self._remaining or self._recording:
+                self._cond.wait(timeout)
+            return not self._remaining and not self._recording
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._cond:
+            return {
+                "remaining": len(self._remaining),
+                "queued": sum(1 for i in self._queue if i in self._remaining and i not in self._owner),
+                "leased": len(self._owner),
+                "leases": len(self._leases),
+                "lease_seconds": self.lease_seconds,
+                **self._counts,
+                "workers": {w: {"completed": s["completed"], "idle_seconds": round(now - s["last_seen"], 1)}
+                            for w, s in self._workers.items()},
+            }
+
+    # ---- internals (caller holds the lock) ----
+
+    def _seen(self, worker, now):
+        info = self._workers.setdefault(worker, {"last_seen": now, "completed": 0})
+        info["last_seen"] = now
+
+    def _retry_later(self, idx, worker, info):
+        delay = self.retries.failed(idx, self._remaining[idx], info)
+        if delay is None:
+            return False
+        self._counts["retried"] += 1
+        print(f"  [Remote {worker}] Retrying '{self._remaining[idx]}' in {delay:.1f}s")
+        return True
+
+    def _revoked(self, lease_id, lease):
+        return [i for i in lease["items"] if self._owner.get(i) != lease_id]
+
+    def _reap(self, now):
+        """Re-queue the unfinished games of expired leases (front of the queue)."""
+        for lease_id, lease in list(self._leases.items()):
+            if lease["expires"] > now:
+                continue
+            del self._leases[lease_id]
+            for idx in reversed(lease["items"]):
+                if self._owner.get(idx) == lease_id:
+                    del self._owner[idx]
+                    self._queue.appendleft(idx)
+                    self._counts["requeued"] += 1
+
+    def _steal(self, max_items):
+        """Take the unstarted tail of the biggest lease; its first game is probably in flight."""
+        owned = []
+        for lease_id, lease in self._leases.items():
+            mine = [i for i in lease["items"] if self._owner.get(i) == lease_id]
+            if len(mine) > len(owned):
+                owned = mine
+        if len(owned) < 2:
+            return []
+        take = owned[-min(max_items, len(owned) // 2):]
+        for idx in take:
+            del self._owner[idx]
+        self._counts["stolen"] += len(take)
+        return take
+
+
+# ---- registry of coordinated runs (one per tab) ----
+
+_lock = threading.Lock()
+_runs = {}
+_lease_runs = {}       # lease id -> Coordinator that issued it (kept until the run ends)
+_next = [0]
+
+
+def register(coord):
+    with _lock:
+        _runs[coord.name] = coord
+
+
+def unregister(coord):
+    with _lock:
+        if _runs.get(coord.name) is coord:
+            del _runs[coord.name]
+        for lease_id in [l for l, c in _lease_runs.items() if c is coord]:
+            del _lease_runs[lease_id]
+
+
+def lease_any(worker, max_items=DEFAULT_BATCH):
+    """Lease from the coordinated runs in turn; returns (lease dict or None, any runs active)."""
+    with _lock:
+        runs = list(_runs.values())
+        start = _next[0]
+        _next[0] += 1
+    for i in range(len(runs)):
+        coord = runs[(start + i) % len(runs)]
+        lease = coord.lease(worker, max_items)
+        if lease is not None:
+            with _lock:
+                if _runs.get(coord.name) is coord:
+                    _lease_runs[lease["lease_id"]] = coord
+            return lease, True
+    return None, bool(runs)
+
+
+def _run_of(lease_id):
+    with _lock:
+        return _lease_runs.get(lease_id) if isinstance(lease_id, str) else None
+
+
+def heartbeat(lease_id):
+    coord = _run_of(lease_id)
+    if coord is None:
+        return False, []
+    return coord.heartbeat(lease_id)
+
+
+def complete(lease_id, reports):
+    coord = _run_of(lease_id)
+    if coord is None:
+        return 0, []
+    return coord.complete(lease_id, reports)
+
+
+def snapshot():
+    with _lock:
+        runs = dict(_runs)
+    return {name: coord.snapshot() for name, coord in runs.items()}
+
+
+def _merge_info(stats, info):
+    """Fold a remote worker's per-game info into the run stats, as lookup_game would."""
+    if info.get("coalesced"):
+        scraper._bump(stats, "coalesced")
+    elif info.get("cached"):
+        scraper._bump(stats, "cache_hits")
+    else:
+        scraper._bump(stats, "cache_misses")
+        if info.get("direct"):
+            scraper._bump(stats, "index_hits")
+    scraper._bump(stats, "webdriver_calls", int(info.get("calls") or 0))
+    scraper._bump(stats, "wait_seconds", float(info.get("wait") or 0.0))
+    scraper._bump(stats, "work_seconds", float(info.get("work") or 0.0))
+    if info.get("pages"):
+        scraper._bump(stats, "browser_lookups")
+        scraper._bump(stats, "bytes_transferred", int(info.get("bytes") or 0))
+        scraper._bump(stats, "page_load_seconds", float(info.get("page_load") or 0.0))
+
+
+def coordinate_prices(name, games_list=None, output_file=None, progress_file=None, stop_event=None,
+                      label="", fsync="interval", on_event=None, resume=False,
+                      lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=scraper.DEFAULT_MAX_ATTEMPTS,
+                      **_ignored):
+    """Coordinator counterpart of scraper.scrape_prices: same files, events and return value.
+
+    ``name`` identifies the run to workers (the tab name).  Browser, engine
+    and cache options belong to the workers, so the local ones are ignored.
+    """
+    if stop_event is None:
+        scraper.reset_stop()
+    else:
+        stop_event.clear()
+
+    run, results_dict, todo, log = scraper.prepare_run(games_list, output_file, resume=resume,
+                                                       fsync=fsync, label=label)
+    total = len(run["games"])
+    stats = scraper._new_stats()
+    restored = [{"idx": i, "result": r} for i, r in sorted(results_dict.items())]
+    scraper.update_progress(len(results_dict), total, "", "starting", progress_file=progress_file,
+                            stats=stats, on_event=on_event, rows=restored)
+    counter = [len(results_dict)]
+
+    def on_result(idx, result, info, worker):
+        _merge_info(stats, info)
+        if info.get("error"):
+            scraper._bump(stats, "dead_letters")
+        scraper.record_result(idx, result, results_dict, counter, total, stats=stats, info=info,
+                              prefix=f"[{label}Remote {worker}]", output_file=output_file,
+                              progress_file=progress_file, log=log, on_event=on_event)
+
+    coord = Coordinator(name, todo, on_result, lease_seconds=lease_seconds,
+                        retries=scraper._new_retries(output_file, run, max_attempts))
+    register(coord)
+    print(f"Coordinating {len(todo)} of {total} games for remote workers... {label}")
+    try:
+        while not coord.wait(timeout=1.0):
+            if scraper._is_stopped(stop_event):
+                break
+    finally:
+        unregister(coord)
+
+    return scraper.finish_run(results_dict, counter, total, stats, stop_event=stop_event,
+                              output_file=output_file, progress_file=progress_file,
+                              label=label, log=log, on_event=on_event, run=run)
+
+
+# ---- worker side ----
+
+class CoordinatorClient:
+    """JSON calls to a coordinator's /api/work endpoints."""
+
+    def __init__(self, url, token=None, timeout=30):
+        self.url = url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def _post(self, path, payload):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        req = Request(f"{self.url}/api/work/{path}", data=json.dumps(payload).encode("utf-8"),
+                      headers=headers, method="POST")
+        with urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def lease(self, worker, max_items):
+        return self._post("lease", {"worker": worker, "max": max_items})
+
+    def heartbeat(self, lease_id):
+        return self._post("heartbeat", {"lease_id": lease_id})
+
+    def complete(self, lease_id, reports):
+        return self._post("complete", {"lease_id": lease_id, "results": reports})
+
+
+class _Leases:
+    """Leases held by this process, heartbeated from one background thread."""
+
+    def __init__(self, client):
+        self.client = client
+        self._held = {}        # lease id -> set of revoked indexes
+        self._lock = threading.Lock()
+        self.interval = DEFAULT_LEASE_SECONDS / 3
+
+    def add(self, lease):
+        with self._lock:
+            self._held[lease["lease_id"]] = set()
+            self.interval = min(self.interval, lease["lease_seconds"] / 3)
+
+    def drop(self, lease_id):
+        with self._lock:
+            self._held.pop(lease_id, None)
+
+    def revoke(self, lease_id, indexes):
+        with self._lock:
+            if lease_id in self._held:
+                self._held[lease_id].update(indexes)
+
+    def is_revoked(self, lease_id, idx):
+        with self._lock:
+            revoked = self._held.get(lease_id)
+            return revoked is None or idx in revoked
+
+    def beat(self, stop):
+        last = time.monotonic()
+        while not stop.wait(0.5):
+            # The interval shrinks to a third of the shortest lease seen so far
+            if time.monotonic() - last < self.interval:
+                continue
+            last = time.monotonic()
+            with self._lock:
+                held = list(self._held)
+            for lease_id in held:
+                try:
+                    reply = self.client.heartbeat(lease_id)
+                except (URLError, OSError, ValueError) as e:
+                    print(f"  [Remote] Heartbeat failed: {e}")
+                    continue
+                if reply.get("ok"):
+                    self.revoke(lease_id, reply.get("revoked", []))
+                else:
+                    self.drop(lease_id)   # expired and re-queued; stop working on it
+
+
+def _worker_loop(worker, client, leases, stop, batch, headless, http, cache, index, extract,
+                 force_refresh, idle_exit, share, speculate="off", profile="full"):
+    prefix = f"[Remote {worker}]"
+    pool = scraper.get_driver_pool()
+    idle_polls = 0
+    while not stop.is_set():
+        try:
+            reply = client.lease(worker, batch)
+        except (URLError, OSError, ValueError) as e:
+            print(f"  {prefix} Coordinator unreachable: {e}")
+            stop.wait(5)
+            continue
+        lease = reply.get("lease")
+        if lease is None:
+            idle_polls += 1
+            if idle_exit and not reply.get("active") and idle_polls >= 3:
+                break
+            stop.wait(2)
+            continue
+        idle_polls = 0
+        leases.add(lease)
+        lease_id = lease["lease_id"]
+        try:
+            for idx, game_name in lease["items"]:
+                if stop.is_set() or leases.is_revoked(lease_id, idx):
+                    continue
+                # No local retries: a failure is reported and the coordinator re-queues it
+                result, info = scraper.process_game(
+                    idx, game_name, lambda: scraper.lease_driver(pool, headless, share, profile),
+                    lambda driver, info: scraper.release_driver(pool, driver, info, share),
+                    prefix=prefix, http=http, cache=cache, force_refresh=force_refresh,
+                    extract=extract, index=index, share=share, speculate=speculate)
+                print(f"  {prefix} {game_name} -> {result['price'] or 'N/A'}")
+                try:
+                    reply = client.complete(lease_id, [{"idx": idx, "result": result, "info": info}])
+                    leases.revoke(lease_id, reply.get("revoked", []))
+                except (URLError, OSError, ValueError) as e:
+                    # The lease expires on the coordinator and the game is re-queued
+                    print(f"  {prefix} Could not report '{game_name}': {e}")
+        finally:
+            leases.drop(lease_id)
+    print(f"  {prefix} Shut down")
+
+
+def run_worker(coordinator_url, workers=1, batch=DEFAULT_BATCH, headless=False, engine="browser",
+               extract="script", use_cache=True, force_refresh=False, idle_exit=False, token=None,
+               speculate="off", profile="full"):
+    """Serve a coordinator until interrupted (or, with ``idle_exit``, until it has no runs)."""
+    scraper._check_modes(engine, extract, speculate, profile)
+    client = CoordinatorClient(coordinator_url, token=token or os.environ.get("GG_DEALS_WORKER_TOKEN"))
+    cache = scraper._resolve_cache(use_cache, None)
+    index = scraper._resolve_index(use_cache)
+    http = scraper.HttpEngine(scraper.BASE_URL) if engine == "http" else None
+    leases = _Leases(client)
+    share = scraper.join_governor("remote")
+    stop = threading.Event()
+    host = f"{socket.gethostname()}-{os.getpid()}"
+    print(f"Serving {coordinator_url} with {workers} {engine} worker(s) as {host}...")
+
+    beater = threading.Thread(target=leases.beat, args=(stop,), daemon=True)
+    beater.start()
+    threads = []
+    for wid in range(workers):
+        t = threading.Thread(
+            target=_worker_loop,
+            args=(f"{host}/{wid + 1}", client, leases, stop, batch, headless, http, cache, index,
+                  extract, force_refresh, idle_exit, share, speculate, profile),
+            daemon=True,
+        )
+        t.start()
+        threads.append(t)
+    try:
+        for t in threads:
+            while t.is_alive():
+                t.join(0.5)
+    except KeyboardInterrupt:
+        print("Stopping after the current game...")
+        stop.set()
+        for t in threads:
+            t.join()
+    stop.set()
+    share.leave()
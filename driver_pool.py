@@ -0,0 +1,235 @@
+"""Process-wide pool of warmed-up Chrome drivers shared by every run and tab.
+
+Workers lease a driver per lookup and hand it back afterwards, so a second
+run (on either tab) reuses browsers that already passed Cloudflare and the
+cookie banner.  Drivers are keyed by (headless, profile): a lease only
+reuses one launched with the same options.  Idle drivers are quit after
+``idle_timeout`` seconds,
+drivers are recycled after ``max_pages`` lookups or when they look broken,
+and at most ``max_size`` browsers exist at once.
+"""
+import atexit
+import threading
+import time
+
+DEFAULT_MAX_SIZE = 6
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_MAX_PAGES = 200
+HEALTH_CHECK_AFTER = 30  # seconds idle before a lease pings the driver first
+
+
+class _Entry:
+    __slots__ = ("driver", "headless", "profile", "pages", "warmup", "idle_since")
+
+    def __init__(self, driver, headless, warmup, profile="full"):
+        self.driver = driver
+        self.headless = headless
+        self.profile = profile
+        self.pages = 0
+        self.warmup = warmup
+        self.idle_since = time.monotonic()
+
+
+class DriverPool:
+    def __init__(self, factory, max_size=DEFAULT_MAX_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 max_pages=DEFAULT_MAX_PAGES):
+        """``factory(headless, profile)`` must return a ready (warmed-up) driver."""
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_pages = max_pages
+        self._cond = threading.Condition()
+        self._idle = []            # [_Entry], most recently used last
+        self._leased = {}          # id(driver) -> _Entry
+        self._launching = 0
+        self._quitting = 0         # recycled drivers still shutting down (they count toward max_size)
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "warmup_seconds_saved": 0.0}
+        self._reaper = None
+
+    # ---- leasing ----
+
+    def lease(self, headless=False, timeout=None, profile="full"):
+        """Return a warmed driver, launching one if the pool has room; blocks otherwise."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            doomed = None
+            with self._cond:
+                self._start_reaper()
+                while True:
+                    if self._closed:
+                        raise RuntimeError("driver pool is closed")
+                    entry = self._take_idle(headless, profile)
+                    if entry is not None:
+                        break
+                    if self._size() < self.max_size:
+                        self._launching += 1
+                        break
+                    if self._idle:
+                        # Pool is full of drivers in another mode or profile; make room
+                        doomed = self._recycle(self._idle.pop(0))
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("no browser became available")
+                    self._cond.wait(remaining)
+            if doomed is None:
+                break
+            self._quit_all([doomed])
+
+        if entry is not None:
+            if time.monotonic() - entry.idle_since > HEALTH_CHECK_AFTER and not is_healthy(entry.driver):
+                with self._cond:
+                    doomed = self._recycle(entry)
+                self._quit_all([doomed])
+                return self.lease(headless=headless, timeout=timeout, profile=profile)
+            with self._cond:
+                self._leased[id(entry.driver)] = entry
+                self.stats["reused"] += 1
+                self.stats["warmup_seconds_saved"] += entry.warmup
+            return entry.driver
+
+        start = time.monotonic()
+        try:
+            driver = self.factory(headless, profile)
+        except Exception:
+            with self._cond:
+                self._launching -= 1
+                self._cond.notify()
+            raise
+        entry = _Entry(driver, headless, time.monotonic() - start, profile)
+        with self._cond:
+            self._launching -= 1
+            self._leased[id(driver)] = entry
+            self.stats["created"] += 1
+        return driver
+
+    def release(self, driver, healthy=True, pages=1):
+        """Hand a driver back. Unhealthy or worn-out drivers are quit instead of kept."""
+        doomed = []
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+            if entry is None:
+                return
+            entry.pages += pages
+            if not healthy or entry.pages >= self.max_pages or self._closed:
+                doomed.append(self._recycle(entry))
+            else:
+                entry.idle_since = time.monotonic()
+                self._idle.append(entry)
+                self._cond.notify()
+        self._quit_all(doomed)
+
+    # ---- housekeeping ----
+
+    def _size(self):
+        return len(self._idle) + len(self._leased) + self._launching + self._quitting
+
+    def _take_idle(self, headless, profile="full"):
+        for i in range(len(self._idle) - 1, -1, -1):
+            if self._idle[i].headless == headless and self._idle[i].profile == profile:
+                return self._idle.pop(i)
+        return None
+
+    def _recycle(self, entry):
+        """Take a driver out of service and return it for _quit_all (caller holds the lock)."""
+        self.stats["recycled"] += 1
+        self._quitting += 1
+        return entry.driver
+
+    def _quit_all(self, drivers):
+        """Quit recycled drivers without holding the lock (quit() can take seconds)."""
+        if not drivers:
+            return
+        for driver in drivers:
+            _quit(driver)
+        with self._cond:
+            self._quitting -= len(drivers)
+            self._cond.notify(len(drivers))
+
+    def reap(self):
+        """Quit drivers that sat idle longer than idle_timeout."""
+        doomed = []
+        with self._cond:
+            now = time.monotonic()
+            keep = []
+            for entry in self._idle:
+                if now - entry.idle_since > self.idle_timeout:
+                    doomed.append(self._recycle(entry))
+                else:
+                    keep.append(entry)
+            self._idle = keep
+        self._quit_all(doomed)
+
+    def _start_reaper(self):
+        if self._reaper is not None or not self.idle_timeout:
+            return
+
+        def loop():
+            while not self._closed:
+                time.sleep(min(30, self.idle_timeout))
+                self.reap()
+
+        self._reaper = threading.Thread(target=loop, daemon=True, name="driver-pool-reaper")
+        self._reaper.start()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "leased": len(self._leased),
+                "idle": len(self._idle),
+                "launching": self._launching,
+                "created": self.stats["created"],
+                "reused": self.stats["reused"],
+                "recycled": self.stats["recycled"],
+                "warmup_seconds_saved": round(self.stats["warmup_seconds_saved"], 1),
+            }
+
+    def close(self):
+        """Quit every idle driver; leased ones are quit as they come back."""
+        with self._cond:
+            self._closed = True
+            doomed = [entry.driver for entry in self._idle]
+            self._quitting += len(doomed)
+            self._idle = []
+            self._cond.notify_all()
+        self._quit_all(doomed)
+
+
+def is_healthy(driver):
+    """Cheap liveness probe: one WebDriver round trip."""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(factory=None):
+    """Return the process-wide pool, creating it with ``factory`` on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if factory is None:
+                raise RuntimeError("driver pool not initialised")
+            _pool = DriverPool(factory)
+            atexit.register(_pool.close)
+        return _pool
+
+
+def pool_stats():
+    """Snapshot of the pool, or None if no run has created it yet."""
+    pool = _pool
+    return pool.snapshot() if pool is not None else None
@@ -0,0 +1,66 @@
+import threading
+
+TERMINAL_STATUSES = ("completed", "stopped", "error")
+
+
+class EventBus:
+    """In-process progress events for one tab, fanned out to SSE subscribers.
+
+    Event ids increase monotonically across runs, so a client reconnecting
+    with ``Last-Event-ID`` gets exactly the events it missed.  Subscribers
+    block on a condition variable instead of polling.  History is kept for
+    the current run only (capped at ``max_history`` events).
+    """
+
+    def __init__(self, max_history=50000):
+        self.max_history = max_history
+        self._cond = threading.Condition()
+        self._events = []          # [(id, payload)] for the current run
+        self._next_id = 1
+        self._run_start = 1        # id of the first event of the current run
+
+    def reset(self):
+        """Start a new run: drop the previous run's history."""
+        with self._cond:
+            self._events = []
+            self._run_start = self._next_id
+            self._cond.notify_all()
+
+    def publish(self, payload):
+        with self._cond:
+            event_id = self._next_id
+            self._next_id += 1
+            self._events.append((event_id, payload))
+            if len(self._events) > self.max_history:
+                del self._events[: len(self._events) - self.max_history]
+            self._cond.notify_all()
+            return event_id
+
+    def latest(self):
+        """Most recent payload of the current run, or None."""
+        with self._cond:
+            return self._events[-1][1] if self._events else None
+
+    def _since(self, after_id):
+        if not self._events:
+            return []
+        if after_id is None or after_id < self._run_start:
+            return list(self._events)
+        first = self._events[0][0]
+        return self._events[max(0, after_id + 1 - first):]
+
+    def truncated(self, after_id):
+        """True if events after ``after_id`` were already evicted from history."""
+        with self._cond:
+            if after_id is None or after_id < self._run_start or not self._events:
+                return False
+            return after_id + 1 < self._events[0][0]
+
+    def wait(self, after_id, timeout=15.0):
+        """Block until there are events newer than ``after_id`` (or timeout); return them."""
+        with self._cond:
+            events = self._since(after_id)
+            if not events:
+                self._cond.wait(timeout)
+                events = self._since(after_id)
+            return events
@@ -0,0 +1,238 @@
+"""Process-wide request-rate and browser governor shared by both tabs.
+
+Every run joins the governor under its tab's name and gets a ``Share``.
+Lookups take a token from one token bucket (``rate`` requests/second, up
+to ``burst`` at once) and lookups that need Chrome take a browser slot
+(``max_browsers`` in total).  When several tabs compete, tokens go to the
+tab that has been granted the fewest since it joined and browser slots
+are split evenly, so one tab with many workers cannot starve the other.
+
+The rate adapts AIMD-style to what gg.deals answers: it creeps up while
+the recent challenge/timeout share stays under ``threshold`` and is halved
+(at most once per ``cooldown`` seconds) when it goes over.  Per-domain
+request spacing (pacing.py) still applies on top.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+from driver_pool import DEFAULT_MAX_SIZE
+
+DEFAULT_RATE = 2.0
+
+
+class _Tab:
+    __slots__ = ("runs", "granted", "waiting", "browsers", "browsers_waiting", "outcomes")
+
+    def __init__(self, granted):
+        self.runs = 0
+        self.granted = granted
+        self.waiting = 0
+        self.browsers = 0
+        self.browsers_waiting = 0
+        self.outcomes = {"ok": 0, "challenge": 0, "timeout": 0, "error": 0}
+
+
+class Governor:
+    def __init__(self, rate=DEFAULT_RATE, burst=3, max_browsers=DEFAULT_MAX_SIZE, min_rate=0.2,
+                 max_rate=6.0, step=0.05, window=40, threshold=0.1, cooldown=5.0):
+        """``rate=None`` disables the request limit (browser slots still apply)."""
+        self.rate = rate
+        self.burst = burst
+        self.max_browsers = max_browsers
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._recent = deque(maxlen=window)   # True for a challenge or timeout
+        self._last_cut = 0.0
+        self._tabs = {}
+        self._cond = threading.Condition()
+
+    # ---- membership ----
+
+    def join(self, name):
+        """Register a run of tab ``name``; the returned Share must be left when it ends."""
+        with self._cond:
+            tab = self._tabs.get(name)
+            if tab is None:
+                # Start level with the tabs already running so a newcomer doesn't hog tokens
+                others = [t.granted for t in self._tabs.values() if t.runs]
+                tab = self._tabs[name] = _Tab(min(others) if others else 0)
+            tab.runs += 1
+            self._cond.notify_all()
+        return Share(self, name)
+
+    def _leave(self, name):
+        with self._cond:
+            tab = self._tabs.get(name)
+            if tab is not None:
+                tab.runs -= 1
+                if tab.runs <= 0 and not tab.browsers:
+                    del self._tabs[name]
+            self._cond.notify_all()
+
+    # ---- request tokens ----
+
+    def _refill(self, now):
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _next_tab(self):
+        waiting = [(t.granted, n) for n, t in self._tabs.items() if t.waiting]
+        return min(waiting)[1] if waiting else None
+
+    def acquire(self, name):
+        """Block until tab ``name`` may send a request; returns seconds waited."""
+        start = time.monotonic()
+        with self._cond:
+            tab = self._tabs[name]
+            tab.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self.rate is None:
+                        break
+                    if self._tokens >= 1 and self._next_tab() == name:
+                        self._tokens -= 1
+                        break
+                    # Sleep until the next token, or until the tab ahead of us takes it
+                    self._cond.wait(max(0.005, (1 - self._tokens) / self.rate) if self._tokens < 1 else 0.05)
+                tab.granted += 1
+                self._cond.notify_all()
+            finally:
+                tab.waiting -= 1
+        return time.monotonic() - start
+
+    # ---- browser slots ----
+
+    def fair_browsers(self, name):
+        """Browser slots tab ``name`` may hold while other tabs also want some."""
+        wanting = [n for n, t in self._tabs.items() if t.browsers or t.browsers_waiting]
+        if name not in wanting:
+            wanting.append(name)
+        return max(1, math.ceil(self.max_browsers / len(wanting)))
+
+    def _may_take_browser(self, name):
+        in_use = sum(t.browsers for t in self._tabs.values())
+        if in_use >= self.max_browsers:
+            return False
+        tab = self._tabs[name]
+        if tab.browsers < self.fair_browsers(name):
+            return True
+        # Over the fair share: only while no other tab is waiting for one
+        return not any(t.browsers_waiting for n, t in self._tabs.items() if n != name)
+
+    def lease_browser(self, name):
+        """Block until tab ``name`` may hold one more browser; returns seconds waited."""
+        start = time.monotonic()
+        with self._cond:
+            tab = self._tabs[name]
+            tab.browsers_waiting += 1
+            try:
+                while not self._may_take_browser(name):
+                    self._cond.wait(1.0)
+                tab.browsers += 1
+            finally:
+                tab.browsers_waiting -= 1
+        return time.monotonic() - start
+
+    def release_browser(self, name):
+        with self._cond:
+            tab = self._tabs.get(name)
+            if tab is not None and tab.browsers:
+                tab.browsers -= 1
+                if tab.runs <= 0 and not tab.browsers:
+                    del self._tabs[name]
+            self._cond.notify_all()
+
+    # ---- adaptation ----
+
+    def report(self, name, outcome):
+        """Feed back one lookup: "ok", "challenge", "timeout" or "error"."""
+        with self._cond:
+            tab = self._tabs.get(name)
+            if tab is not None:
+                tab.outcomes[outcome] = tab.outcomes.get(outcome, 0) + 1
+            if outcome == "error":
+                return          # site-side trouble we can't pace away (bad pages, bugs)
+            self._recent.append(outcome != "ok")
+            if self.rate is None:
+                return
+            pressure = sum(self._recent) / len(self._recent)
+            now = time.monotonic()
+            if pressure > self.threshold:
+                if now - self._last_cut >= self.cooldown:
+                    self.rate = max(self.min_rate, self.rate / 2)
+                    self._last_cut = now
+            elif outcome == "ok":
+                self.rate = min(self.max_rate, self.rate + self.step)
+
+    def snapshot(self):
+        with self._cond:
+            self._refill(time.monotonic())
+            recent = len(self._recent)
+            return {
+                "rate": round(self.rate, 3) if self.rate is not None else None,
+                "tokens": round(self._tokens, 2) if self.rate is not None else None,
+                "burst": self.burst,
+                "max_browsers": self.max_browsers,
+                "browsers_in_use": sum(t.browsers for t in self._tabs.values()),
+                "pressure": round(sum(self._recent) / recent, 3) if recent else 0.0,
+                "tabs": {
+                    n: {"runs": t.runs, "granted": t.granted, "waiting": t.waiting,
+                        "browsers": t.browsers, "browsers_waiting": t.browsers_waiting,
+                        "fair_browsers": self.fair_browsers(n), **t.outcomes}
+                    for n, t in self._tabs.items()
+                },
+            }
+
+
+class Share:
+    """One run's handle on the governor."""
+
+    def __init__(self, governor, name):
+        self.governor = governor
+        self.name = name
+
+    def acquire(self):
+        return self.governor.acquire(self.name)
+
+    def lease_browser(self):
+        return self.governor.lease_browser(self.name)
+
+    def release_browser(self):
+        self.governor.release_browser(self.name)
+
+    def report(self, outcome):
+        self.governor.report(self.name, outcome)
+
+    def leave(self):
+        self.governor._leave(self.name)
+
+
+_governor = None
+_lock = threading.Lock()
+
+
+def get_governor():
+    """The process-wide governor (created on first use)."""
+    global _governor
+    with _lock:
+        if _governor is None:
+            _governor = Governor()
+        return _governor
+
+
+def configure_governor(**kwargs):
+    """Replace the process-wide governor with Governor(**kwargs)."""
+    global _governor
+    with _lock:
+        _governor = Governor(**kwargs)
+        return _governor
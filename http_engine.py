@@ -0,0 +1,377 @@
+"""Browserless fetch backend: plain HTTPS GETs of gg.deals search and game pages.
+
+Connections are kept alive per thread and share one cookie jar, which can be
+seeded from a warmed-up Selenium session (Cloudflare clearance cookies are
+tied to the browser's user agent, so that is copied too).  When gg.deals
+answers with a challenge page the caller is expected to fall back to the
+browser and re-seed the jar.
+"""
+import gzip
+import http.client
+import sys
+import threading
+import zlib
+from html.parser import HTMLParser
+from urllib.parse import quote_plus, urljoin, urlsplit
+
+BASE_URL = "https://gg.deals"
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+# Only markers of the interstitial itself: every normal gg.deals page also
+# loads a /cdn-cgi/challenge-platform/ script, so that path proves nothing.
+_CHALLENGE_MARKERS = (
+    "<title>just a moment",
+    "<title>attention required! | cloudflare",
+    'id="challenge-form"',
+    "cf_chl_opt",
+)
+
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+class ChallengeError(Exception):
+    """gg.deals served a Cloudflare challenge instead of the search page."""
+
+
+# Rate-limited or overloaded: a real browser would get the same answer, so
+# these are plain fetch errors for the RetryScheduler, not challenges
+RETRY_STATUSES = (429, 503)
+
+
+class FetchError(Exception):
+    """gg.deals answered with an HTTP error instead of a page."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def is_challenge(status, html):
+    """403, or a Cloudflare interstitial (often served as a 503) whatever the status."""
+    if status == 403:
+        return True
+    head = html[:20000].lower()
+    return any(m in head for m in _CHALLENGE_MARKERS)
+
+
+class _SearchPageParser(HTMLParser):
+    """Collect the same fields _extract_item_info reads from the live DOM."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []          # one dict per .hoverable-box
+        self.rows = []           # one per "[class*='game-list'] > div, .list-items > div"
+        self.links = []          # every a.full-link: (aria-label, href)
+        self.prices = []         # every span.price text
+        self._stack = []         # currently open tag names
+        self._lists = []         # stack depths of open game-list / list-items containers
+        self._open = []          # items being filled: (item, depth, target list)
+        self._text_role = None
+        self._text_depth = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        depth = len(self._stack)
+        if "hoverable-box" in classes and not self._filling(self.items):
+            self._open.append((self._new_item(), depth, self.items))
+        if (tag == "div" and self._lists and self._lists[-1] == depth - 1
+                and not self._filling(self.rows)):
+            self._open.append((self._new_item(), depth, self.rows))
+
+        if tag == "a" and "full-link" in classes:
+            aria = attrs.get("aria-label")
+            href = attrs.get("href")
+            self.links.append((aria, href))
+            # find_element() semantics: only the first link inside the item counts
+            for item, _, _ in self._open:
+                if not item["link"]:
+                    item["link"] = True
+                    if aria:
+                        item["name"] = aria.replace("Go to: ", "").strip()
+                    if href:
+                        item["url"] = href
+
+        if self._text_role is None:
+            if tag == "span" and "price" in classes:
+                self._start_text("price")
+            elif "game-info-title" in classes and self._open:
+                self._start_text("title")
+
+        if tag not in _VOID_TAGS:
+            self._stack.append(tag)
+            if "game-list" in (attrs.get("class") or "") or "list-items" in classes:
+                self._lists.append(depth)
+
+    def _filling(self, target):
+        return any(t is target for _, _, t in self._open)
+
+    @staticmethod
+    def _new_item():
+        return {"name": None, "title": None, "price": None, "url": None, "link": False}
+
+    def _start_text(self, role):
+        self._text_role = role
+        self._text_depth = len(self._stack)
+        self._text = []
+
+    def handle_data(self, data):
+        if self._text_role is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        # Pop back to the matching open tag (tolerates unclosed children)
+        for pos in range(len(self._stack) - 1, -1, -1):
+            if self._stack[pos] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > pos:
+            self._stack.pop()
+            depth = len(self._stack)
+            if self._text_role is not None and depth == self._text_depth:
+                self._finish_text()
+            while self._open and self._open[-1][1] == depth:
+                item, _, target = self._open.pop()
+                target.append(item)
+            if self._lists and self._lists[-1] == depth:
+                self._lists.pop()
+
+    def _finish_text(self):
+        text = " ".join("".join(self._text).split())
+        role = self._text_role
+        self._text_role = None
+        self._text_depth = None
+        if role == "price":
+            self.prices.append(text)
+        for item, _, _ in self._open:
+            if item[role] is None:
+                item[role] = text
+
+
+# Boxes holding the current best price in the header of a /game/<slug>/ page
+GAME_PRICE_CLASSES = ("game-header-current-prices", "game-price-current", "game-header-price-box")
+
+
+class _GamePageParser(HTMLParser):
+    """First span.price inside one of GAME_PRICE_CLASSES."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.price = None
+        self._stack = []
+        self._box_depth = None
+        self._text_depth = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.price is not None:
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if self._box_depth is None and any(c in GAME_PRICE_CLASSES for c in classes):
+            self._box_depth = len(self._stack)
+        elif self._box_depth is not None and self._text_depth is None and tag == "span" and "price" in classes:
+            self._text_depth = len(self._stack)
+            self._text = []
+        if tag not in _VOID_TAGS:
+            self._stack.append(tag)
+
+    def handle_data(self, data):
+        if self._text_depth is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or tag not in self._stack:
+            return
+        while self._stack:
+            open_tag = self._stack.pop()
+            depth = len(self._stack)
+            if self._text_depth is not None and depth == self._text_depth:
+                self.price = " ".join("".join(self._text).split()) or None
+                self._text_depth = None
+            if self._box_depth is not None and depth == self._box_depth:
+                self._box_depth = None
+            if open_tag == tag:
+                break
+
+
+def parse_game_price(html):
+    """Current price from a game page, or None if the header box is not found."""
+    parser = _GamePageParser()
+    parser.feed(html)
+    parser.close()
+    return parser.price
+
+
+def parse_search_results(html, base_url=BASE_URL):
+    """Parse a search page into [(name, price, url), ...] in page order.
+
+    Mirrors scrape_game: .hoverable-box items (aria-label name, falling back
+    to .game-info-title), or the game-list rows when the page has no boxes,
+    else the bare a.full-link fallback with the first span.price on the page.
+    ``price`` may be None for items without one.
+    """
+    parser = _SearchPageParser()
+    parser.feed(html)
+    parser.close()
+
+    candidates = []
+    for it in parser.items or parser.rows:
+        name = it["name"] or it["title"]
+        url = urljoin(base_url + "/", it["url"]) if it["url"] else None
+        candidates.append((name, it["price"] or None, url))
+    if any(c[0] for c in candidates):
+        return candidates
+
+    first_price = parser.prices[0] if parser.prices else None
+    fallback = []
+    for aria, href in parser.links:
+        if not aria:
+            continue
+        url = urljoin(base_url + "/", href) if href else None
+        fallback.append((aria.replace("Go to: ", "").strip(), first_price, url))
+    return fallback
+
+
+class HttpSession:
+    """Keep-alive HTTPS connections (one per thread) sharing a cookie jar."""
+
+    def __init__(self, base_url=BASE_URL, user_agent=DEFAULT_USER_AGENT, timeout=15):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.cookies = {}
+        self._cookie_lock = threading.Lock()
+        self._local = threading.local()
+
+    def seed_from_driver(self, driver):
+        """Copy cookies and user agent from a warmed-up Selenium driver."""
+        with self._cookie_lock:
+            for c in driver.get_cookies():
+                self.cookies[c["name"]] = c["value"]
+        try:
+            ua = driver.execute_script("return navigator.userAgent")
+            if ua:
+                self.user_agent = ua.replace("HeadlessChrome", "Chrome")
+        except Exception:
+            pass
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local.conn = None
+
+    def _headers(self):
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        with self._cookie_lock:
+            if self.cookies:
+                headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        return headers
+
+    def _store_cookies(self, resp):
+        for header in resp.msg.get_all("Set-Cookie") or []:
+            pair = header.split(";", 1)[0]
+            if "=" in pair:
+                k, v = pair.split("=", 1)
+                with self._cookie_lock:
+                    self.cookies[k.strip()] = v.strip()
+
+    def get(self, path):
+        """GET ``path`` and return (status, decoded body). Retries once on a stale socket."""
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request("GET", path, headers=self._headers())
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (http.client.HTTPException, OSError):
+                self._drop_connection()
+                if attempt == 2:
+                    raise
+                continue
+            self._store_cookies(resp)
+            encoding = (resp.getheader("Content-Encoding") or "").lower()
+            if encoding == "gzip":
+                raw = gzip.decompress(raw)
+            elif encoding == "deflate":
+                raw = zlib.decompress(raw)
+            if (resp.getheader("Connection") or "").lower() == "close":
+                self._drop_connection()
+            return resp.status, raw.decode("utf-8", errors="replace")
+
+    def close(self):
+        self._drop_connection()
+
+
+class HttpEngine:
+    """Search gg.deals over plain HTTP; raises ChallengeError when blocked."""
+
+    def __init__(self, base_url=BASE_URL, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or HttpSession(self.base_url)
+
+    def search(self, query):
+        status, html = self.session.get(f"/games/?title={quote_plus(query)}")
+        if is_challenge(status, html):
+            raise ChallengeError(f"challenge page (HTTP {status}) for '{query}'")
+        if status >= 400:
+            raise FetchError(f"HTTP {status} for '{query}'", status)
+        return parse_search_results(html, base_url=self.base_url)
+
+    def game_price(self, url):
+        """Fetch a known game page directly; returns the current price or None."""
+        path = urlsplit(url).path or "/"
+        status, html = self.session.get(path)
+        if is_challenge(status, html):
+            raise ChallengeError(f"challenge page (HTTP {status}) for {path}")
+        if status in RETRY_STATUSES:
+            raise FetchError(f"HTTP {status} for {path}", status)
+        if status != 200:
+            return None
+        return parse_game_price(html)
+
+    def seed_from_driver(self, driver):
+        self.session.seed_from_driver(driver)
+
+
+if __name__ == "__main__":
+    # Check the parser against a saved page:  python http_engine.py page.html
+    if len(sys.argv) < 2:
+        print("Usage: python http_engine.py <saved_search_page.html>")
+        sys.exit(1)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        page = f.read()
+    print(f"challenge: {is_challenge(200, page)}")
+    for n, p, u in parse_search_results(page):
+        print(f"{n} | {p} | {u}")
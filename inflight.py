@@ -0,0 +1,85 @@
+"""Process-wide single-flight for lookups: one page load per title at a time.
+
+Both tabs (and any runner in the process) look titles up through the same
+``SingleFlight``, keyed on the normalized name.  When a lookup for a key is
+already in flight, a second caller waits for it and gets its result instead
+of loading the page again; this covers overlapping lists on the two tabs
+and titles that only differ in punctuation or a platform suffix.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}         # key -> _Call in flight
+        self.stats = {"leaders": 0, "shared": 0, "rejected": 0}
+
+    def do(self, key, fn, accept=None):
+        """Return (fn(), False), or (value, True) when another caller's call for
+        ``key`` was in flight and finished with a value ``accept`` allows.
+
+        Followers that reject (or see raise) the leader's result go round again:
+        the first becomes the new leader and the others wait for its result.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    self.stats["leaders"] += 1
+                    leader = True
+                else:
+                    call.followers += 1
+                    leader = False
+
+            if leader:
+                try:
+                    call.value = fn()
+                    return call.value, False
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+
+            call.done.wait()
+            if call.error is None and (accept is None or accept(call.value)):
+                with self._lock:
+                    self.stats["shared"] += 1
+                return call.value, True
+            with self._lock:
+                self.stats["rejected"] += 1
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
+
+
+_flights = None
+_lock = threading.Lock()
+
+
+def get_flights():
+    """The process-wide SingleFlight shared by every run and tab."""
+    global _flights
+    with _lock:
+        if _flights is None:
+            _flights = SingleFlight()
+        return _flights
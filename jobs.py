@@ -0,0 +1,217 @@
+"""Job scheduler: queued scrape runs sharing one worker budget.
+
+Every run — a tab's Start or a ``POST /api/jobs`` — is a Job.  A job costs
+its worker count; the scheduler starts the highest-priority queued job
+(FIFO among equal priorities) as soon as that many workers of the shared
+``budget`` are free, so any number of jobs can be submitted without
+oversubscribing Chrome.  Jobs never jump the head of the queue, so a large
+job is not starved by a stream of small ones.
+
+A ``key`` makes a job exclusive: while a job with the same key is queued or
+running, submitting another raises JobConflict (the tabs use their name).
+The scheduler knows nothing about scraping: ``runner(job)`` does the work
+in the job's own thread and returns its final status, and ``on_prune(job)``
+disposes of a finished job's files once it drops off the job list.
+"""
+import heapq
+import itertools
+import threading
+import time
+import uuid
+
+from driver_pool import DEFAULT_MAX_SIZE
+
+QUEUED = "queued"
+RUNNING = "running"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+DONE_STATUSES = ("completed", "stopped", "cancelled", "error")
+
+DEFAULT_BUDGET = DEFAULT_MAX_SIZE   # workers across all running jobs
+MAX_FINISHED = 100                  # finished jobs kept for GET /api/jobs
+
+
+class JobConflict(Exception):
+    pass
+
+
+def new_job_id():
+    return uuid.uuid4().hex[:12]
+
+
+class Job:
+    def __init__(self, job_id, name, workers, priority=0, options=None, store=None, key=None,
+                 cost=None):
+        self.id = job_id
+        self.name = name
+        self.key = key
+        self.workers = workers
+        self.cost = workers if cost is None else cost
+        self.priority = priority
+        self.seq = 0                 # submission order, for FIFO among equal priorities
+        self.options = options or {}
+        self.store = store           # the caller's per-job state (files, event bus, index)
+        self.status = QUEUED
+        self.error = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATUSES
+
+    def snapshot(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "priority": self.priority,
+            "workers": self.workers,
+            "cost": self.cost,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobScheduler:
+    def __init__(self, runner, budget=DEFAULT_BUDGET, max_finished=MAX_FINISHED, on_prune=None):
+        """``runner(job)`` runs a job to the end and returns its final status.
+
+        ``on_prune(job)`` is called, outside the lock, for every finished job
+        dropped once more than ``max_finished`` are kept.
+        """
+        self.runner = runner
+        self.budget = max(1, budget)
+        self.max_finished = max_finished
+        self.on_prune = on_prune
+        self._lock = threading.Lock()
+        self._queue = []             # heap of (-priority, seq, job); cancelled jobs are skipped
+        self._seq = itertools.count()
+        self._jobs = {}              # id -> Job, oldest first
+        self._in_use = 0
+
+    # ---- submitting and cancelling ----
+
+    def submit(self, name, workers=1, priority=0, options=None, store=None, key=None, cost=None,
+               job_id=None, on_submit=None):
+        """Queue a job (starting it at once if the budget allows) and return it.
+
+        ``cost`` (default ``workers``) is capped at the budget so every job can
+        run.  ``on_submit(job)`` is called before the job can start.
+        """
+        with self._lock:
+            if key is not None and self._active(key) is not None:
+                raise JobConflict(f"A job for '{key}' is already queued or running")
+            cost = min(max(0, workers if cost is None else cost), self.budget)
+            job = Job(job_id or new_job_id(), name, workers, priority, options, store, key, cost)
+            job.seq = next(self._seq)
+            if on_submit is not None:
+                on_submit(job)
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (-priority, job.seq, job))
+            pruned = self._prune()
+            self._dispatch()
+        self._dispose(pruned)
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or ask a running one to stop.  Returns the job (or None)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == QUEUED:
+                job.status = "cancelled"
+                job.finished = time.time()
+                self._dispatch()
+            elif job.status == RUNNING:
+                job.stop_event.set()
+            return job
+
+    # ---- running ----
+
+    def _dispatch(self):
+        """Start queued jobs from the head while they fit (caller holds the lock)."""
+        while self._queue:
+            job = self._queue[0][2]
+            if job.status != QUEUED:
+                heapq.heappop(self._queue)
+                continue
+            if self._in_use + job.cost > self.budget:
+                break
+            heapq.heappop(self._queue)
+            self._in_use += job.cost
+            job.status = RUNNING
+            job.started = time.time()
+            job.thread = threading.Thread(target=self._run, args=(job,), daemon=True,
+                                          name=f"job-{job.id}")
+            job.thread.start()
+
+    def _run(self, job):
+        try:
+            status = self.runner(job)
+        except Exception as e:
+            status = "error"
+            job.error = str(e) or type(e).__name__
+            print(f"[Jobs] {job.name} ({job.id}) failed: {job.error}")
+        with self._lock:
+            self._in_use -= job.cost
+            job.status = status if status in DONE_STATUSES else "completed"
+            job.finished = time.time()
+            self._dispatch()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished and return them."""
+        finished = [j for j in self._jobs.values() if not j.active]
+        pruned = finished[:max(0, len(finished) - self.max_finished)]
+        for job in pruned:
+            del self._jobs[job.id]
+        return pruned
+
+    def _dispose(self, pruned):
+        if self.on_prune is None:
+            return
+        for job in pruned:
+            try:
+                self.on_prune(job)
+            except Exception as e:
+                print(f"[Jobs] Could not clean up {job.name} ({job.id}): {e}")
+
+    # ---- queries ----
+
+    def _active(self, key):
+        for job in self._jobs.values():
+            if job.key == key and job.active:
+                return job
+        return None
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """All known jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def position(self, job):
+        """Queued jobs ahead of ``job`` (0 = next to start), or None once it left the queue."""
+        with self._lock:
+            if job.status != QUEUED:
+                return None
+            return sum(1 for _, _, other in self._queue
+                       if other.status == QUEUED and (-other.priority, other.seq) < (-job.priority, job.seq))
+
+    def snapshot(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            return {
+                "budget": self.budget,
+                "in_use": self._in_use,
+                "queued": sum(1 for j in jobs if j.status == QUEUED),
+                "running": sum(1 for j in jobs if j.status == RUNNING),
+            }
@@ -0,0 +1,146 @@
+"""Fuzzy title matching used to pick the best gg.deals search result.
+
+``normalize`` lowercases a title and strips platform tags and punctuation
+with precompiled patterns (memoized, titles repeat a lot).  A ``Query``
+normalizes the searched title once and scores any number of candidates
+against it.  Scores are exactly those of the old ``name_similarity``:
+1.0 for an exact normalized match, at least 0.85 when one title contains
+the other, otherwise difflib's Ratcliff/Obershelp ratio.
+
+``Query.best`` avoids most difflib work: the LCS ratio
+2*LCS / (len(a) + len(b)) is never below the Ratcliff/Obershelp ratio, so a
+candidate whose LCS ratio cannot beat the best score so far is skipped.
+rapidfuzz computes that bound in C when installed; otherwise a bit-parallel
+LCS in pure Python does.  See benchmarks/matcher_bench.py.
+"""
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+try:
+    from rapidfuzz.distance import Indel as _Indel
+except ImportError:  # optional speed-up
+    _Indel = None
+
+KERNEL = "rapidfuzz" if _Indel is not None else "lcs"
+
+CONTAINS_FLOOR = 0.85
+
+_PLATFORM_RE = re.compile(r"\b(ps[345]|xbox|switch|pc|mac|linux)\b")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_SEPARATOR_RE = re.compile(r"[:\-–—|]")
+_SUBTITLE_RE = re.compile(r"\s*:\s*|\s+[-–—|]\s+")
+
+
+@lru_cache(maxsize=65536)
+def normalize(name):
+    """Normalize a game name for fuzzy comparison."""
+    s = name.lower()
+    # Remove common platform/edition suffixes
+    s = _PLATFORM_RE.sub("", s)
+    # Remove punctuation and extra whitespace
+    s = _PUNCT_RE.sub(" ", s)
+    return _SPACE_RE.sub(" ", s).strip()
+
+
+def simplify_query(name):
+    """Simplify a game name for a retry search (strip punctuation, subtitles)."""
+    s = _SEPARATOR_RE.sub(" ", name)       # Replace colons/dashes with space
+    s = _PUNCT_RE.sub("", s)               # Remove remaining punctuation
+    return _SPACE_RE.sub(" ", s).strip()   # Collapse whitespace
+
+
+def base_title(name):
+    """The title without its subtitle ("Mass Effect: Andromeda" -> "Mass Effect"), or None."""
+    parts = _SUBTITLE_RE.split(name, 1)
+    base = parts[0].strip()
+    if len(parts) < 2 or len(base) < 3:
+        return None
+    return base
+
+
+class Query:
+    """A searched title, normalized once and scored against many candidates."""
+
+    def __init__(self, name, kernel=None):
+        self.name = name
+        self.norm = normalize(name)
+        self.kernel = kernel or KERNEL
+        if self.kernel == "rapidfuzz" and _Indel is None:
+            raise ValueError("rapidfuzz is not installed")
+        # Reused across candidates; the query stays the first sequence
+        # because Ratcliff/Obershelp is not symmetric
+        self._sm = SequenceMatcher(None)
+        self._sm.set_seq1(self.norm)
+        # Bit mask of positions per character, for the bit-parallel LCS
+        self._masks = {}
+        for i, ch in enumerate(self.norm):
+            self._masks[ch] = self._masks.get(ch, 0) | (1 << i)
+        self._full = (1 << len(self.norm)) - 1
+
+    def _lcs(self, other):
+        """Length of the longest common subsequence (Allison-Dix / Hyyro)."""
+        masks, full = self._masks, self._full
+        v = full
+        for ch in other:
+            u = v & masks.get(ch, 0)
+            v = ((v + u) | (v - u)) & full
+        return len(self.norm) - v.bit_count()
+
+    def lcs_ratio(self, other):
+        """2*LCS / total length of two normalized titles (an upper bound of the score ratio)."""
+        if self.kernel == "rapidfuzz":
+            return _Indel.normalized_similarity(self.norm, other)
+        total = len(self.norm) + len(other)
+        return 2.0 * self._lcs(other) / total if total else 1.0
+
+    def _score_norm(self, b):
+        a = self.norm
+        # Exact normalized match
+        if a == b:
+            return 1.0
+        self._sm.set_seq2(b)
+        # One contains the other fully
+        if a in b or b in a:
+            return max(CONTAINS_FLOOR, self._sm.ratio())
+        return self._sm.ratio()
+
+    def score(self, candidate):
+        """Return a 0-1 similarity score against one candidate title."""
+        return self._score_norm(normalize(candidate))
+
+    def scores(self, candidates):
+        """Score a whole candidate list in one call."""
+        return [self.score(c) if c else 0.0 for c in candidates]
+
+    def best(self, candidates, stop_at=0.95, best_score=0.0):
+        """Return (index, score) of the best candidate scoring above ``best_score``.
+
+        Same pick as scoring every candidate in order and stopping at the
+        first one reaching ``stop_at``; index is None if nothing beat
+        ``best_score``.
+        """
+        best_i = None
+        a = self.norm
+        for i, name in enumerate(candidates):
+            if not name:
+                continue
+            b = normalize(name)
+            if a != b:
+                bound = self.lcs_ratio(b)
+                if a in b or b in a:
+                    bound = max(CONTAINS_FLOOR, bound)
+                if bound <= best_score and bound < stop_at:
+                    continue
+            score = self._score_norm(b)
+            if score > best_score:
+                best_i, best_score = i, score
+            if score >= stop_at:
+                break
+        return best_i, best_score
+
+
+def similarity(search_name, result_name):
+    """One-off score between two titles (use a Query when scoring many)."""
+    return Query(search_name).score(result_name)
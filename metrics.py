@@ -0,0 +1,255 @@
+"""Low-overhead stage timers, per-run histograms and process-wide counters.
+
+Scraper code wraps each stage (Chrome launch, driver.get, waits, DOM
+extraction, matching, retries, saving, lock waits...) in ``timer(stage)``
+or calls ``observe(stage, seconds)``.  Samples go to the recorder bound to
+the current thread with ``bind()``: one recorder per worker per run, so
+recording never takes a lock.  ``RunTimings`` merges its workers' recorders
+into per-run histograms for the progress payload; finished runs are folded
+into process totals that ``prometheus_text()`` serves alongside counters.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds (Prometheus "le"); the last bucket is +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTERS = {
+    "games_processed_total": "Games looked up (including cache hits)",
+    "retries_total": "Searches retried with a simplified query",
+    "cache_hits_total": "Games served from the price cache",
+    "errors_total": "Lookups that raised an error",
+    "requeued_total": "Failed lookups re-queued with backoff",
+    "dead_letters_total": "Games given up on after every attempt failed",
+    "speculative_lookups_total": "Lookups that searched query variants in parallel",
+    "speculation_wins_total": "Speculative lookups whose best match came from a variant",
+    "speculation_saved_total": "Speculative lookups that replaced a sequential retry search",
+    "stop_requests_total": "Stop requests received",
+    "bytes_transferred_total": "Bytes loaded by browser page loads (transfer size)",
+    "coalesced_total": "Lookups that shared another caller's in-flight result",
+}
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.total += other.total
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Estimate of the q-quantile (None when empty).
+
+        Interpolated linearly inside the bucket that holds it, with the
+        bucket narrowed to the smallest and largest sample seen, so a stage
+        that always takes 0.01 ms reports about 0.01 ms rather than the
+        bucket's 1 ms upper bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = max(BUCKETS[i - 1] if i else 0.0, self.min)
+                upper = min(BUCKETS[i] if i < len(BUCKETS) else self.max, self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / n
+            seen += n
+        return self.max
+
+    def summary(self):
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 1),
+            "mean_ms": round(self.total * 1000 / self.count, 2) if self.count else 0,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 3),
+        }
+
+
+class Recorder:
+    """Stage histograms of one worker; written only by the thread it is bound to."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def observe(self, stage, seconds):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = Histogram()
+        hist.observe(seconds)
+
+
+def _merge_into(target, stages):
+    for stage, hist in list(stages.items()):
+        merged = target.get(stage)
+        if merged is None:
+            merged = target[stage] = Histogram()
+        merged.merge(hist)
+
+
+class RunTimings:
+    """All worker recorders of one run."""
+
+    def __init__(self, label="", interval=1.0):
+        self.label = label
+        self.interval = interval
+        self._workers = {}
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    def worker(self, name):
+        with self._lock:
+            rec = self._workers.get(name)
+            if rec is None:
+                rec = self._workers[name] = Recorder()
+            return rec
+
+    def merged(self):
+        with self._lock:
+            workers = list(self._workers.values())
+        out = {}
+        for rec in workers:
+            _merge_into(out, rec.stages)
+        return out
+
+    def summary(self, per_worker=True):
+        """JSON-able per-run (and per-worker) stage aggregates for the progress payload."""
+        data = {"stages": {s: h.summary() for s, h in sorted(self.merged().items())}}
+        if per_worker:
+            with self._lock:
+                workers = dict(self._workers)
+            data["workers"] = {
+                name: {s: round(h.total * 1000, 1) for s, h in sorted(list(rec.stages.items()))}
+                for name, rec in sorted(workers.items())
+            }
+        return data
+
+    def due(self):
+        """True at most once per ``interval`` seconds (throttles payload size)."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_report < self.interval:
+                return False
+            self._last_report = now
+            return True
+
+
+# ---- thread binding ----
+
+_local = threading.local()
+
+
+def bind(run, worker_name):
+    """Route this thread's samples to ``worker_name`` of ``run`` (None unbinds)."""
+    _local.run = run
+    _local.rec = run.worker(worker_name) if run is not None else None
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def observe(stage, seconds):
+    rec = getattr(_local, "rec", None)
+    if rec is not None:
+        rec.observe(stage, seconds)
+
+
+class timer:
+    """``with timer("get"): driver.get(url)`` records the block's duration."""
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+# ---- process-wide registry ----
+
+_registry_lock = threading.Lock()
+_counters = {name: 0 for name in COUNTERS}
+_active_runs = []
+_finished = {}
+
+
+def inc(name, n=1):
+    with _registry_lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def start_run(label=""):
+    run = RunTimings(label)
+    with _registry_lock:
+        _active_runs.append(run)
+    return run
+
+
+def finish_run(run):
+    """Fold a finished run into the process totals."""
+    stages = run.merged()
+    with _registry_lock:
+        if run in _active_runs:
+            _active_runs.remove(run)
+            _merge_into(_finished, stages)
+
+
+def prometheus_text(prefix="ggdeals_"):
+    """Counters and stage histograms in the Prometheus text exposition format."""
+    with _registry_lock:
+        counters = dict(_counters)
+        runs = list(_active_runs)
+        stages = {}
+        _merge_into(stages, _finished)
+    for run in runs:
+        _merge_into(stages, run.merged())
+
+    lines = []
+    for name, value in counters.items():
+        lines.append(f"# HELP {prefix}{name} {COUNTERS.get(name, name)}")
+        lines.append(f"# TYPE {prefix}{name} counter")
+        lines.append(f"{prefix}{name} {value}")
+    name = f"{prefix}stage_seconds"
+    lines.append(f"# HELP {name} Time spent per scraper stage")
+    lines.append(f"# TYPE {name} histogram")
+    for stage, hist in sorted(stages.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), hist.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {hist.total:.6f}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+    lines.append(f"# HELP {prefix}active_runs Runs in progress")
+    lines.append(f"# TYPE {prefix}active_runs gauge")
+    lines.append(f"{prefix}active_runs {len(runs)}")
+    return "\n".join(lines) + "\n"
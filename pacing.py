@@ -0,0 +1,66 @@
+import threading
+import time
+
+
+class Pacer:
+    """Adaptive spacing between requests to one domain, shared by all workers.
+
+    Every healthy response shrinks the gap multiplicatively (down to
+    ``minimum``); errors, timeouts and challenge pages grow it, so all workers
+    back off together when the site starts pushing back.
+    """
+
+    def __init__(self, initial=0.3, minimum=0.05, maximum=30.0, speedup=0.85,
+                 backoff=2.0, challenge_backoff=4.0):
+        self.delay = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.speedup = speedup
+        self.backoff = backoff
+        self.challenge_backoff = challenge_backoff
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller may send its next request; return seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+        pause = slot - now
+        if pause > 0:
+            time.sleep(pause)
+        return pause
+
+    def success(self):
+        with self._lock:
+            self.delay = max(self.minimum, self.delay * self.speedup)
+
+    def failure(self, challenge=False):
+        factor = self.challenge_backoff if challenge else self.backoff
+        with self._lock:
+            self.delay = min(self.maximum, max(self.delay, self.minimum, 0.25) * factor)
+
+    def snapshot(self):
+        with self._lock:
+            return {"delay": round(self.delay, 3)}
+
+
+_pacers = {}
+_pacers_lock = threading.Lock()
+
+
+def get_pacer(domain):
+    """Return the process-wide pacer for ``domain`` (created on first use)."""
+    with _pacers_lock:
+        pacer = _pacers.get(domain)
+        if pacer is None:
+            pacer = _pacers[domain] = Pacer()
+        return pacer
+
+
+def configure_pacer(domain, **kwargs):
+    """Replace the pacer for ``domain`` with one built from Pacer(**kwargs)."""
+    with _pacers_lock:
+        pacer = _pacers[domain] = Pacer(**kwargs)
+        return pacer
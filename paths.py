@@ -0,0 +1,13 @@
+"""Where runtime files live; shared by the scraper and the SQLite stores."""
+import os
+import sys
+
+
+def data_dir():
+    """Writable directory: next to .exe when frozen, else script dir."""
+    if getattr(sys, "frozen", False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+BASE_DIR = data_dir()
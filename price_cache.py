@@ -0,0 +1,179 @@
+import os
+import sqlite3
+import threading
+import time
+
+from paths import BASE_DIR
+
+# Defaults: prices on gg.deals move a few times a day at most.  The process-wide
+# cache reads GG_DEALS_CACHE_TTL (seconds, 0 = never expire) and
+# GG_DEALS_CACHE_MAX_ENTRIES (0 = unbounded); the CLIs override both.
+DEFAULT_TTL = 6 * 3600
+DEFAULT_MAX_ENTRIES = 20000
+# Hits only note their access time in memory; it is written (for LRU eviction)
+# on the next put(), once this many hits are pending, or after this many seconds
+TOUCH_BATCH = 256
+TOUCH_INTERVAL = 30.0
+
+
+def cache_file():
+    """price_cache.db in the scraper's data directory (also holds history and titles)."""
+    return os.path.join(BASE_DIR, "price_cache.db")
+
+
+class PriceCache:
+    """SQLite-backed lookup cache keyed on the normalized search name.
+
+    Entries expire after ``ttl`` seconds.  When the table grows past
+    ``max_entries`` the least recently used rows are evicted.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or cache_file()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._flushed_at = time.monotonic()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prices ("
+                " key TEXT PRIMARY KEY,"
+                " matched_name TEXT,"
+                " price TEXT,"
+                " url TEXT,"
+                " confidence REAL,"
+                " fetched_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS prices_accessed ON prices (accessed_at)"
+            )
+            self._conn.commit()
+
+    def get(self, key):
+        """Return (matched_name, price, url, confidence) or None if missing/expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT matched_name, price, url, confidence, fetched_at FROM prices WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[4] > self.ttl:
+                self._conn.execute("DELETE FROM prices WHERE key = ?", (key,))
+                self._conn.commit()
+                self._touched.pop(key, None)
+                return None
+            self._touched[key] = now
+            if (len(self._touched) >= TOUCH_BATCH
+                    or time.monotonic() - self._flushed_at >= TOUCH_INTERVAL):
+                self._flush_touches()
+                self._conn.commit()
+        return row[0], row[1], row[2], row[3]
+
+    def put(self, key, matched_name, price, url, confidence):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prices"
+                " (key, matched_name, price, url, confidence, fetched_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, matched_name, price, url, confidence, now, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touches()
+            self._evict()
+            self._conn.commit()
+
+    def _flush_touches(self):
+        """Write pending hit times so eviction sees them (caller holds the lock and commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE prices SET accessed_at = ? WHERE key = ?",
+                [(at, key) for key, at in self._touched.items()],
+            )
+            self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def _evict(self):
+        """Drop least recently used rows beyond max_entries (caller holds the lock)."""
+        if not self.max_entries:
+            return
+        count = self._conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM prices WHERE key IN"
+                " (SELECT key FROM prices ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def purge_expired(self):
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM prices WHERE fetched_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM prices")
+            self._conn.commit()
+            self._touched.clear()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def _ttl(seconds):
+    return seconds if seconds and seconds > 0 else None
+
+
+def _env_int(name, default):
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"[Cache] Ignoring {name}={value!r} (expected whole seconds/entries)")
+        return default
+
+
+def get_cache():
+    """Return the process-wide cache shared by all tabs."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PriceCache(
+                ttl=_ttl(_env_int("GG_DEALS_CACHE_TTL", DEFAULT_TTL)),
+                max_entries=max(0, _env_int("GG_DEALS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+        return _default_cache
+
+
+def configure_cache(ttl=None, max_entries=None):
+    """Override the process-wide cache's TTL (0 = never expire) and/or size cap (0 = unbounded)."""
+    cache = get_cache()
+    with cache._lock:
+        if ttl is not None:
+            cache.ttl = _ttl(ttl)
+        if max_entries is not None:
+            cache.max_entries = max(0, max_entries)
+    return cache
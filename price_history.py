@@ -0,0 +1,234 @@
+"""Compact per-title price history and staleness scores for incremental refreshes.
+
+Every fresh lookup appends a sample (timestamp, price_value, confidence) for
+the title's normalized search name; only the newest ``MAX_SAMPLES`` are
+kept, next to the full latest result.  From that history each title gets a
+staleness score: the relative price drift expected since it was last
+checked (its age in days times its past drift per day, with a floor so
+steady titles still age in).  Titles never seen, or last seen without a
+confident price, come first.
+
+``plan()`` splits a game list into the slice worth re-scraping (score over
+a threshold; ``budget`` caps the titles with history, never-seen ones always
+go) and the rest, which is served from history with its age.
+``PriorityTasks`` hands the slice to workers stalest first and stops handing
+out work once a time budget runs out.
+
+Lives in price_cache.db next to the price cache and the title index.
+"""
+import heapq
+import itertools
+import math
+import sqlite3
+import threading
+import time
+from queue import Empty
+
+from price_cache import cache_file
+
+MAX_SAMPLES = 12
+DRIFT_FLOOR = 0.01          # relative change per day assumed for titles that never moved
+UNSURE_BOOST = 0.5          # extra drift per day when the last lookup had no confident price
+REFRESH_THRESHOLD = 0.05    # expected drift worth a lookup
+CONFIDENT_MIN = 0.8
+
+
+class Sample:
+    __slots__ = ("at", "price_value", "confidence")
+
+    def __init__(self, at, price_value, confidence):
+        self.at = at
+        self.price_value = price_value
+        self.confidence = confidence
+
+
+def drift_per_day(samples):
+    """Mean relative price change per day over consecutive priced samples."""
+    priced = [s for s in samples if s.price_value is not None]
+    if len(priced) < 2:
+        return 0.0
+    change = sum(abs(b.price_value - a.price_value) / max(a.price_value, 1.0)
+                 for a, b in zip(priced, priced[1:]))
+    span_days = max(1.0, (priced[-1].at - priced[0].at) / 86400)
+    return change / span_days
+
+
+def staleness(samples, now=None):
+    """Expected relative price drift since the last sample (inf when never looked up)."""
+    if not samples:
+        return math.inf
+    now = time.time() if now is None else now
+    last = samples[-1]
+    age_days = max(0.0, now - last.at) / 86400
+    rate = DRIFT_FLOOR + drift_per_day(samples)
+    if last.price_value is None or (last.confidence or 0.0) < CONFIDENT_MIN:
+        rate += UNSURE_BOOST
+    return age_days * rate
+
+
+class PriceHistory:
+    def __init__(self, path=None, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or cache_file(), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                " key TEXT NOT NULL, at REAL NOT NULL, price_value REAL, confidence REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS history_key ON history (key, at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history_latest ("
+                " key TEXT PRIMARY KEY, matched_name TEXT, price TEXT, price_value REAL,"
+                " url TEXT, confidence REAL, at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def record(self, key, result, at=None):
+        """Append a sample for a fresh lookup result and keep it as the latest."""
+        at = time.time() if at is None else at
+        value, confidence = result.get("price_value"), result.get("match_confidence")
+        with self._lock:
+            self._conn.execute("INSERT INTO history (key, at, price_value, confidence) VALUES (?, ?, ?, ?)",
+                               (key, at, value, confidence))
+            self._conn.execute(
+                "DELETE FROM history WHERE key = ? AND at NOT IN"
+                " (SELECT at FROM history WHERE key = ? ORDER BY at DESC LIMIT ?)",
+                (key, key, self.max_samples))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO history_latest"
+                " (key, matched_name, price, price_value, url, confidence, at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, result.get("matched_name"), result.get("price"), value, result.get("url"),
+                 confidence, at))
+            self._conn.commit()
+
+    def samples(self, keys):
+        """{key: [Sample, ...] oldest first} for the keys that have history."""
+        out = {}
+        keys = list(set(keys))
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, at, price_value, confidence FROM history"
+                    f" WHERE key IN ({','.join('?' * len(chunk))}) ORDER BY key, at", chunk).fetchall()
+                for key, at, value, confidence in rows:
+                    out.setdefault(key, []).append(Sample(at, value, confidence))
+        return out
+
+    def latest(self, keys):
+        """{key: (matched_name, price, price_value, url, confidence, at)}."""
+        out = {}
+        keys = list(set(keys))
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, matched_name, price, price_value, url, confidence, at"
+                    f" FROM history_latest WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                for row in rows:
+                    out[row[0]] = row[1:]
+        return out
+
+    def plan(self, todo, key_fn, budget=None, threshold=REFRESH_THRESHOLD, now=None):
+        """Split ``todo`` [(idx, game)] for an incremental refresh.
+
+        Returns (refresh, served): ``refresh`` is [(score, idx, game)], stalest
+        first; ``served`` is [(idx, result)] built from the latest history entry,
+        with ``checked_at`` and ``age_seconds``.  ``budget`` caps how many titles
+        with history are re-scraped; titles without history have nothing to
+        serve, so they are always refreshed and do not count against it.
+        """
+        now = time.time() if now is None else now
+        keys = {idx: key_fn(game) for idx, game in todo}
+        history = self.samples(keys.values())
+        scored = sorted(((staleness(history.get(keys[idx]), now), idx, game) for idx, game in todo),
+                        key=lambda t: (-t[0], t[1]))
+        refresh = [t for t in scored if t[0] >= threshold]
+        if budget is not None:
+            unseen = [t for t in refresh if t[0] == math.inf]
+            refresh = unseen + [t for t in refresh if t[0] != math.inf][:max(0, budget)]
+        chosen = {idx for _, idx, _ in refresh}
+        rest = [(idx, game) for _, idx, game in scored if idx not in chosen]
+        return refresh, self.serve(rest, key_fn, now)
+
+    def serve(self, items, key_fn, now=None):
+        """[(idx, result)] from history for ``items`` [(idx, game)] that have any."""
+        now = time.time() if now is None else now
+        latest = self.latest(key_fn(game) for _, game in items)
+        served = []
+        for idx, game in items:
+            row = latest.get(key_fn(game))
+            if row is None:
+                continue
+            matched_name, price, price_value, url, confidence, at = row
+            served.append((idx, {
+                "search_name": game,
+                "matched_name": matched_name or game,
+                "price": price,
+                "price_value": price_value,
+                "url": url,
+                "match_confidence": confidence or 0.0,
+                "checked_at": at,
+                "age_seconds": round(now - at),
+            }))
+        return served
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PriorityTasks:
+    """Drop-in for the run's task Queue: highest priority first, FIFO among equals.
+
+    After ``deadline`` (time.monotonic()) ``get_nowait`` reports empty, so
+    workers wind down and ``drain()`` returns what was never started.
+    """
+
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def put(self, item, priority=0.0):
+        with self._lock:
+            heapq.heappush(self._heap, (-priority, next(self._seq), item))
+
+    def get_nowait(self):
+        with self._lock:
+            if not self._heap or self.expired():
+                raise Empty
+            return heapq.heappop(self._heap)[2]
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def qsize(self):
+        with self._lock:
+            return len(self._heap)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def drain(self):
+        """Remove and return the items nobody took, in priority order."""
+        with self._lock:
+            items = [entry[2] for entry in sorted(self._heap)]
+            self._heap = []
+            return items
+
+
+_default_history = None
+_default_lock = threading.Lock()
+
+
+def get_history():
+    """Return the process-wide price history shared by all tabs."""
+    global _default_history
+    with _default_lock:
+        if _default_history is None:
+            _default_history = PriceHistory()
+        return _default_history
@@ -0,0 +1,360 @@
+"""In-memory, incrementally updated view of one tab's results for server-side queries.
+
+The app feeds it the rows carried by every progress event, so during a run
+queries never touch the results files; when idle it loads the tab's file
+once (and again only if the file changes on disk).  Each row remembers the
+version that last changed it: ``since`` queries return just the newer rows,
+and the version doubles as the ETag.  Sort orders (built on first use),
+the header stats and the running totals for the trade comparison (value,
+priced count, confident value, top titles) are updated row by row as well,
+so a progress event costs a few bisects rather than a re-sort and rescan;
+``compare()`` puts two tabs side by side.
+"""
+import heapq
+import os
+import threading
+from bisect import bisect_left, insort
+
+from results_log import load_results, log_path
+
+SORT_KEYS = ("idx", "name", "price", "confidence")
+FILTERS = ("all", "found", "missing")
+CONFIDENT_MIN = 0.8      # same cut-off as the "high" match badge in the UI
+TOP_N = 25
+
+
+class _Row:
+    __slots__ = ("idx", "result", "version", "name_key", "text")
+
+    def __init__(self, idx, result, version):
+        self.idx = idx
+        self.result = result
+        self.version = version
+        search = (result.get("search_name") or "").lower()
+        matched = (result.get("matched_name") or "").lower()
+        self.name_key = matched or search
+        self.text = search + "\n" + matched
+
+
+def _sort_value(row, key):
+    r = row.result
+    if key == "name":
+        return row.name_key
+    if key == "price":
+        v = r.get("price_value")
+        return -1.0 if v is None else v
+    if key == "confidence":
+        return r.get("match_confidence") or 0.0
+    return row.idx
+
+
+def _value(result):
+    """Price counted towards totals: priced and above zero (free games add nothing)."""
+    v = result.get("price_value")
+    return v if v is not None and v > 0 else None
+
+
+class RunningTotals:
+    """Trade-value aggregates of one tab, adjusted per added/removed row."""
+
+    def __init__(self, top_n=TOP_N, confident_min=CONFIDENT_MIN):
+        self.top_n = top_n
+        self.confident_min = confident_min
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.priced = 0
+        self.value = 0.0
+        self.confident = 0
+        self.confident_value = 0.0
+        self._entries = {}       # idx -> (value or None, confident)
+        self._top = []           # min-heap of (value, -idx), at most top_n entries
+        self._top_stale = False
+
+    def add(self, idx, result):
+        self.discard(idx)
+        value = _value(result)
+        confident = (result.get("match_confidence") or 0.0) >= self.confident_min
+        self._entries[idx] = (value, confident)
+        self.count += 1
+        if value is None:
+            return
+        self.priced += 1
+        self.value += value
+        if confident:
+            self.confident += 1
+            self.confident_value += value
+        if self._top_stale:
+            return
+        item = (value, -idx)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, item)
+        elif item > self._top[0]:
+            heapq.heapreplace(self._top, item)
+
+    def discard(self, idx):
+        entry = self._entries.pop(idx, None)
+        if entry is None:
+            return
+        value, confident = entry
+        self.count -= 1
+        if value is None:
+            return
+        self.priced -= 1
+        self.value -= value
+        if confident:
+            self.confident -= 1
+            self.confident_value -= value
+        if (value, -idx) in self._top:
+            # Rare (deletes, re-scraped rows): rebuild the heap on the next read
+            self._top_stale = True
+
+    def top(self, n=TOP_N):
+        """Indexes of the ``n`` most valuable rows, most valuable first."""
+        if self._top_stale:
+            priced = ((v, -i) for i, (v, _) in self._entries.items() if v is not None)
+            self._top = heapq.nlargest(self.top_n, priced)
+            heapq.heapify(self._top)
+            self._top_stale = False
+        return [-i for _, i in sorted(self._top, reverse=True)[:n]]
+
+
+class ResultsIndex:
+    def __init__(self, results_file):
+        self.results_file = results_file
+        self._rows = {}            # idx -> _Row
+        self._version = 0
+        self._base = 0             # versions at or below this predate the last reset/removal
+        self._fed = False          # rows come from progress events, not the files
+        self._loaded_stamp = None  # file stats the rows were loaded from
+        self._sorted = {}          # sort key -> [(sort value, idx)], kept sorted once built
+        self._found = 0            # rows with a price (including free ones)
+        self.totals = RunningTotals()
+        self._lock = threading.Lock()
+
+    # ---- updates ----
+
+    def reset(self, fed=False):
+        """Drop all rows.  ``fed=True`` for a new run: rows then only come from apply()."""
+        with self._lock:
+            self._clear()
+            self._fed = fed
+            self._loaded_stamp = None
+
+    def apply(self, rows):
+        """Add or replace rows from a progress event: [{"idx": i, "result": {...}}, ...]."""
+        if not rows:
+            return
+        with self._lock:
+            self._version += 1
+            for row in rows:
+                self._put(_Row(row["idx"], row["result"], self._version))
+            self._fed = True
+
+    def remove(self, search_name):
+        with self._lock:
+            gone = [r for r in self._rows.values() if r.result.get("search_name") == search_name]
+            for row in gone:
+                self._drop(row)
+            if gone:
+                self._version += 1
+                self._base = self._version
+            return len(gone)
+
+    def _put(self, row):
+        """Add or replace one row in every structure (caller holds the lock)."""
+        old = self._rows.get(row.idx)
+        if old is not None:
+            self._drop(old)
+        self._rows[row.idx] = row
+        self.totals.add(row.idx, row.result)
+        if row.result.get("price") is not None:
+            self._found += 1
+        for key, order in self._sorted.items():
+            insort(order, (_sort_value(row, key), row.idx))
+
+    def _drop(self, row):
+        del self._rows[row.idx]
+        self.totals.discard(row.idx)
+        if row.result.get("price") is not None:
+            self._found -= 1
+        for key, order in list(self._sorted.items()):
+            item = (_sort_value(row, key), row.idx)
+            pos = bisect_left(order, item)
+            if pos < len(order) and order[pos] == item:
+                del order[pos]
+            else:
+                del self._sorted[key]      # out of step somehow: rebuild on the next query
+
+    def _clear(self):
+        self._rows = {}
+        self._found = 0
+        self.totals.clear()
+        self._version += 1
+        self._base = self._version
+        self._sorted = {}
+
+    def _stamp(self):
+        stamps = []
+        for path in (log_path(self.results_file), self.results_file):
+            try:
+                st = os.stat(path)
+                stamps.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append((path, None, None))
+        return tuple(stamps)
+
+    def refresh(self):
+        """Reload from disk if the index isn't event-fed and the files changed."""
+        with self._lock:
+            if self._fed:
+                return
+            stamp = self._stamp()
+            if stamp == self._loaded_stamp:
+                return
+            self._clear()
+            for i, result in enumerate(load_results(self.results_file)):
+                self._put(_Row(i, result, self._version))
+            self._loaded_stamp = stamp
+
+    # ---- queries ----
+
+    @property
+    def version(self):
+        return self._version
+
+    def tag(self):
+        """Identifies the index contents: changes whenever any row does."""
+        return f"{id(self):x}-{self._version}"
+
+    def etag(self):
+        return f'"{self.tag()}"'
+
+    def all_results(self):
+        """Every row in idx order, each carrying its ``idx`` (as query() rows do)."""
+        with self._lock:
+            return [dict(self._rows[i].result, idx=i) for i in sorted(self._rows)]
+
+    def _order(self, key):
+        """[(sort value, idx)] ascending; sorted once, then maintained by _put/_drop."""
+        order = self._sorted.get(key)
+        if order is None:
+            order = sorted((_sort_value(r, key), r.idx) for r in self._rows.values())
+            self._sorted[key] = order
+        return order
+
+    def _page(self, order, offset, limit, direction):
+        if direction == "desc":
+            stop = max(0, len(order) - offset)
+            picked = reversed(order[max(0, stop - limit) if limit else 0:stop])
+        else:
+            picked = order[offset:offset + limit] if limit else order[offset:]
+        return [self._rows[i] for _, i in picked]
+
+    def query(self, offset=0, limit=100, show="all", min_confidence=None, q="",
+              sort="idx", direction="asc", since=None):
+        """One page of matching rows plus the match count, stats and current version.
+
+        With ``since`` (a version from an earlier reply) only rows changed after
+        it are returned; ``reset`` is true when the client must start over.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}' (expected one of {', '.join(SORT_KEYS)})")
+        if show not in FILTERS:
+            raise ValueError(f"Unknown filter '{show}' (expected one of {', '.join(FILTERS)})")
+        q = (q or "").strip().lower()
+
+        def matches(row):
+            r = row.result
+            if show == "found" and r.get("price") is None:
+                return False
+            if show == "missing" and r.get("price") is not None:
+                return False
+            if min_confidence is not None and (r.get("match_confidence") or 0.0) < min_confidence:
+                return False
+            return not q or q in row.text
+
+        with self._lock:
+            reset = since is not None and since < self._base
+            order = self._order(sort)
+            if show == "all" and min_confidence is None and not q and (since is None or reset):
+                # Plain paging: slice the maintained order, totals are already summed
+                total, value = len(order), self.totals.value
+                page = self._page(order, offset, limit, direction)
+            else:
+                seq = reversed(order) if direction == "desc" else order
+                rows = (self._rows[i] for _, i in seq)
+                if since is not None and not reset:
+                    rows = (r for r in rows if r.version > since)
+                hits = [r for r in rows if matches(r)]
+                total, value = len(hits), sum(_value(r.result) or 0.0 for r in hits)
+                page = hits[offset:offset + limit] if limit else hits[offset:]
+            stats = self._stats()
+            version = self._version
+        return {
+            "version": version,
+            "reset": reset,
+            "total": total,
+            "value": round(value, 2),
+            "offset": offset,
+            "rows": [dict(r.result, idx=r.idx) for r in page],
+            "stats": stats,
+        }
+
+    def summary(self, top_n=10, min_confidence=None):
+        """Running totals for the compare view (``min_confidence`` other than
+        CONFIDENT_MIN costs one pass over the rows)."""
+        with self._lock:
+            t = self.totals
+            confident, confident_value = t.confident, t.confident_value
+            if min_confidence is not None and min_confidence != t.confident_min:
+                confident, confident_value = 0, 0.0
+                for row in self._rows.values():
+                    v = _value(row.result)
+                    if v is not None and (row.result.get("match_confidence") or 0.0) >= min_confidence:
+                        confident += 1
+                        confident_value += v
+            top = []
+            for i in t.top(top_n):
+                r = self._rows[i].result
+                top.append({"idx": i, "name": r.get("matched_name") or r.get("search_name"),
+                            "price": r.get("price"), "price_value": r.get("price_value"),
+                            "url": r.get("url")})
+            return {
+                "version": self._version,
+                "count": t.count,
+                "priced": t.priced,
+                "value": round(t.value, 2),
+                "confident": confident,
+                "confident_value": round(confident_value, 2),
+                "top": top,
+            }
+
+    def _stats(self):
+        """Header stats from the counters kept per row (``high`` is the top totals entry)."""
+        t = self.totals
+        top = t.top(1)
+        return {
+            "total": len(self._rows),
+            "found": self._found,
+            "avg": round(t.value / t.priced, 2) if t.priced else 0.0,
+            "high": self._rows[top[0]].result["price_value"] if top else 0.0,
+        }
+
+
+def compare(trader, mine, top_n=10, min_confidence=None):
+    """Side-by-side totals of the trader's and my tab (two ResultsIndex objects).
+
+    ``difference`` is trader minus mine: positive means the trader's games
+    are worth more.
+    """
+    a = trader.summary(top_n, min_confidence)
+    b = mine.summary(top_n, min_confidence)
+    return {
+        "trader": a,
+        "my": b,
+        "difference": round(a["value"] - b["value"], 2),
+        "confident_difference": round(a["confident_value"] - b["confident_value"], 2),
+        "min_confidence": CONFIDENT_MIN if min_confidence is None else min_confidence,
+    }
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+
+FSYNC_POLICIES = ("never", "interval", "always")
+DELETED = "deleted"      # tombstone status: the user deleted the row, skip it on reload and resume
+
+
+def log_path(output_file):
+    """JSON Lines log that sits next to a results file (foo.json -> foo.jsonl)."""
+    root, _ = os.path.splitext(output_file)
+    return root + ".jsonl"
+
+
+class ResultsLog:
+    """Append-only JSON Lines log: one ``{"idx": i, "status": s, "result": {...}}`` per game.
+
+    ``status`` is "done", "failed" when the lookup raised, or DELETED for a
+    row the user removed; the log doubles as the task ledger of a resumable
+    run (see checkpoint.py).
+
+    ``fsync`` controls durability: "never" only flushes to the OS (survives a
+    crashed process), "always" fsyncs every record, "interval" fsyncs at most
+    once every ``interval`` seconds.
+    """
+
+    def __init__(self, path, fsync="interval", interval=1.0, truncate=True):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}' (expected one of {', '.join(FSYNC_POLICIES)})")
+        self.path = path
+        self.fsync = fsync
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_sync = time.monotonic()
+        self._f = open(path, "w" if truncate else "a", encoding="utf-8")
+
+    def append(self, idx, result, status="done"):
+        line = json.dumps({"idx": idx, "status": status, "result": result}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+            if self.fsync == "always":
+                os.fsync(self._f.fileno())
+            elif self.fsync == "interval":
+                now = time.monotonic()
+                if now - self._last_sync >= self.interval:
+                    os.fsync(self._f.fileno())
+                    self._last_sync = now
+
+    def close(self):
+        with self._lock:
+            if not self._f.closed:
+                self._f.flush()
+                if self.fsync != "never":
+                    os.fsync(self._f.fileno())
+                self._f.close()
+
+
+def read_records(path):
+    """Yield (idx, status, result) from a log; a torn trailing line is ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            yield rec["idx"], rec.get("status", "done"), rec["result"]
+
+
+def read_log(path):
+    """Return {idx: result} from a log (latest record per index wins, deleted rows dropped)."""
+    entries = {}
+    for idx, status, result in read_records(path):
+        if status == DELETED:
+            entries.pop(idx, None)
+        else:
+            entries[idx] = result
+    return entries
+
+
+def load_results(output_file):
+    """Current results for ``output_file``: the live log if a run is writing one, else the JSON."""
+    path = log_path(output_file)
+    if os.path.exists(path):
+        entries = read_log(path)
+        return [entries[i] for i in sorted(entries)]
+    if os.path.exists(output_file):
+        with open(output_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return []
+
+
+def delete_results(output_file, search_name):
+    """Remove every row for ``search_name`` from the results JSON and tombstone it in the log.
+
+    The log is read before the JSON (and kept after a stopped run), so without
+    the tombstone the row would come back on reload or resume.  Returns the
+    number of rows left, or None when there are no results at all.
+    """
+    path = log_path(output_file)
+    if not os.path.exists(output_file) and not os.path.exists(path):
+        return None
+    if os.path.exists(path):
+        gone = [idx for idx, result in read_log(path).items() if result.get("search_name") == search_name]
+        if gone:
+            log = ResultsLog(path, fsync="always", truncate=False)
+            try:
+                for idx in gone:
+                    log.append(idx, {"search_name": search_name}, status=DELETED)
+            finally:
+                log.close()
+    if os.path.exists(output_file):
+        with open(output_file, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        updated = [r for r in results if r.get("search_name") != search_name]
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(updated, f, ensure_ascii=False, indent=2)
+    return len(load_results(output_file))
@@ -0,0 +1,107 @@
+"""Re-queue failed lookups with exponential backoff; give up into a dead-letter list.
+
+Only lookups that raised (timeouts, crashed drivers, challenge pages, HTTP
+errors) count as failures.  "No match found" is a normal result and is
+never retried.  A game gets ``max_attempts`` tries in total; after that it
+is recorded as failed and added to the dead letters, which ``on_dead`` can
+persist (scrape_prices keeps them in the run manifest).
+"""
+import heapq
+import random
+import threading
+import time
+from queue import Empty
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class RetryScheduler:
+    """Backoff queue shared by the workers of one run."""
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=2.0, max_delay=60.0,
+                 jitter=0.5, on_dead=None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.on_dead = on_dead
+        self.dead = []
+        self._heap = []                # (due, seq, idx, game)
+        self._attempts = {}            # idx -> failed attempts so far
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._rng = random.Random()
+
+    def delay(self, failures):
+        """Backoff before attempt ``failures + 1``: base * 2^(failures-1), capped, +/- jitter."""
+        d = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+        return d * (1 + self._rng.uniform(-self.jitter, self.jitter))
+
+    def attempt(self, idx):
+        """1-based number of the attempt about to be made for ``idx``."""
+        with self._cond:
+            return self._attempts.get(idx, 0) + 1
+
+    def failed(self, idx, game, info):
+        """Note a failed lookup; returns the retry delay, or None once it is dead-lettered."""
+        with self._cond:
+            failures = self._attempts.get(idx, 0) + 1
+            self._attempts[idx] = failures
+            if failures < self.max_attempts:
+                delay = self.delay(failures)
+                heapq.heappush(self._heap, (time.monotonic() + delay, self._seq, idx, game))
+                self._seq += 1
+                self._cond.notify_all()
+                return delay
+            entry = {
+                "idx": idx,
+                "game": game,
+                "attempts": failures,
+                "error": info.get("error"),
+                "error_type": info.get("error_type"),
+                "failed_at": time.time(),
+            }
+            self.dead.append(entry)
+            if self.on_dead is not None:
+                self.on_dead(entry)
+            return None
+
+    def pending(self):
+        with self._cond:
+            return len(self._heap)
+
+    def pop_due(self):
+        """The next retry whose backoff has elapsed, as (idx, game), else None."""
+        with self._cond:
+            if self._heap and self._heap[0][0] <= time.monotonic():
+                _, _, idx, game = heapq.heappop(self._heap)
+                return idx, game
+            return None
+
+    def wait_time(self):
+        """Seconds until the next retry is due (None when nothing is scheduled)."""
+        with self._cond:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def next(self, task_queue, is_stopped):
+        """Block for the next (idx, game): due retries first, then fresh games.
+
+        Returns None when the queue is empty and no retries are scheduled, or
+        once ``is_stopped()`` turns true.
+        """
+        while not is_stopped():
+            item = self.pop_due()
+            if item is not None:
+                return item
+            try:
+                return task_queue.get_nowait()
+            except Empty:
+                pass
+            with self._cond:
+                if not self._heap:
+                    return None
+                # Wake up for the earliest retry (or a newly scheduled one), and re-check stop
+                self._cond.wait(min(1.0, max(0.0, self._heap[0][0] - time.monotonic())))
+        return None
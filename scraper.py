@@ -4,37 +4,66 @@ import os
 import sys
 import time
 import threading
-from difflib import SequenceMatcher
-from queue import Queue, Empty
-from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote_plus, urlsplit
+
+from http_engine import HttpEngine, ChallengeError, FetchError, GAME_PRICE_CLASSES, RETRY_STATUSES
+from pacing import get_pacer
+from governor import get_governor
+from results_log import FSYNC_POLICIES, ResultsLog, log_path
+from retry import RetryScheduler, DEFAULT_MAX_ATTEMPTS
+from price_history import PriorityTasks
+from inflight import get_flights
+import checkpoint
+import matcher
+import metrics
+import driver_pool
+from paths import BASE_DIR
 
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-
-
-def _data_dir():
-    """Writable directory: next to .exe when frozen, else script dir."""
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.abspath(__file__))
-
-
-BASE_DIR = _data_dir()
 GAMES_FILE = os.path.join(BASE_DIR, "games.txt")
 RESULTS_FILE = os.path.join(BASE_DIR, "results.json")
 PROGRESS_FILE = os.path.join(BASE_DIR, "progress.json")
+# Overridable so benchmarks can point the scraper at a local stand-in server
+BASE_URL = os.environ.get("GG_DEALS_URL", "https://gg.deals").rstrip("/")
+
+ENGINES = ("browser", "http")
+REFRESH_MODES = ("full", "stale")
+# "on": search the simplified query alongside the original instead of after it;
+# "base": also the title without its subtitle.  "off" keeps the sequential fallback
+SPECULATE_MODES = ("off", "on", "base")
+# "lean": eager page loads, a smaller window, no GPU/extensions, and images, fonts,
+# media and third-party trackers blocked (see LEAN_BLOCKED_URLS)
+PROFILES = ("full", "lean")
+
+# Requests the lean profile drops (CDP Network.setBlockedURLs wildcards).  Cloudflare's
+# challenge and the cookie banner (OneTrust) must keep loading, so they are not listed
+LEAN_BLOCKED_URLS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    "*.mp4*", "*.webm*", "*.mp3*", "*.ogg*",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*connect.facebook.net*",
+    "*hotjar.com*", "*scorecardresearch.com*", "*quantserve.com*", "*criteo.*",
+    "*amazon-adsystem.com*", "*taboola.com*", "*outbrain.com*", "*nitropay.com*",
+]
+
+# Selenium and undetected_chromedriver are slow to import and only needed once a
+# browser is; load_browser() fills these in (HTTP-only runs never import them)
+uc = By = WebDriverWait = TimeoutException = NoSuchElementException = None
 
 # Global stop flag (used by CLI / backward compat)
 _stop_requested = False
 _lock = threading.Lock()
+_import_lock = threading.Lock()
+_launch_lock = threading.Lock()   # Chrome launches are serialized so instances don't collide
+_timing = threading.local()       # per-thread wait time / challenge count for the current game
+_speculation_pool = None          # shared by HTTP lookups that search several variants at once
 
 
 def request_stop():
     global _stop_requested
     _stop_requested = True
+    metrics.inc("stop_requests_total")
 
 
 def reset_stop():
@@ -55,7 +84,15 @@ def load_games(filepath=GAMES_FILE):
     return unique
 
 
-def update_progress(current, total, game_name, status="running", progress_file=None):
+def update_progress(current, total, game_name, status="running", progress_file=None, stats=None,
+                    on_event=None, rows=None, timings=None):
+    """Publish a progress snapshot.
+
+    ``on_event`` (if given) receives the payload plus ``rows``, the results
+    completed since the previous event.  ``timings`` is a RunTimings summary
+    (per-stage histograms), attached at most once a second.  The progress
+    file is a persistence side-channel; pass ``progress_file=False`` to skip it.
+    """
     data = {
         "current": current,
         "total": total,
@@ -63,6 +100,14 @@ def update_progress(current, total, game_name, status="running", progress_file=N
         "status": status,
         "percent": round((current / total) * 100, 1) if total > 0 else 0,
     }
+    if stats:
+        data.update({k: round(v, 2) if isinstance(v, float) else v for k, v in stats.items()})
+    if timings:
+        data["timings"] = timings
+    if on_event is not None:
+        on_event(dict(data, rows=rows or []))
+    if progress_file is False:
+        return
     with _lock:
         with open(progress_file or PROGRESS_FILE, "w", encoding="utf-8") as f:
             json.dump(data, f)
@@ -85,26 +130,12 @@ def parse_price(price_str):
 
 def normalize_name(name):
     """Normalize a game name for fuzzy comparison."""
-    s = name.lower()
-    # Remove common platform/edition suffixes
-    s = re.sub(r'\b(ps[345]|xbox|switch|pc|mac|linux)\b', '', s)
-    # Remove punctuation and extra whitespace
-    s = re.sub(r'[^\w\s]', ' ', s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s
+    return matcher.normalize(name)
 
 
 def name_similarity(search_name, result_name):
     """Return a 0-1 similarity score between two game names."""
-    a = normalize_name(search_name)
-    b = normalize_name(result_name)
-    # Exact normalized match
-    if a == b:
-        return 1.0
-    # One contains the other fully
-    if a in b or b in a:
-        return max(0.85, SequenceMatcher(None, a, b).ratio())
-    return SequenceMatcher(None, a, b).ratio()
+    return matcher.similarity(search_name, result_name)
 
 
 def save_results(results, output_file=None):
@@ -113,35 +144,200 @@ def save_results(results, output_file=None):
             json.dump(results, f, indent=2, ensure_ascii=False)
 
 
-def create_driver(headless=False):
+def _add_wait(seconds, challenged=False):
+    _timing.wait = getattr(_timing, "wait", 0.0) + seconds
+    if challenged:
+        _timing.challenges = getattr(_timing, "challenges", 0) + 1
+
+
+def _add_bytes(n):
+    _timing.bytes = getattr(_timing, "bytes", 0) + int(n or 0)
+
+
+def _reset_timing():
+    _timing.wait = 0.0
+    _timing.challenges = 0
+    _timing.speculation = None
+    _timing.bytes = 0
+    _timing.page_seconds = 0.0
+    _timing.pages = 0
+
+
+def load_browser():
+    """Import the browser stack on first use (idempotent, thread-safe)."""
+    global uc, By, WebDriverWait, TimeoutException, NoSuchElementException
+    if uc is not None:
+        return
+    with _import_lock:
+        if uc is not None:
+            return
+        with metrics.timer("import"):
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.common.exceptions import TimeoutException, NoSuchElementException
+            import undetected_chromedriver
+        uc = undetected_chromedriver   # assigned last: it is the "loaded" flag
+
+
+def create_driver(headless=False, profile="full"):
+    load_browser()
     options = uc.ChromeOptions()
-    options.add_argument("--window-size=1920,1080")
+    if profile == "lean":
+        # driver.get returns at DOMContentLoaded; the result waits poll the DOM anyway
+        options.page_load_strategy = "eager"
+        options.add_argument("--window-size=1280,720")
+        for arg in ("--disable-gpu", "--disable-extensions", "--mute-audio",
+                    "--blink-settings=imagesEnabled=false"):
+            options.add_argument(arg)
+    else:
+        options.add_argument("--window-size=1920,1080")
     if headless:
         options.add_argument("--headless=new")
     driver = uc.Chrome(options=options, headless=headless)
+    if profile == "lean":
+        block_urls(driver, LEAN_BLOCKED_URLS)
+    return driver
+
+
+def block_urls(driver, patterns):
+    """Have Chrome drop requests matching ``patterns`` in the driver's tab.
+
+    Tabs opened later (speculative searches) are not covered; they still
+    skip images through the blink setting.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception as e:
+        print(f"  [Pool] Could not block URLs, loading pages in full: {e}")
+
+
+def launch_driver(headless=False, profile="full"):
+    """create_driver, serialized across threads (replaces fixed launch staggering)."""
+    with _launch_lock, metrics.timer("chrome_launch"):
+        return create_driver(headless=headless, profile=profile)
+
+
+def _warm_driver(headless=False, profile="full"):
+    """Pool factory: a driver that is past Cloudflare and the cookie banner."""
+    print(f"  [Pool] Launching browser ({profile} profile)...")
+    driver = launch_driver(headless=headless, profile=profile)
+    try:
+        with metrics.timer("warmup"):
+            init_driver(driver)
+    except Exception:
+        driver.quit()
+        raise
+    print("  [Pool] Ready")
     return driver
 
 
+def get_driver_pool():
+    """Process-wide pool of warm drivers, shared by every run and tab."""
+    return driver_pool.get_pool(_warm_driver)
+
+
+def lease_driver(pool, headless, share=None, profile="full"):
+    """Lease a warm driver, after taking one of the governor's browser slots."""
+    load_browser()
+    if share is not None:
+        share.lease_browser()
+    try:
+        return pool.lease(headless=headless, profile=profile)
+    except Exception:
+        if share is not None:
+            share.release_browser()
+        raise
+
+
+def release_driver(pool, driver, info, share=None):
+    """Return a leased driver; after a failed lookup it is kept only if still alive.
+
+    Returns False when the driver was dead (the pool launches a replacement
+    on the next lease).
+    """
+    healthy = not info.get("error") or driver_pool.is_healthy(driver)
+    try:
+        pool.release(driver, healthy=healthy)
+    finally:
+        if share is not None:
+            share.release_browser()
+    return healthy
+
+
+def join_governor(label):
+    """This run's share of the process-wide governor, keyed by tab ("cli" for the CLI)."""
+    return get_governor().join(label.rstrip("/").lower() or "cli")
+
+
+def _outcome(error):
+    """Governor feedback for a lookup that raised."""
+    if isinstance(error, ChallengeError):
+        return "challenge"
+    if isinstance(error, FetchError) and error.status in RETRY_STATUSES:
+        return "timeout"        # rate-limited/overloaded: back off like a timeout
+    timeouts = (TimeoutError,) if TimeoutException is None else (TimeoutException, TimeoutError)
+    if isinstance(error, timeouts) or "timed out" in str(error).lower():
+        return "timeout"
+    return "error"
+
+
+# Truthy once the Cloudflare interstitial is gone and the page has loaded
+_CLEARED_JS = """
+const title = (document.title || '').toLowerCase();
+if (title.includes('just a moment') || title.includes('attention required')) return false;
+if (document.querySelector('#challenge-form, #cf-challenge-running, .cf-browser-verification')) return false;
+return document.readyState === 'complete';
+"""
+
+_COOKIE_SELECTORS = ["#onetrust-accept-btn-handler", "button[class*='cookie']", ".css-47sehv"]
+
+
+def wait_until_cleared(driver, timeout=30):
+    """Wait for a Cloudflare challenge to clear. Returns True if it did."""
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+            lambda d: d.execute_script(_CLEARED_JS)
+        )
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        waited = time.monotonic() - start
+        _add_wait(waited)
+        metrics.observe("wait", waited)
+
+
+def _visible_cookie_button(driver):
+    for sel in _COOKIE_SELECTORS:
+        btns = driver.find_elements(By.CSS_SELECTOR, sel)
+        if btns and btns[0].is_displayed():
+            return btns[0]
+    return False
+
+
 def init_driver(driver):
     """Navigate to gg.deals and handle cookies/Cloudflare."""
-    driver.get("https://gg.deals/")
-    time.sleep(8)
+    driver.get(f"{BASE_URL}/")
+    if not wait_until_cleared(driver, timeout=30):
+        print("    Cloudflare check did not clear within 30s")
     try:
-        for sel in ["#onetrust-accept-btn-handler", "button[class*='cookie']", ".css-47sehv"]:
-            try:
-                btns = driver.find_elements(By.CSS_SELECTOR, sel)
-                if btns and btns[0].is_displayed():
-                    btns[0].click()
-                    time.sleep(1)
-                    break
-            except Exception:
-                pass
+        btn = WebDriverWait(driver, 3, poll_frequency=0.2).until(_visible_cookie_button)
+        btn.click()
+        WebDriverWait(driver, 2, poll_frequency=0.1).until(lambda d: not btn.is_displayed())
     except Exception:
+        # No banner, or it went away on its own
         pass
 
 
 def _extract_item_info(item):
     """Extract name, price and URL from a single search result item."""
+    with metrics.timer("extract"):
+        return _extract_item_fields(item)
+
+
+def _extract_item_fields(item):
     name = None
     price = None
     url = None
@@ -175,23 +371,312 @@ def _extract_item_info(item):
 
 def _simplify_query(name):
     """Simplify a game name for a retry search (strip punctuation, subtitles)."""
-    s = re.sub(r'[:\-–—|]', ' ', name)       # Replace colons/dashes with space
-    s = re.sub(r'[^\w\s]', '', s)             # Remove remaining punctuation
-    s = re.sub(r'\s+', ' ', s).strip()        # Collapse whitespace
-    return s
+    return matcher.simplify_query(name)
+
+
+# Bytes the page pulled over the network so far (document + sub-resources, Resource
+# Timing).  A lower bound: cross-origin responses without Timing-Allow-Origin report 0
+_PAGE_BYTES_JS = """
+const pageBytes = () => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    let bytes = nav ? (nav.transferSize || 0) : 0;
+    for (const r of performance.getEntriesByType('resource')) bytes += r.transferSize || 0;
+    return bytes;
+};
+"""
+
+# Collects every candidate on a search page in a single WebDriver roundtrip.
+# Mirrors _extract_item_info for .hoverable-box items, plus the bare
+# a.full-link fallback (priced with the first span.price on the page).
+_EXTRACT_JS = _PAGE_BYTES_JS + """
+const text = el => (el ? (el.innerText || el.textContent || '').trim() : null);
+let boxes = document.querySelectorAll('.hoverable-box');
+if (!boxes.length) boxes = document.querySelectorAll("[class*='game-list'] > div, .list-items > div");
+const items = Array.from(boxes).slice(0, 8).map(item => {
+    let name = null, url = null;
+    const link = item.querySelector('a.full-link');
+    if (link) {
+        const aria = link.getAttribute('aria-label');
+        if (aria) name = aria.replace('Go to: ', '').trim();
+        if (link.href) url = link.href;
+    }
+    if (!name) name = text(item.querySelector('.game-info-title')) || null;
+    return [name, text(item.querySelector('span.price')), url];
+});
+const firstPrice = text(document.querySelector('span.price'));
+const links = Array.from(document.querySelectorAll('a.full-link')).slice(0, 8)
+    .filter(a => a.getAttribute('aria-label'))
+    .map(a => [a.getAttribute('aria-label').replace('Go to: ', '').trim(), firstPrice, a.href || null]);
+return [items, links, pageBytes()];
+"""
+
+EXTRACT_MODES = ("script", "elements")
+
+
+class CountingDriver:
+    """Proxy around a WebDriver that counts the commands sent to chromedriver.
+
+    Elements returned by find_element(s) are wrapped too, so calls such as
+    get_attribute() or ``.text`` on them are included in ``calls``.
+    """
+
+    def __init__(self, target, counter=None):
+        self._target = target
+        self._counter = counter if counter is not None else [0]
+
+    @property
+    def calls(self):
+        return self._counter[0]
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if hasattr(value, "find_element") and not isinstance(value, CountingDriver):
+            return CountingDriver(value, self._counter)
+        return value
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if isinstance(getattr(type(self._target), name, None), property):
+            # Properties such as element.text or driver.current_url hit the wire
+            self._counter[0] += 1
+            return self._wrap(attr)
+        if callable(attr):
+            def call(*args, **kwargs):
+                self._counter[0] += 1
+                return self._wrap(attr(*args, **kwargs))
+            return call
+        return attr
+
+
+# Classifies the current search page: results / empty / challenge / null (still loading)
+_PAGE_STATE_JS = """
+if (document.querySelector(arguments[0])) return 'results';
+const title = (document.title || '').toLowerCase();
+if (title.includes('just a moment') || document.querySelector('#challenge-form, #cf-challenge-running'))
+    return 'challenge';
+if (document.readyState !== 'complete') return null;
+if (document.querySelector('.no-results, .empty-results, .list-empty, [class*="no-results"]')) return 'empty';
+const body = document.body ? document.body.innerText : '';
+if (/no (games|results) found|nothing found|no results for/i.test(body)) return 'empty';
+return null;
+"""
+
+
+def _wait_for_results(driver, selector, timeout=10):
+    """Wait for the result list or a "no results" marker; return the page state."""
+    last = [None]
+
+    def ready(d):
+        last[0] = d.execute_script(_PAGE_STATE_JS, selector)
+        return last[0] in ("results", "empty")
+
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(ready)
+    except TimeoutException:
+        pass
+    state = last[0] or "timeout"
+    waited = time.monotonic() - start
+    _add_wait(waited, challenged=(state == "challenge"))
+    metrics.observe("wait", waited)
+    return state
+
 
+def _collect_candidates(driver):
+    """Return ([(name, price, url), ...] items, [...] fallback links) in one call."""
+    with metrics.timer("extract"):
+        items, links, size = driver.execute_script(_EXTRACT_JS)
+    _add_bytes(size)
+    return [tuple(c) for c in items], [tuple(c) for c in links]
 
-def scrape_game(driver, game_name):
-    """Search for a game on gg.deals and return best-matching result."""
-    search_url = f"https://gg.deals/games/?title={quote_plus(game_name)}"
-    driver.get(search_url)
 
+def _load_page(driver, url):
+    """driver.get, timed per run (page_load) and per game (info["page_load"])."""
+    started = time.perf_counter()
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".hoverable-box, a.full-link, .game-info-title"))
-        )
-    except TimeoutException:
-        time.sleep(3)
+        driver.get(url)
+    finally:
+        took = time.perf_counter() - started
+        metrics.observe("page_load", took)
+        _timing.page_seconds = getattr(_timing, "page_seconds", 0.0) + took
+        _timing.pages = getattr(_timing, "pages", 0) + 1
+
+
+# Current price from the header of a /game/<slug>/ page (see http_engine.GAME_PRICE_CLASSES)
+_GAME_PRICE_JS = _PAGE_BYTES_JS + """
+for (const cls of arguments[0]) {
+    const el = document.querySelector('.' + cls + ' span.price');
+    if (el) return [(el.innerText || el.textContent || '').trim() || null, pageBytes()];
+}
+return [null, pageBytes()];
+"""
+
+
+def scrape_game_page(driver, url):
+    """Open a known game page directly and return its current price (or None)."""
+    _load_page(driver, url)
+    selector = ", ".join(f".{cls} span.price" for cls in GAME_PRICE_CLASSES)
+    if _wait_for_results(driver, selector) != "results":
+        return None
+    with metrics.timer("extract"):
+        price, size = driver.execute_script(_GAME_PRICE_JS, list(GAME_PRICE_CLASSES))
+    _add_bytes(size)
+    return price
+
+
+def scrape_game(driver, game_name, extract="script", speculate="off", pace=None):
+    """Search for a game on gg.deals and return best-matching result.
+
+    ``extract="script"`` pulls all candidates with one execute_script call and
+    scores them in Python; ``"elements"`` walks the DOM element by element.
+    With ``speculate`` (script extraction only) the query variants load in
+    extra tabs while the original does; ``pace`` is called before each.
+    """
+    if extract == "elements":
+        return _scrape_game_elements(driver, game_name)
+    variants = query_variants(game_name, speculate)
+    if len(variants) > 1:
+        return _scrape_game_speculative(driver, game_name, variants, pace)
+
+    query = matcher.Query(game_name)
+    _load_page(driver, f"{BASE_URL}/games/?title={quote_plus(game_name)}")
+    _wait_for_results(driver, ".hoverable-box, a.full-link, .game-info-title")
+
+    best = (None, None, None, 0.0)
+    try:
+        items, links = _collect_candidates(driver)
+        best = _score_candidates(query, items)
+        # Fallback: if no hoverable-box items, try raw selectors
+        if best[0] is None:
+            best = _score_candidates(query, links, best)
+    except Exception as e:
+        print(f"    Selector error: {e}")
+
+    # If no good match, retry with a simplified query (strips punctuation/subtitles)
+    if best[3] < 0.4:
+        simplified = _simplify_query(game_name)
+        if simplified.lower() != game_name.lower():
+            metrics.inc("retries_total")
+            with metrics.timer("retry"):
+                try:
+                    _load_page(driver, f"{BASE_URL}/games/?title={quote_plus(simplified)}")
+                except TimeoutException:
+                    pass
+                _wait_for_results(driver, ".hoverable-box, a.full-link")
+                try:
+                    items, _ = _collect_candidates(driver)
+                    best = _score_candidates(query, items, best)
+                except Exception:
+                    pass
+
+    best_name, best_price, best_url, best_score = best
+    # Reject matches that are too poor — avoids returning completely wrong games
+    if best_score < 0.3:
+        return None, None, None, 0.0
+
+    return best_name, best_price, best_url, round(best_score, 3)
+
+
+def query_variants(game_name, speculate="on"):
+    """Searches to send at once: the title, its simplified form and (``"base"``) its base title."""
+    if speculate == "off":
+        return [game_name]
+    variants = [game_name]
+    extra = [_simplify_query(game_name)]
+    if speculate == "base":
+        extra.append(matcher.base_title(game_name))
+    seen = {game_name.lower()}
+    for v in extra:
+        if v and v.lower() not in seen:
+            seen.add(v.lower())
+            variants.append(v)
+    return variants
+
+
+def _note_speculation(primary_score, best_score):
+    """Remember how this game's speculation went (lookup_game turns it into stats).
+
+    ``primary_score`` is the original query's best score (0 if it failed,
+    None if it was cancelled because a variant already matched).
+    """
+    _timing.speculation = {
+        # A variant found a better match than the original query did
+        "won": primary_score is not None and best_score > primary_score,
+        # The sequential path would have paid a second, serial search here
+        "saved": primary_score is not None and primary_score < 0.4,
+    }
+
+
+def _finish_match(best):
+    best_name, best_price, best_url, best_score = best
+    # Reject matches that are too poor — avoids returning completely wrong games
+    if best_score < 0.3:
+        return None, None, None, 0.0
+    return best_name, best_price, best_url, round(best_score, 3)
+
+
+def _scrape_game_speculative(driver, game_name, variants, pace=None):
+    """scrape_game with every variant loading at once, one browser tab each.
+
+    The original query loads in the current tab; the others open in new tabs
+    first so they load meanwhile.  Tabs are read in order and closed unread
+    once a candidate scores >= 0.95.
+    """
+    query = matcher.Query(game_name)
+    main = driver.current_window_handle
+    opened = []
+    best, primary = (None, None, None, 0.0), 0.0
+    try:
+        for v in variants[1:]:
+            if pace is not None:
+                pace()
+            before = set(driver.window_handles)
+            driver.execute_script("window.open(arguments[0], '_blank')",
+                                  f"{BASE_URL}/games/?title={quote_plus(v)}")
+            opened.extend(h for h in driver.window_handles if h not in before)
+        driver.switch_to.window(main)
+        _load_page(driver, f"{BASE_URL}/games/?title={quote_plus(variants[0])}")
+        _wait_for_results(driver, ".hoverable-box, a.full-link, .game-info-title")
+        try:
+            items, links = _collect_candidates(driver)
+            best = _score_candidates(query, items)
+            if best[0] is None:
+                best = _score_candidates(query, links, best)
+        except Exception as e:
+            print(f"    Selector error: {e}")
+        primary = best[3]
+        for handle in opened:
+            if best[3] >= 0.95:
+                break
+            driver.switch_to.window(handle)
+            _wait_for_results(driver, ".hoverable-box, a.full-link")
+            try:
+                items, _ = _collect_candidates(driver)
+            except Exception:
+                continue
+            best = _score_candidates(query, items, best)
+    finally:
+        for handle in opened:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except Exception:
+                pass
+        try:
+            driver.switch_to.window(main)
+        except Exception:
+            pass
+    _note_speculation(primary, best[3])
+    return _finish_match(best)
+
+
+def _scrape_game_elements(driver, game_name):
+    """Element-by-element variant of scrape_game (one WebDriver call per field)."""
+    search_url = f"{BASE_URL}/games/?title={quote_plus(game_name)}"
+    _load_page(driver, search_url)
+    _wait_for_results(driver, ".hoverable-box, a.full-link, .game-info-title")
+    query = matcher.Query(game_name)
 
     best_name = None
     best_price = None
@@ -208,7 +693,7 @@ def scrape_game(driver, game_name):
             name, price, url = _extract_item_info(item)
             if not name:
                 continue
-            score = name_similarity(game_name, name)
+            score = _match(query, name)
             if score > best_score:
                 best_score = score
                 best_name = name
@@ -226,7 +711,7 @@ def scrape_game(driver, game_name):
                 if not aria:
                     continue
                 name = aria.replace("Go to: ", "").strip()
-                score = name_similarity(game_name, name)
+                score = _match(query, name)
                 if score > best_score:
                     best_score = score
                     best_name = name
@@ -242,31 +727,31 @@ def scrape_game(driver, game_name):
     if best_score < 0.4:
         simplified = _simplify_query(game_name)
         if simplified.lower() != game_name.lower():
-            retry_url = f"https://gg.deals/games/?title={quote_plus(simplified)}"
-            try:
-                driver.get(retry_url)
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".hoverable-box, a.full-link"))
-                )
-            except TimeoutException:
-                time.sleep(3)
+            retry_url = f"{BASE_URL}/games/?title={quote_plus(simplified)}"
+            metrics.inc("retries_total")
+            with metrics.timer("retry"):
+                try:
+                    _load_page(driver, retry_url)
+                except TimeoutException:
+                    pass
+                _wait_for_results(driver, ".hoverable-box, a.full-link")
 
-            try:
-                items = driver.find_elements(By.CSS_SELECTOR, ".hoverable-box")
-                for item in items[:8]:
-                    name, price, url = _extract_item_info(item)
-                    if not name:
-                        continue
-                    score = name_similarity(game_name, name)
-                    if score > best_score:
-                        best_score = score
-                        best_name = name
-                        best_price = price
-                        best_url = url
-                    if score >= 0.95:
-                        break
-            except Exception:
-                pass
+                try:
+                    items = driver.find_elements(By.CSS_SELECTOR, ".hoverable-box")
+                    for item in items[:8]:
+                        name, price, url = _extract_item_info(item)
+                        if not name:
+                            continue
+                        score = _match(query, name)
+                        if score > best_score:
+                            best_score = score
+                            best_name = name
+                            best_price = price
+                            best_url = url
+                        if score >= 0.95:
+                            break
+                except Exception:
+                    pass
 
     # Reject matches that are too poor — avoids returning completely wrong games
     if best_score < 0.3:
@@ -275,6 +760,95 @@ def scrape_game(driver, game_name):
     return best_name, best_price, best_url, round(best_score, 3)
 
 
+def _match(query, name):
+    with metrics.timer("match"):
+        return query.score(name)
+
+
+def _score_candidates(query, candidates, best=(None, None, None, 0.0)):
+    """Pick the best (name, price, url, score) from up to 8 parsed candidates."""
+    candidates = candidates[:8]
+    with metrics.timer("match"):
+        i, score = query.best([name for name, _, _ in candidates], best_score=best[3])
+    if i is not None:
+        name, price, url = candidates[i]
+        return name, price, url, score
+    return best
+
+
+def _get_speculation_pool():
+    global _speculation_pool
+    with _lock:
+        if _speculation_pool is None:
+            _speculation_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="speculate")
+        return _speculation_pool
+
+
+def _timed_search(engine, query):
+    started = time.perf_counter()
+    return engine.search(query), time.perf_counter() - started
+
+
+def _search_speculative(engine, game_name, variants, pace=None):
+    """scrape_game_http with all variants requested at once; the rest are
+    cancelled once a candidate scores >= 0.95.  Raises the original query's
+    error (e.g. ChallengeError) only when no variant found anything.
+    """
+    query = matcher.Query(game_name)
+    pool = _get_speculation_pool()
+    futures = {}
+    for i, v in enumerate(variants):
+        if i and pace is not None:
+            pace()
+        futures[pool.submit(_timed_search, engine, v)] = i
+    best, primary, error = (None, None, None, 0.0), None, None
+    for fut in as_completed(futures):
+        i = futures[fut]
+        try:
+            candidates, seconds = fut.result()
+        except Exception as e:
+            if i == 0:
+                error, primary = e, 0.0
+            continue
+        metrics.observe("http_fetch", seconds)
+        if i == 0:
+            primary = _score_candidates(query, candidates)[3]
+        best = _score_candidates(query, candidates, best)
+        if best[3] >= 0.95:
+            for other in futures:
+                other.cancel()
+            break
+    if best[0] is None and error is not None:
+        raise error
+    _note_speculation(primary, best[3])
+    return _finish_match(best)
+
+
+def scrape_game_http(engine, game_name, speculate="off", pace=None):
+    """Same lookup as scrape_game, but over the browserless HTTP engine.
+
+    Raises ChallengeError when gg.deals wants a real browser.  With
+    ``speculate`` the query variants are requested in parallel.
+    """
+    variants = query_variants(game_name, speculate)
+    if len(variants) > 1:
+        return _search_speculative(engine, game_name, variants, pace)
+    query = matcher.Query(game_name)
+    with metrics.timer("http_fetch"):
+        candidates = engine.search(game_name)
+    best = _score_candidates(query, candidates)
+
+    if best[3] < 0.4:
+        simplified = _simplify_query(game_name)
+        if simplified.lower() != game_name.lower():
+            metrics.inc("retries_total")
+            with metrics.timer("retry"):
+                with metrics.timer("http_fetch"):
+                    candidates = engine.search(simplified)
+                best = _score_candidates(query, candidates, best)
+    return _finish_match(best)
+
+
 def _is_stopped(stop_event):
     """Check if stop was requested, supporting both Event objects and the global flag."""
     if stop_event is not None:
@@ -282,89 +856,594 @@ def _is_stopped(stop_event):
     return _stop_requested
 
 
-def worker_fn(worker_id, task_queue, results_dict, total, counter, headless,
-              output_file=None, progress_file=None, stop_event=None, label=""):
-    """Worker thread: creates its own browser and processes games from the queue."""
-    prefix = f"[{label}Worker {worker_id}]" if label else f"[Worker {worker_id}]"
-    driver = None
-    try:
-        print(f"  {prefix} Launching browser...")
-        driver = create_driver(headless=headless)
-        init_driver(driver)
-        print(f"  {prefix} Ready")
-
-        while not _is_stopped(stop_event):
-            try:
-                idx, game_name = task_queue.get_nowait()
-            except Empty:
-                break
-
+def _bump(stats, key, n=1):
+    if stats is not None:
+        with _lock:
+            stats[key] = stats.get(key, 0) + n
+
+
+def lookup_game(game_name, get_driver, http=None, cache=None, force_refresh=False,
+                extract="script", stats=None, prefix="", index=None, share=None, history=None,
+                speculate="off"):
+    """Resolve one title from the cache, the HTTP engine or the browser.
+
+    Titles known to the ``index`` (a TitleIndex) are served from the cache
+    entry of their canonical name, or fetched straight from their game page
+    without a search.  ``get_driver`` is called only when a browser is
+    actually needed.  ``share`` (a governor Share) rate-limits the request
+    and is told how it went.  Fresh lookups are added to ``history`` (a
+    PriceHistory).  ``speculate`` sends the query variants in parallel
+    (see query_variants).  Returns (result dict, info) where info holds
+    ``cached``, ``direct``, ``calls`` (WebDriver commands), the
+    ``wait``/``work`` seconds spent on it and, when a browser loaded pages,
+    their ``bytes`` and ``page_load`` seconds.
+
+    While a lookup for the same normalized name is in flight anywhere in
+    the process (the other tab, a near-duplicate title), this one waits for
+    it and shares its result (``info["coalesced"]``) unless it failed.
+    """
+    started = time.monotonic()
+
+    def accept(shared):
+        _, leader_info = shared
+        # Failures are retried per run; a forced refresh wants more than a cache hit
+        return not leader_info.get("error") and not (force_refresh and leader_info.get("cached"))
+
+    (result, info), coalesced = get_flights().do(
+        normalize_name(game_name),
+        lambda: _lookup_game(game_name, get_driver, http, cache, force_refresh, extract, stats,
+                             prefix, index, share, history, speculate),
+        accept)
+    if not coalesced:
+        return result, info
+
+    waited = time.monotonic() - started
+    _bump(stats, "coalesced")
+    _bump(stats, "wait_seconds", waited)
+    metrics.inc("coalesced_total")
+    metrics.observe("coalesced", waited)
+    shared = dict(result, search_name=game_name)
+    if result["price"] is None and result["matched_name"] == result["search_name"]:
+        shared["matched_name"] = game_name
+    return shared, {"cached": info["cached"], "direct": info["direct"], "coalesced": True,
+                    "calls": 0, "wait": waited, "work": 0.0, "error": None, "error_type": None,
+                    "bytes": 0, "page_load": 0.0, "pages": 0}
+
+
+def _lookup_game(game_name, get_driver, http, cache, force_refresh, extract, stats, prefix,
+                 index, share, history, speculate):
+    """The lookup behind lookup_game, run once per in-flight title."""
+    started = time.monotonic()
+    error = None
+    error_type = None
+    _reset_timing()
+    cache_key = normalize_name(game_name)
+    calls = [0]
+    used = [None]
+    pacer = get_pacer(urlsplit(BASE_URL).hostname)
+
+    def with_browser(fn, *args):
+        used[0] = get_driver()
+        counted = CountingDriver(used[0])
+        try:
+            return fn(counted, *args)
+        finally:
+            calls[0] += counted.calls
+
+    def pace():
+        with metrics.timer("pacing"):
+            if share is not None:
+                _add_wait(share.acquire())
+            _add_wait(pacer.wait())
+
+    def browser_lookup():
+        return with_browser(scrape_game, game_name, extract, speculate, pace)
+
+    def direct_lookup(known):
+        """Price from the known game page, or None to fall back to a search."""
+        if http is not None:
             try:
-                matched_name, price, game_url, confidence = scrape_game(driver, game_name)
-            except Exception as e:
-                print(f"  {prefix} Error on '{game_name}': {e}")
-                matched_name, price, game_url, confidence = None, None, None, 0.0
+                price = http.game_price(known.url)
+            except ChallengeError:
+                _add_wait(0.0, challenged=True)
+                price = with_browser(scrape_game_page, known.url)
+                http.seed_from_driver(used[0])
+        else:
+            price = with_browser(scrape_game_page, known.url)
+        index.mark_direct(known.key, price is not None)
+        if price is None:
+            return None
+        return known.name, price, known.url, round(known.confidence, 3)
+
+    known = index.resolve(game_name) if index is not None else None
+    cached = None
+    if cache is not None and not force_refresh:
+        with metrics.timer("cache"):
+            cached = cache.get(cache_key)
+            if cached is None and known is not None and known.key != cache_key:
+                cached = cache.get(known.key)
+
+    direct = False
+    if cached is not None:
+        matched_name, price, game_url, confidence = cached
+        _bump(stats, "cache_hits")
+        metrics.inc("cache_hits_total")
+    else:
+        if cache is not None:
+            _bump(stats, "cache_misses")
+        pace()
+        try:
+            found = None
+            if known is not None and known.direct is not False:
+                found = direct_lookup(known)
+                direct = found is not None
+            if found is not None:
+                matched_name, price, game_url, confidence = found
+                _bump(stats, "index_hits")
+            elif http is not None:
+                try:
+                    matched_name, price, game_url, confidence = scrape_game_http(
+                        http, game_name, speculate, pace)
+                except ChallengeError:
+                    _add_wait(0.0, challenged=True)
+                    print(f"  {prefix} Challenge page, falling back to browser")
+                    matched_name, price, game_url, confidence = browser_lookup()
+                    http.seed_from_driver(used[0])
+            else:
+                matched_name, price, game_url, confidence = browser_lookup()
+            if cache is not None and matched_name:
+                with metrics.timer("cache"):
+                    cache.put(cache_key, matched_name, price, game_url, confidence)
+                    canonical = normalize_name(matched_name)
+                    if canonical != cache_key and confidence >= matcher.CONTAINS_FLOOR:
+                        cache.put(canonical, matched_name, price, game_url, confidence)
+            if index is not None and matched_name and not direct:
+                index.add(game_name, matched_name, game_url, confidence)
+            if getattr(_timing, "challenges", 0):
+                pacer.failure(challenge=True)
+            else:
+                pacer.success()
+            if share is not None:
+                share.report("challenge" if getattr(_timing, "challenges", 0) else "ok")
+        except Exception as e:
+            print(f"  {prefix} Error on '{game_name}': {e}")
+            error = str(e) or type(e).__name__
+            error_type = type(e).__name__
+            metrics.inc("errors_total")
+            matched_name, price, game_url, confidence = None, None, None, 0.0
+            pacer.failure(challenge=isinstance(e, ChallengeError))
+            if share is not None:
+                share.report(_outcome(e))
+            if used[0] is not None:
                 try:
-                    driver.get("https://gg.deals/")
-                    time.sleep(3)
+                    used[0].get(f"{BASE_URL}/")
+                    wait_until_cleared(used[0], timeout=10)
                 except Exception:
                     pass
 
-            result = {
-                "search_name": game_name,
-                "matched_name": matched_name or game_name,
-                "price": price,
-                "price_value": parse_price(price) if price else None,
-                "url": game_url,
-                "match_confidence": confidence,
-            }
-            results_dict[idx] = result
-
-            with _lock:
-                counter[0] += 1
-                done = counter[0]
-            print(f"  {prefix} [{done}/{total}] {game_name} -> {price or 'N/A'}")
-            update_progress(done, total, game_name, "running", progress_file=progress_file)
-
-            # Save after each game
+    speculation = getattr(_timing, "speculation", None)
+    if speculation is not None:
+        _bump(stats, "speculated")
+        metrics.inc("speculative_lookups_total")
+        if speculation["won"]:
+            _bump(stats, "speculation_wins")
+            metrics.inc("speculation_wins_total")
+        if speculation["saved"]:
+            _bump(stats, "speculation_saved")
+            metrics.inc("speculation_saved_total")
+    waited = _timing.wait
+    metrics.observe("lookup", time.monotonic() - started)
+    info = {
+        "cached": cached is not None,
+        "direct": direct,
+        "calls": calls[0],
+        "wait": waited,
+        "work": max(0.0, time.monotonic() - started - waited),
+        "error": error,
+        "error_type": error_type,
+        "bytes": _timing.bytes,
+        "page_load": _timing.page_seconds,
+        "pages": _timing.pages,
+    }
+    if _timing.pages:
+        _bump(stats, "browser_lookups")
+        _bump(stats, "bytes_transferred", _timing.bytes)
+        _bump(stats, "page_load_seconds", _timing.page_seconds)
+        metrics.inc("bytes_transferred_total", _timing.bytes)
+    _bump(stats, "webdriver_calls", calls[0])
+    _bump(stats, "wait_seconds", waited)
+    _bump(stats, "work_seconds", info["work"])
+    result = {
+        "search_name": game_name,
+        "matched_name": matched_name or game_name,
+        "price": price,
+        "price_value": parse_price(price) if price else None,
+        "url": game_url,
+        "match_confidence": confidence,
+    }
+    if history is not None and cached is None and error is None:
+        history.record(cache_key, result)
+    return result, info
+
+
+def record_result(idx, result, results_dict, counter, total, stats=None, info=None,
+                  prefix="", output_file=None, progress_file=None, log=None, on_event=None):
+    """Store a finished game, log it, and update the progress/results files.
+
+    With a ResultsLog the game is appended to it; otherwise the whole results
+    file is rewritten.
+    """
+    results_dict[idx] = result
+    info = info or {}
+    metrics.inc("games_processed_total")
+
+    asked = time.perf_counter()
+    with _lock:
+        metrics.observe("lock", time.perf_counter() - asked)
+        counter[0] += 1
+        done = counter[0]
+        run_stats = dict(stats) if stats else None
+    timings = metrics.current_run()
+    if info.get("coalesced"):
+        source = f" (shared an in-flight lookup after {info.get('wait', 0):.2f}s)"
+    elif info.get("cached"):
+        source = " (cached)"
+    else:
+        source = " (direct, " if info.get("direct") else " ("
+        source += f"wait {info.get('wait', 0):.2f}s / work {info.get('work', 0):.2f}s"
+        if info.get("calls"):
+            source += f", {info['calls']} WebDriver calls"
+        if info.get("pages"):
+            source += f", {info['bytes'] / 1024:.0f} KB in {info['page_load']:.2f}s page load"
+        source += ")"
+    game_name = result["search_name"]
+    print(f"  {prefix} [{done}/{total}] {game_name} -> {result['price'] or 'N/A'}{source}")
+    with metrics.timer("progress"):
+        update_progress(done, total, game_name, "running", progress_file=progress_file,
+                        stats=run_stats, on_event=on_event, rows=[{"idx": idx, "result": result}],
+                        timings=timings.summary() if timings is not None and timings.due() else None)
+
+    with metrics.timer("save"):
+        if log is not None:
+            log.append(idx, result, status="failed" if info.get("error") else "done")
+        else:
             ordered = [results_dict[i] for i in sorted(results_dict.keys())]
             save_results(ordered, output_file=output_file)
 
-            task_queue.task_done()
-            time.sleep(0.3)
+
+def process_game(idx, game_name, lease, release, retries=None, stats=None, prefix="", **lookup):
+    """One task of a worker loop: look the game up, return its browser, retry on failure.
+
+    ``lease()`` is called only when the lookup needs a browser and
+    ``release(driver, info)`` hands it back, returning False when it died.
+    A failed lookup goes back to ``retries`` (a RetryScheduler) while it has
+    attempts left.  The other keyword arguments go to lookup_game().
+    Returns (result, info) to record, or None when the game was re-queued.
+    """
+    leased = []
+
+    def get_driver():
+        if not leased:
+            leased.append(lease())
+        return leased[0]
+
+    result, info = lookup_game(game_name, get_driver, stats=stats, prefix=prefix, **lookup)
+    if leased and not release(leased[0], info):
+        _bump(stats, "drivers_replaced")
+        print(f"  {prefix} Driver died, the pool will launch a fresh one")
+    if (info.get("error") and retries is not None
+            and _retry_later(retries, idx, game_name, info, stats, prefix)):
+        return None
+    return result, info
+
+
+def worker_fn(worker_id, task_queue, results_dict, total, counter, headless,
+              output_file=None, progress_file=None, stop_event=None, label="",
+              cache=None, force_refresh=False, stats=None, http=None, extract="script",
+              log=None, on_event=None, index=None, timings=None, retries=None, share=None,
+              history=None, speculate="off", profile="full"):
+    """Worker thread: serves cached games and looks up the rest.
+
+    Browsers are leased from the shared driver pool for one lookup at a time,
+    and only when needed: with ``http`` (an HttpEngine) most games never touch
+    Chrome, which then only serves challenge fallbacks.  Lookups that raise
+    go back to ``retries`` (a RetryScheduler) until they run out of attempts.
+    """
+    prefix = f"[{label}Worker {worker_id}]" if label else f"[Worker {worker_id}]"
+    pool = get_driver_pool()
+    metrics.bind(timings, f"{label}Worker {worker_id}")
+    if retries is None:
+        retries = RetryScheduler(max_attempts=1)
+
+    try:
+        while True:
+            item = retries.next(task_queue, lambda: _is_stopped(stop_event))
+            if item is None:
+                break
+            idx, game_name = item
+            done = process_game(
+                idx, game_name, lambda: lease_driver(pool, headless, share, profile),
+                lambda driver, info: release_driver(pool, driver, info, share),
+                retries=retries, stats=stats, prefix=prefix, http=http, cache=cache,
+                force_refresh=force_refresh, extract=extract, index=index, share=share,
+                history=history, speculate=speculate)
+            if done is None:
+                continue
+            result, info = done
+            record_result(idx, result, results_dict, counter, total, stats=stats,
+                          info=info, prefix=prefix, output_file=output_file,
+                          progress_file=progress_file, log=log, on_event=on_event)
 
     finally:
-        if driver:
+        metrics.bind(None, None)
+        print(f"  {prefix} Shut down")
+
+
+def _retry_later(retries, idx, game_name, info, stats, prefix=""):
+    """Schedule a failed lookup again; False once it is out of attempts (dead-lettered)."""
+    attempt = retries.attempt(idx)
+    delay = retries.failed(idx, game_name, info)
+    if delay is None:
+        _bump(stats, "dead_letters")
+        metrics.inc("dead_letters_total")
+        print(f"  {prefix} Giving up on '{game_name}' after {attempt} attempt(s)")
+        return False
+    _bump(stats, "retries")
+    metrics.inc("requeued_total")
+    print(f"  {prefix} Retrying '{game_name}' in {delay:.1f}s "
+          f"(attempt {attempt + 1}/{retries.max_attempts})")
+    return True
+
+
+def _new_retries(output_file, run, max_attempts):
+    """Retry scheduler whose dead letters are kept in the run manifest."""
+    out = output_file or RESULTS_FILE
+    return RetryScheduler(max_attempts=max_attempts,
+                          on_dead=lambda entry: checkpoint.add_dead_letter(out, run, entry))
+
+
+def _new_stats():
+    return {"cache_hits": 0, "cache_misses": 0, "index_hits": 0, "webdriver_calls": 0,
+            "wait_seconds": 0.0, "work_seconds": 0.0, "retries": 0, "dead_letters": 0,
+            "drivers_replaced": 0, "history_served": 0, "speculated": 0, "speculation_wins": 0,
+            "speculation_saved": 0, "browser_lookups": 0, "bytes_transferred": 0,
+            "page_load_seconds": 0.0, "coalesced": 0}
+
+
+def _resolve_cache(use_cache, cache):
+    if not use_cache:
+        return None
+    if cache is None:
+        from price_cache import get_cache
+        cache = get_cache()
+    return cache
+
+
+def _resolve_index(use_cache):
+    """The title index rides along with the cache (both are local knowledge)."""
+    if not use_cache:
+        return None
+    from title_index import get_index
+    return get_index()
+
+
+def _resolve_history(use_cache):
+    """Price history (for incremental refreshes) is local knowledge too."""
+    if not use_cache:
+        return None
+    from price_history import get_history
+    return get_history()
+
+
+def plan_tasks(todo, history, refresh="full", budget=None, seconds=None):
+    """Order ``todo`` for the workers and pick what an incremental refresh may skip.
+
+    Returns (tasks, served): ``tasks`` is a PriorityTasks, stalest titles
+    first (FIFO without history), that stops handing out games after
+    ``seconds``; ``served`` is [(idx, result)] taken from history instead of
+    scraped ("stale" mode: titles under the staleness threshold or past
+    ``budget``; titles without history are always queued).
+    """
+    if refresh not in REFRESH_MODES:
+        raise ValueError(f"Unknown refresh mode '{refresh}' (expected one of {', '.join(REFRESH_MODES)})")
+    if refresh == "stale" and history is None:
+        raise ValueError("Refreshing only stale prices needs the price history (the cache is off)")
+    tasks = PriorityTasks(time.monotonic() + seconds if seconds else None)
+    if history is None:
+        for i, game in todo:
+            tasks.put((i, game))
+        return tasks, []
+    if refresh == "stale":
+        ranked, served = history.plan(todo, normalize_name, budget=budget)
+    else:
+        ranked, served = history.plan(todo, normalize_name, threshold=0.0)
+    for score, i, game in ranked:
+        tasks.put((i, game), min(score, 1e9))
+    return tasks, served
+
+
+def serve_from_history(served, results_dict, counter, stats=None, log=None):
+    """Record results taken from history (they carry ``age_seconds``) without a lookup."""
+    for idx, result in served:
+        results_dict[idx] = result
+        if log is not None:
+            log.append(idx, result)
+    with _lock:
+        counter[0] += len(served)
+    _bump(stats, "history_served", len(served))
+
+
+def _budget_leftovers(tasks, history, results_dict, counter, stats=None, log=None, label=""):
+    """Games never started before the time budget ran out: history, else unpriced."""
+    left = tasks.drain()
+    if not left:
+        return
+    served = history.serve(left, normalize_name) if history is not None else []
+    serve_from_history(served, results_dict, counter, stats, log)
+    known = {idx for idx, _ in served}
+    skipped = [(idx, {"search_name": game, "matched_name": game, "price": None, "price_value": None,
+                      "url": None, "match_confidence": 0.0, "skipped": True})
+               for idx, game in left if idx not in known]
+    for idx, result in skipped:
+        results_dict[idx] = result
+        if log is not None:
+            log.append(idx, result, status="failed")
+    with _lock:
+        counter[0] += len(skipped)
+    print(f"Time budget used up: {len(served)} game(s) served from history, "
+          f"{len(skipped)} skipped {label}")
+
+
+def _check_modes(engine, extract, speculate="off", profile="full", refresh="full", use_cache=True):
+    """Validate run options; entry points call this before prepare_run() touches any file."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (expected one of {', '.join(ENGINES)})")
+    if extract not in EXTRACT_MODES:
+        raise ValueError(f"Unknown extract mode '{extract}' (expected one of {', '.join(EXTRACT_MODES)})")
+    if speculate not in SPECULATE_MODES:
+        raise ValueError(f"Unknown speculate mode '{speculate}' (expected one of {', '.join(SPECULATE_MODES)})")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (expected one of {', '.join(PROFILES)})")
+    if refresh not in REFRESH_MODES:
+        raise ValueError(f"Unknown refresh mode '{refresh}' (expected one of {', '.join(REFRESH_MODES)})")
+    if refresh == "stale" and not use_cache:
+        raise ValueError("Refreshing only stale prices needs the price history (the cache is off)")
+
+
+def prepare_run(games_list=None, output_file=None, resume=False, fsync="interval", label=""):
+    """Start a checkpointed run, or pick up the unfinished one for ``output_file``.
+
+    Returns (run, results_dict, todo, log): ``results_dict`` holds results
+    restored from the ledger and ``todo`` the (idx, game) pairs still to scrape
+    (pending plus previously failed ones).
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy '{fsync}' (expected one of {', '.join(FSYNC_POLICIES)})")
+    out = output_file or RESULTS_FILE
+    run = checkpoint.load_run(out) if resume else None
+    if resume and not checkpoint.is_resumable(run):
+        print(f"Nothing to resume, starting a new run... {label}")
+        run = None
+
+    if run is None:
+        games = games_list if games_list else load_games()
+        run = checkpoint.new_run(out, games)
+        log = ResultsLog(log_path(out), fsync=fsync)
+        return run, {}, list(enumerate(games)), log
+
+    led = checkpoint.ledger(out, run)
+    results_dict = dict(led["done"])
+    todo = [(i, g) for i, g in enumerate(run["games"])
+            if i not in results_dict and i not in led["deleted"]]
+    print(f"Resuming run {run['run_id']}: {len(results_dict)} done, "
+          f"{len(led['failed'])} failed, {len(led['pending'])} pending {label}")
+    run["status"] = "running"
+    run["dead_letters"] = []      # failed games are retried again
+    checkpoint.save_run(out, run)
+    log = ResultsLog(log_path(out), fsync=fsync, truncate=False)
+    return run, results_dict, todo, log
+
+
+def finish_run(results_dict, counter, total, stats, stop_event=None, output_file=None,
+               progress_file=None, cache=None, label="", log=None, on_event=None, run=None,
+               timings=None, profile="full"):
+    """Compact the results into the final ordered JSON and set the terminal status.
+
+    A stopped run keeps its log and manifest so it can be resumed later.
+    """
+    results = [results_dict[i] for i in sorted(results_dict.keys())]
+    stopped = _is_stopped(stop_event)
+    summary = None
+    if timings is not None:
+        metrics.finish_run(timings)
+        summary = timings.summary()
+
+    if stopped:
+        update_progress(counter[0], total, "", "stopped", progress_file=progress_file, stats=stats,
+                        on_event=on_event, timings=summary)
+    else:
+        update_progress(total, total, "", "completed", progress_file=progress_file, stats=stats,
+                        on_event=on_event, timings=summary)
+
+    save_results(results, output_file=output_file)
+    if log is not None:
+        log.close()
+        if not stopped:
             try:
-                driver.quit()
-            except Exception:
+                os.remove(log.path)
+            except OSError:
                 pass
-        print(f"  {prefix} Shut down")
+    if run is not None:
+        checkpoint.mark_run(output_file or RESULTS_FILE, run, "stopped" if stopped else "completed")
+    if cache is not None:
+        print(f"Cache: {stats['cache_hits']} hit(s), {stats['cache_misses']} miss(es), "
+              f"{stats['index_hits']} resolved from the title index {label}")
+    if stats.get("coalesced"):
+        print(f"Coalesced: {stats['coalesced']} lookup(s) shared a result already in flight {label}")
+    if stats.get("history_served"):
+        print(f"History: {stats['history_served']} price(s) served without a lookup {label}")
+    if stats.get("speculated"):
+        print(f"Speculation: {stats['speculated']} parallel search(es), {stats['speculation_wins']} won "
+              f"by a variant, {stats['speculation_saved']} saved a sequential retry {label}")
+    if stats.get("browser_lookups"):
+        n = stats["browser_lookups"]
+        print(f"Pages ({profile} profile): {stats['bytes_transferred'] / n / 1024:.0f} KB and "
+              f"{stats['page_load_seconds'] / n:.2f}s of page load per browser lookup {label}")
+    if stats.get("retries") or stats.get("dead_letters"):
+        print(f"Retries: {stats['retries']} retried, {stats['dead_letters']} gave up {label}")
+    print(f"Time: {stats['wait_seconds']:.1f}s waiting, {stats['work_seconds']:.1f}s working {label}")
+    return results
 
 
 def scrape_prices(headless=False, games_list=None, workers=3, output_file=None,
-                  progress_file=None, stop_event=None, label=""):
+                  progress_file=None, stop_event=None, label="", use_cache=True,
+                  force_refresh=False, cache=None, engine="browser", extract="script",
+                  fsync="interval", on_event=None, resume=False, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                  refresh="full", refresh_budget=None, refresh_seconds=None, speculate="off",
+                  profile="full"):
+    """Scrape a game list with worker threads.
+
+    ``refresh="stale"`` re-scrapes only titles whose price has likely moved
+    (at most ``refresh_budget`` of them) and serves the rest from the price
+    history; ``refresh_seconds`` stops starting new lookups after that long.
+    ``speculate`` searches query variants in parallel (see SPECULATE_MODES);
+    ``profile="lean"`` launches Chrome with the lean page-load profile.
+    """
     if stop_event is None:
         reset_stop()
     else:
         stop_event.clear()
 
-    games = games_list if games_list else load_games()
-    total = len(games)
-
-    update_progress(0, total, "", "starting", progress_file=progress_file)
-
-    # Clamp workers: at least 1, at most the number of games
-    workers = max(1, min(workers, total))
-    print(f"Starting {workers} worker(s) for {total} games... {label}")
-
-    # Shared state
-    task_queue = Queue()
-    results_dict = {}       # idx -> result (thread-safe dict writes by distinct keys)
-    counter = [0]           # mutable counter wrapped in list
-
-    for i, game in enumerate(games):
-        task_queue.put((i, game))
+    # Before prepare_run: a bad option must not overwrite the manifest or truncate the log
+    _check_modes(engine, extract, speculate, profile, refresh, use_cache)
+    run, results_dict, todo, log = prepare_run(games_list, output_file, resume=resume,
+                                               fsync=fsync, label=label)
+    total = len(run["games"])
+
+    cache = _resolve_cache(use_cache, cache)
+    index = _resolve_index(use_cache)
+    history = _resolve_history(use_cache)
+    http = HttpEngine(BASE_URL) if engine == "http" else None
+
+    # Shared state (results_dict: idx -> result, thread-safe dict writes by distinct keys)
+    stats = _new_stats()
+    counter = [len(results_dict)]   # mutable counter wrapped in list
+    task_queue, served = plan_tasks(todo, history, refresh, refresh_budget, refresh_seconds)
+    serve_from_history(served, results_dict, counter, stats, log)
+    left = task_queue.qsize()
+
+    timings = metrics.start_run(label)
+    retries = _new_retries(output_file, run, max_attempts)
+    share = join_governor(label)
+    restored = [{"idx": i, "result": r} for i, r in sorted(results_dict.items())]
+    update_progress(len(results_dict), total, "", "starting", progress_file=progress_file,
+                    stats=stats, on_event=on_event, rows=restored)
+
+    # Clamp workers: at least 1, at most the number of games left
+    workers = max(1, min(workers, left))
+    if served:
+        print(f"Serving {len(served)} game(s) from price history {label}")
+    print(f"Starting {workers} {engine} worker(s) for {left} of {total} games... {label}")
 
     threads = []
     for wid in range(workers):
@@ -372,38 +1451,106 @@ def scrape_prices(headless=False, games_list=None, workers=3, output_file=None,
             target=worker_fn,
             args=(wid + 1, task_queue, results_dict, total, counter, headless),
             kwargs=dict(output_file=output_file, progress_file=progress_file,
-                        stop_event=stop_event, label=label),
+                        stop_event=stop_event, label=label, cache=cache,
+                        force_refresh=force_refresh, stats=stats, http=http,
+                        extract=extract, log=log, on_event=on_event, index=index,
+                        timings=timings, retries=retries, share=share, history=history,
+                        speculate=speculate, profile=profile),
             daemon=True,
         )
         t.start()
         threads.append(t)
-        # Stagger launches so Chrome instances don't collide
-        if wid < workers - 1:
-            time.sleep(4)
 
     for t in threads:
         t.join()
+    share.leave()
+    if not _is_stopped(stop_event):
+        _budget_leftovers(task_queue, history, results_dict, counter, stats, log, label)
 
-    # Build final ordered results
-    results = [results_dict[i] for i in sorted(results_dict.keys())]
-
-    if _is_stopped(stop_event):
-        update_progress(counter[0], total, "", "stopped", progress_file=progress_file)
-    else:
-        update_progress(total, total, "", "completed", progress_file=progress_file)
-
-    save_results(results, output_file=output_file)
-    return results
+    return finish_run(results_dict, counter, total, stats, stop_event=stop_event,
+                      output_file=output_file, progress_file=progress_file,
+                      cache=cache, label=label, log=log, on_event=on_event, run=run,
+                      timings=timings, profile=profile)
 
 
 if __name__ == "__main__":
     headless = "--headless" in sys.argv
+    force = "--refresh" in sys.argv
+    resume = "--resume" in sys.argv
+    no_cache = "--no-cache" in sys.argv
     w = 3
+    eng = "browser"
+    ext = "script"
+    conc = None
+    sync = "interval"
+    coordinator_url = None
+    batch = None
+    attempts = DEFAULT_MAX_ATTEMPTS
+    refresh = "stale" if "--stale" in sys.argv else "full"
+    budget = None
+    budget_seconds = None
+    spec = "off"
+    prof = "lean" if "--lean" in sys.argv else "full"
+    cache_ttl = None
+    cache_max = None
     for arg in sys.argv:
         if arg.startswith("--workers="):
             w = int(arg.split("=")[1])
-    print(f"Starting scraper (headless={headless}, workers={w})...")
-    results = scrape_prices(headless=headless, workers=w)
+        elif arg.startswith("--engine="):
+            eng = arg.split("=")[1]
+        elif arg.startswith("--extract="):
+            ext = arg.split("=")[1]
+        elif arg.startswith("--concurrency="):
+            conc = int(arg.split("=")[1])
+        elif arg.startswith("--fsync="):
+            sync = arg.split("=")[1]
+        elif arg.startswith("--coordinator="):
+            coordinator_url = arg.split("=", 1)[1]
+        elif arg.startswith("--batch="):
+            batch = int(arg.split("=")[1])
+        elif arg.startswith("--attempts="):
+            attempts = int(arg.split("=")[1])
+        elif arg.startswith("--budget="):
+            budget = int(arg.split("=")[1])
+        elif arg.startswith("--budget-seconds="):
+            budget_seconds = float(arg.split("=")[1])
+        elif arg == "--speculate":
+            spec = "on"
+        elif arg.startswith("--speculate="):
+            spec = arg.split("=")[1]
+        elif arg.startswith("--profile="):
+            prof = arg.split("=")[1]
+        elif arg.startswith("--cache-ttl="):
+            cache_ttl = int(arg.split("=")[1])
+        elif arg.startswith("--cache-max="):
+            cache_max = int(arg.split("=")[1])
+    if not no_cache and (cache_ttl is not None or cache_max is not None):
+        from price_cache import configure_cache
+        configure_cache(ttl=cache_ttl, max_entries=cache_max)
+    if "--worker" in sys.argv:
+        # Remote worker: pull leased batches from a coordinating app instead of games.txt
+        if not coordinator_url:
+            print("--worker needs --coordinator=http://host:5000")
+            sys.exit(1)
+        from coordinator import run_worker, DEFAULT_BATCH
+        run_worker(coordinator_url, workers=w, batch=batch or DEFAULT_BATCH, headless=headless,
+                   engine=eng, extract=ext, use_cache=not no_cache, force_refresh=force,
+                   idle_exit="--exit-when-idle" in sys.argv, speculate=spec, profile=prof)
+        sys.exit(0)
+    print(f"Starting scraper (headless={headless}, workers={w}, engine={eng}, profile={prof})...")
+    if conc:
+        from async_engine import scrape_prices as run
+        results = run(headless=headless, workers=w, use_cache=not no_cache,
+                      force_refresh=force, engine=eng, extract=ext, concurrency=conc,
+                      fsync=sync, resume=resume, max_attempts=attempts, refresh=refresh,
+                      refresh_budget=budget, refresh_seconds=budget_seconds, speculate=spec,
+                      profile=prof)
+    else:
+        results = scrape_prices(headless=headless, workers=w, use_cache=not no_cache,
+                                force_refresh=force, engine=eng, extract=ext, fsync=sync,
+                                resume=resume, max_attempts=attempts, refresh=refresh,
+                                refresh_budget=budget, refresh_seconds=budget_seconds,
+                                speculate=spec, profile=prof)
     print(f"\nDone! Scraped {len(results)} games.")
     found = sum(1 for r in results if r["price"])
     print(f"Found prices for {found}/{len(results)} games.")
@@ -0,0 +1,212 @@
+"""Startup budget: background pre-warm for the app and a cold-start report.
+
+The app imports only Flask and its own light modules at launch; the
+scraper, the HTTP engine and (for the browser engine) Selenium plus
+undetected_chromedriver are loaded on first use.  ``prewarm()`` does that
+loading in the background when the page opens so the first Start doesn't
+stall, and can also launch one warm Chrome into the driver pool.
+
+    python startup.py [--top=15] [--module=app] [--exe=PATH] [--runs=3] [--json]
+
+reports where cold start goes: a ``python -X importtime`` breakdown of
+importing ``--module`` (top packages by cumulative time), the in-process
+cost of the lazily loaded stacks, and, with ``--exe``, the wall time of the
+frozen build up to the point it would start serving (which includes the
+PyInstaller unpack into _MEIPASS).
+"""
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Loaded lazily by the app, in the order a first run needs them
+LAZY_STACKS = {
+    "http": ["scraper", "http_engine", "price_cache", "title_index"],
+    "browser": ["scraper", "selenium.webdriver", "undetected_chromedriver"],
+    "async": ["async_engine"],
+}
+
+_state = {"status": "idle", "engines": [], "seconds": {}, "error": None}
+_lock = threading.Lock()
+
+
+# ---- pre-warm ----
+
+def _prewarm(engine, launch):
+    started = time.perf_counter()
+    try:
+        import scraper
+        if engine == "browser":
+            scraper.load_browser()
+            if launch:
+                # One warm driver into the pool; the first lease picks it up
+                pool = scraper.get_driver_pool()
+                pool.release(pool.lease(headless=False))
+        error = None
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        print(f"[Prewarm] {engine} failed: {error}")
+    with _lock:
+        _state["seconds"][engine] = round(time.perf_counter() - started, 3)
+        _state["error"] = error
+        _state["status"] = "done"
+
+
+def prewarm(engine, launch=False):
+    """Start loading ``engine``'s modules in the background (once per engine).
+
+    With ``launch`` a browser engine also gets a warm Chrome in the pool.
+    Returns the pre-warm state.
+    """
+    with _lock:
+        if engine not in _state["engines"]:
+            _state["engines"].append(engine)
+            _state["status"] = "warming"
+            threading.Thread(target=_prewarm, args=(engine, launch), daemon=True).start()
+    return prewarm_state()
+
+
+def prewarm_state():
+    with _lock:
+        return dict(_state, engines=list(_state["engines"]), seconds=dict(_state["seconds"]))
+
+
+# ---- reports ----
+
+def import_costs(modules):
+    """Seconds each not-yet-imported module takes to import here, in order."""
+    costs = []
+    for name in modules:
+        if name in sys.modules:
+            costs.append({"module": name, "ms": 0.0, "cached": True})
+            continue
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            error = None
+        except ImportError as e:
+            error = str(e)
+        costs.append({"module": name, "ms": round((time.perf_counter() - started) * 1000, 1),
+                      "error": error})
+    return costs
+
+
+def parse_importtime(text):
+    """[(module, self_us, cumulative_us, depth)] from ``-X importtime`` stderr."""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((name.strip(), int(self_us), int(cumulative_us),
+                         (len(name) - len(name.lstrip())) // 2))
+        except ValueError:
+            continue
+    return rows
+
+
+def importtime(module="app", top=15):
+    """Fresh-interpreter import of ``module``: wall time plus its heaviest packages."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=here, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    rows = parse_importtime(proc.stderr)
+    # Top-level packages only (depth 0 after the leading space), heaviest first
+    roots = [r for r in rows if r[3] == 0]
+    roots.sort(key=lambda r: r[2], reverse=True)
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+        "wall_ms": round(wall * 1000, 1),
+        "imports_ms": round(sum(r[2] for r in roots) / 1000, 1),
+        "top": [{"module": n, "cumulative_ms": round(c / 1000, 1), "self_ms": round(s / 1000, 1)}
+                for n, s, c, _ in roots[:top]],
+    }
+
+
+def lazy_costs():
+    """Cost of each lazily loaded stack, measured in a fresh interpreter per stack."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = {}
+    for stack, modules in LAZY_STACKS.items():
+        code = f"import json, startup; print(json.dumps(startup.import_costs({modules!r})))"
+        proc = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True)
+        try:
+            out[stack] = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            out[stack] = {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return out
+
+
+def exe_cold_start(path, runs=3):
+    """Wall time of ``path --startup-report`` (unpack + imports, no server), per run."""
+    samples = []
+    report = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run([path, "--startup-report"], capture_output=True, text=True)
+        samples.append(round((time.perf_counter() - started) * 1000, 1))
+        try:
+            report = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            report = {"error": proc.stderr.strip()[-300:]}
+    return {"exe": path, "wall_ms": samples, "in_process": report}
+
+
+def app_report(started):
+    """What ``app.py --startup-report`` prints: time from its first line to ready."""
+    return {
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "imports_ms": round((time.perf_counter() - started) * 1000, 1),
+        "modules_loaded": len(sys.modules),
+        "scraper_loaded": "scraper" in sys.modules,
+        "selenium_loaded": "selenium" in sys.modules,
+    }
+
+
+def main(argv):
+    top, module, exe, runs = 15, "app", None, 3
+    for arg in argv:
+        if arg.startswith("--top="):
+            top = int(arg.split("=", 1)[1])
+        elif arg.startswith("--module="):
+            module = arg.split("=", 1)[1]
+        elif arg.startswith("--exe="):
+            exe = arg.split("=", 1)[1]
+        elif arg.startswith("--runs="):
+            runs = int(arg.split("=", 1)[1])
+    report = {"python": sys.version.split()[0], "cold_import": importtime(module, top),
+              "lazy": lazy_costs()}
+    if exe:
+        report["exe"] = exe_cold_start(exe, runs)
+    if "--json" in argv:
+        print(json.dumps(report, indent=2))
+        return
+
+    cold = report["cold_import"]
+    status = "" if cold["ok"] else f" (failed: {cold['error']})"
+    print(f"import {module}: {cold['wall_ms']} ms wall, {cold['imports_ms']} ms in imports{status}")
+    for row in cold["top"]:
+        print(f"  {row['cumulative_ms']:>8.1f} ms  {row['module']}")
+    print("Loaded on first use:")
+    for stack, costs in report["lazy"].items():
+        if isinstance(costs, dict):
+            print(f"  {stack:<8} {costs['error']}")
+            continue
+        parts = ", ".join(f"{c['module']} {c['ms']} ms" + (" (missing)" if c.get("error") else "")
+                          for c in costs)
+        print(f"  {stack:<8} {sum(c['ms'] for c in costs):.1f} ms ({parts})")
+    if exe:
+        e = report["exe"]
+        print(f"{exe}: {', '.join(str(s) for s in e['wall_ms'])} ms to ready; in-process {e['in_process']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
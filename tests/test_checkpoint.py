@@ -0,0 +1,101 @@
+import checkpoint
+import scraper
+from results_log import ResultsLog, log_path
+
+GAMES = ["Celeste", "Hades", "Frostpunk", "Terraria", "Portal 2"]
+
+
+def _result(name, price="$1.00"):
+    return {"search_name": name, "matched_name": name, "price": price}
+
+
+def _interrupted_run(tmp_path, records, status="stopped", torn=False):
+    """A run whose log holds ``records`` [(idx, status)], as a crash or Stop leaves it."""
+    out = str(tmp_path / "tab_results.json")
+    run = checkpoint.new_run(out, GAMES)
+    log = ResultsLog(log_path(out), fsync="never")
+    for idx, state in records:
+        log.append(idx, _result(GAMES[idx], None if state == "failed" else "$1.00"), status=state)
+    log.close()
+    if torn:
+        with open(log_path(out), "a", encoding="utf-8") as f:
+            f.write('{"idx": 4, "status": "done", "res')
+    if status != "running":
+        checkpoint.mark_run(out, run, status)
+    return out
+
+
+def test_ledger_splits_done_failed_and_pending(tmp_path):
+    out = _interrupted_run(tmp_path, [(0, "done"), (1, "failed"), (3, "done")])
+    led = checkpoint.ledger(out)
+    assert sorted(led["done"]) == [0, 3]
+    assert sorted(led["failed"]) == [1]
+    assert led["pending"] == [2, 4]
+
+
+def test_latest_record_wins(tmp_path):
+    out = _interrupted_run(tmp_path, [(1, "failed"), (1, "done"), (2, "done"), (2, "failed")])
+    led = checkpoint.ledger(out)
+    assert sorted(led["done"]) == [1]
+    assert sorted(led["failed"]) == [2]
+
+
+def test_torn_trailing_line_is_ignored(tmp_path):
+    out = _interrupted_run(tmp_path, [(0, "done")], status="running", torn=True)
+    led = checkpoint.ledger(out)
+    assert sorted(led["done"]) == [0]
+    assert led["pending"] == [1, 2, 3, 4]
+    assert checkpoint.is_resumable(checkpoint.load_run(out))
+
+
+def test_summary(tmp_path):
+    out = _interrupted_run(tmp_path, [(0, "done"), (1, "failed")])
+    run = checkpoint.load_run(out)
+    checkpoint.add_dead_letter(out, run, {"idx": 1, "game": "Hades"})
+    assert checkpoint.summary(out) == {
+        "run_id": run["run_id"], "status": "stopped", "total": 5, "done": 1, "failed": 1,
+        "pending": 3, "dead_letters": 1, "resumable": True,
+    }
+
+
+def test_completed_run_is_not_resumable(tmp_path):
+    out = _interrupted_run(tmp_path, [(i, "done") for i in range(5)], status="completed")
+    assert not checkpoint.is_resumable(checkpoint.load_run(out))
+    assert checkpoint.summary(out)["done"] == 5
+    assert checkpoint.summary(str(tmp_path / "other_results.json")) is None
+
+
+def test_resume_restores_done_and_requeues_the_rest(tmp_path):
+    out = _interrupted_run(tmp_path, [(0, "done"), (1, "failed"), (3, "done")])
+    run = checkpoint.load_run(out)
+    checkpoint.add_dead_letter(out, run, {"idx": 1, "game": "Hades"})
+
+    run, results_dict, todo, log = scraper.prepare_run(output_file=out, resume=True, fsync="never")
+    log.append(2, _result("Frostpunk"))
+    log.close()
+    assert sorted(results_dict) == [0, 3]
+    assert todo == [(1, "Hades"), (2, "Frostpunk"), (4, "Portal 2")]
+    assert run["status"] == "running" and run["dead_letters"] == []
+    # The log is appended to, not truncated, so a second interruption loses nothing
+    assert sorted(checkpoint.ledger(out)["done"]) == [0, 2, 3]
+
+
+def test_resume_without_a_resumable_run_starts_over(tmp_path):
+    out = _interrupted_run(tmp_path, [(i, "done") for i in range(5)], status="completed")
+    old = checkpoint.load_run(out)["run_id"]
+    run, results_dict, todo, log = scraper.prepare_run(
+        games_list=["Hades"], output_file=out, resume=True, fsync="never")
+    log.close()
+    assert run["run_id"] != old
+    assert (results_dict, todo) == ({}, [(0, "Hades")])
+    assert checkpoint.ledger(out)["done"] == {}
+
+
+def test_run_files(tmp_path):
+    out = str(tmp_path / "tab_results.json")
+    files = checkpoint.run_files(out)
+    assert files == [out, str(tmp_path / "tab_results.jsonl"), str(tmp_path / "tab_results.run.json")]
+    for path in files[:2]:
+        open(path, "w").close()
+    checkpoint.remove_files(files)
+    assert not any((tmp_path / name).exists() for name in ("tab_results.json", "tab_results.jsonl"))
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import coordinator
+from benchmarks.standin import StandIn
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TITLES = ["Hollow Knight", "Celeste", "Frostpunk", "DOOM Eternal", "Borderlands 3", "Hades",
+          "Stardew Valley", "Terraria", "Dead Cells", "Cuphead", "Subnautica", "Factorio"]
+
+
+def _serve_work_api():
+    """The /api/work endpoints of app.py, without Flask."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            data = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+            if self.path == "/api/work/lease":
+                lease, active = coordinator.lease_any(data["worker"], data.get("max", 1))
+                reply = {"lease": lease, "active": active}
+            elif self.path == "/api/work/heartbeat":
+                ok, revoked = coordinator.heartbeat(data.get("lease_id", ""))
+                reply = {"ok": ok, "revoked": revoked}
+            else:
+                accepted, revoked = coordinator.complete(data.get("lease_id", ""), data.get("results") or [])
+                reply = {"accepted": accepted, "revoked": revoked}
+            body = json.dumps(reply).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_lease_ids_do_not_depend_on_the_run_name():
+    coord = coordinator.Coordinator("steam:wishlist", [(0, "Celeste")], lambda *a: None)
+    coordinator.register(coord)
+    try:
+        lease, active = coordinator.lease_any("w1")
+        assert active and lease["items"] == [[0, "Celeste"]]
+        assert coordinator.heartbeat(lease["lease_id"]) == (True, [])
+        assert coordinator.complete(lease["lease_id"], [{"idx": 0, "result": {}}])[0] == 1
+    finally:
+        coordinator.unregister(coord)
+    assert coordinator.heartbeat(lease["lease_id"]) == (False, [])
+
+
+def test_worker_processes_finish_runs_with_colons_in_their_names(tmp_path):
+    standin = StandIn(TITLES, latency=0.05, jitter=0.0)
+    base_url = standin.start()
+    api = _serve_work_api()
+    results = {}
+    lock = threading.Lock()
+
+    def on_result(run):
+        def record(idx, result, info, worker):
+            with lock:
+                assert (run, idx) not in results
+                results[(run, idx)] = result
+        return record
+
+    half = len(TITLES) // 2
+    runs = [coordinator.Coordinator(name, list(enumerate(games)), on_result(name), lease_seconds=3)
+            for name, games in (("list:a", TITLES[:half]), ("list:b", TITLES[half:]))]
+    for coord in runs:
+        coordinator.register(coord)
+    env = dict(os.environ, GG_DEALS_URL=base_url, PYTHONUNBUFFERED="1")
+    cmd = [sys.executable, os.path.join(ROOT, "scraper.py"), "--worker", "--engine=http", "--no-cache",
+           "--exit-when-idle", "--workers=2", "--batch=2",
+           f"--coordinator=http://127.0.0.1:{api.server_address[1]}"]
+    procs = [subprocess.Popen(cmd, cwd=tmp_path, env=env, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, text=True) for _ in range(2)]
+    try:
+        deadline = time.monotonic() + 60
+        for coord in runs:
+            while not coord.wait(timeout=0.5):
+                if time.monotonic() > deadline:
+                    pytest.fail(f"{coord.name} did not finish: {coord.snapshot()}")
+    finally:
+        for coord in runs:
+            coordinator.unregister(coord)
+        for proc in procs:
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        api.shutdown()
+        standin.stop()
+
+    assert all(proc.returncode == 0 for proc in procs)
+    assert sorted(results) == sorted([("list:a", i) for i in range(half)] +
+                                     [("list:b", i) for i in range(len(TITLES) - half)])
+    for (run, idx), result in results.items():
+        games = TITLES[:half] if run == "list:a" else TITLES[half:]
+        assert result["search_name"] == games[idx]
+        assert result["price"] is not None
+    assert coordinator.snapshot() == {}
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    """Records whether the pool lock was free while quit() ran."""
+
+    def __init__(self, pool, profile):
+        self.pool = pool
+        self.profile = profile
+        self.quit_with_lock_free = None
+
+    @property
+    def window_handles(self):
+        return ["main"]
+
+    def quit(self):
+        free = []
+
+        def probe():
+            got = self.pool._cond.acquire(timeout=1)
+            if got:
+                self.pool._cond.release()
+            free.append(got)
+
+        t = threading.Thread(target=probe)
+        t.start()
+        t.join()
+        self.quit_with_lock_free = free[0]
+
+
+def _pool(**kwargs):
+    holder = []
+    pool = DriverPool(lambda headless, profile: FakeDriver(holder[0], profile), idle_timeout=0, **kwargs)
+    holder.append(pool)
+    return pool
+
+
+def test_release_quits_unhealthy_drivers_outside_the_lock():
+    pool = _pool()
+    driver = pool.lease()
+    pool.release(driver, healthy=False)
+    assert driver.quit_with_lock_free is True
+    assert pool.snapshot()["recycled"] == 1
+
+
+def test_full_pool_recycles_other_profiles_outside_the_lock():
+    pool = _pool(max_size=1)
+    lean = pool.lease(profile="lean")
+    pool.release(lean)
+    full = pool.lease(profile="full")
+    assert lean.quit_with_lock_free is True
+    assert full.profile == "full"
+    assert pool.snapshot()["created"] == 2
+
+
+def test_reap_and_close_quit_outside_the_lock():
+    pool = _pool()
+    stale, kept = pool.lease(), pool.lease()
+    pool.release(stale)
+    pool.idle_timeout = 60
+    pool._idle[0].idle_since = time.monotonic() - 120
+    pool.reap()
+    assert stale.quit_with_lock_free is True
+    pool.release(kept)
+    pool.close()
+    assert kept.quit_with_lock_free is True
+
+
+def test_quitting_drivers_count_toward_max_size():
+    release_quit = threading.Event()
+    quitting = threading.Event()
+
+    class SlowDriver:
+        window_handles = ["main"]
+
+        def quit(self):
+            quitting.set()
+            release_quit.wait(5)
+
+    pool = DriverPool(lambda headless, profile: SlowDriver(), max_size=1, idle_timeout=0)
+    driver = pool.lease()
+    t = threading.Thread(target=pool.release, args=(driver,), kwargs={"healthy": False})
+    t.start()
+    assert quitting.wait(5)
+    with pytest.raises(TimeoutError):
+        pool.lease(timeout=0.2)
+    release_quit.set()
+    t.join(5)
+    assert pool.lease(timeout=1) is not None
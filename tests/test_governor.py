@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+import governor
+from governor import Governor
+
+
+def _in_thread(fn, *args):
+    t = threading.Thread(target=fn, args=args, daemon=True)
+    t.start()
+    return t
+
+
+def test_burst_then_refill_at_the_rate():
+    gov = Governor(rate=20.0, burst=2)
+    share = gov.join("trader")
+    assert share.acquire() < 0.01
+    assert share.acquire() < 0.01
+    assert share.acquire() >= 0.03        # the third waits ~1/rate for a token
+
+
+def test_no_rate_limit():
+    share = Governor(rate=None, burst=1).join("trader")
+    assert sum(share.acquire() for _ in range(50)) < 0.05
+    assert share.governor.snapshot()["rate"] is None
+
+
+def test_aimd_rate_adaptation():
+    gov = Governor(rate=1.0, step=0.5, max_rate=2.0, min_rate=0.4, window=4, threshold=0.25,
+                   cooldown=60.0)
+    share = gov.join("trader")
+    share.report("ok")
+    share.report("ok")
+    share.report("ok")
+    assert gov.rate == 2.0                # additive increase, capped
+    share.report("error")                 # not a pacing signal
+    assert gov.rate == 2.0
+    share.report("challenge")             # 1/4 is not over the threshold yet
+    share.report("timeout")               # 2/4 is
+    assert gov.rate == 1.0
+    share.report("challenge")
+    assert gov.rate == 1.0                # one cut per cooldown
+    gov._last_cut -= 60.0
+    share.report("challenge")
+    assert gov.rate == 0.5
+    gov._last_cut -= 60.0
+    share.report("challenge")
+    assert gov.rate == 0.4                # floor
+    assert gov.snapshot()["tabs"]["trader"]["challenge"] == 4
+
+
+def test_a_newcomer_starts_level_with_the_running_tabs():
+    gov = Governor(rate=None)
+    trader = gov.join("trader")
+    for _ in range(5):
+        trader.acquire()
+    gov.join("my")
+    assert gov.snapshot()["tabs"]["my"]["granted"] == 5
+
+
+def test_tokens_are_shared_fairly_between_tabs():
+    gov = Governor(rate=100.0, burst=1)
+    stop = threading.Event()
+
+    def hammer(share):
+        while not stop.is_set():
+            share.acquire()
+
+    busy, quiet = gov.join("busy"), gov.join("quiet")
+    threads = [_in_thread(hammer, busy) for _ in range(4)] + [_in_thread(hammer, quiet)]
+    time.sleep(0.5)
+    stop.set()
+    for t in threads:
+        t.join()
+    tabs = gov.snapshot()["tabs"]
+    assert tabs["quiet"]["granted"] >= 20
+    assert abs(tabs["busy"]["granted"] - tabs["quiet"]["granted"]) <= 5
+
+
+def test_browser_slots_are_split_while_both_tabs_want_them():
+    gov = Governor(rate=None, max_browsers=4)
+    busy, quiet = gov.join("busy"), gov.join("quiet")
+    for _ in range(3):
+        busy.lease_browser()              # alone it may go over its fair share
+    assert gov.fair_browsers("busy") == 4
+    quiet.lease_browser()                 # a free slot, under its share of 2
+    assert gov.fair_browsers("busy") == 2
+
+    busy_waiting = _in_thread(busy.lease_browser)
+    quiet_waiting = _in_thread(quiet.lease_browser)
+    time.sleep(0.1)
+    assert busy_waiting.is_alive() and quiet_waiting.is_alive()
+    busy.release_browser()                # goes to the tab under its fair share
+    quiet_waiting.join(2)
+    assert not quiet_waiting.is_alive()
+    assert busy_waiting.is_alive()
+    quiet.release_browser()
+    busy_waiting.join(2)
+    assert not busy_waiting.is_alive()
+    assert gov.snapshot()["tabs"]["busy"]["browsers"] == 3
+
+
+def test_leaving_drops_the_tab_once_its_browsers_are_back():
+    gov = Governor(rate=None)
+    share = gov.join("trader")
+    share.lease_browser()
+    share.leave()
+    assert "trader" in gov.snapshot()["tabs"]
+    share.release_browser()
+    assert gov.snapshot()["tabs"] == {}
+
+
+@pytest.fixture
+def fresh_governor(monkeypatch):
+    monkeypatch.setattr(governor, "_governor", None)
+
+
+def test_configure_governor_replaces_the_shared_one(fresh_governor):
+    first = governor.get_governor()
+    assert first is governor.get_governor()
+    second = governor.configure_governor(rate=5.0, max_browsers=2)
+    assert second is governor.get_governor() is not first
+    assert (second.rate, second.max_browsers) == (5.0, 2)
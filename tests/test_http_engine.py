@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+import scraper
+from http_engine import (RETRY_STATUSES, ChallengeError, FetchError, HttpEngine, is_challenge,
+                         parse_game_price, parse_search_results)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class _Session:
+    def __init__(self, status, html):
+        self.status, self.html = status, html
+
+    def get(self, path):
+        return self.status, self.html
+
+
+def test_normal_pages_loading_the_challenge_script_are_not_challenges():
+    assert not is_challenge(200, _fixture("search_results.html"))
+    assert not is_challenge(200, _fixture("game_page.html"))
+
+
+def test_interstitial_is_a_challenge():
+    page = _fixture("challenge.html")
+    assert is_challenge(200, page)
+    assert is_challenge(503, page)
+
+
+def test_challenge_status_codes():
+    assert is_challenge(403, "")
+    # Rate limits and overload go to the RetryScheduler, not the browser
+    assert not is_challenge(429, "")
+    assert not is_challenge(503, "<html><body>Service Unavailable</body></html>")
+
+
+@pytest.mark.parametrize("status", RETRY_STATUSES)
+def test_rate_limit_statuses_raise_fetch_errors(status):
+    engine = HttpEngine("http://localhost:8765", session=_Session(status, "Too busy"))
+    with pytest.raises(FetchError) as search_error:
+        engine.search("Celeste")
+    with pytest.raises(FetchError) as page_error:
+        engine.game_price("http://localhost:8765/game/celeste/")
+    assert search_error.value.status == page_error.value.status == status
+    assert scraper._outcome(search_error.value) == "timeout"
+
+
+def test_challenge_pages_raise_challenge_errors():
+    engine = HttpEngine("http://localhost:8765", session=_Session(503, _fixture("challenge.html")))
+    with pytest.raises(ChallengeError):
+        engine.search("Celeste")
+
+
+def test_parse_search_results():
+    results = parse_search_results(_fixture("search_results.html"))
+    assert results == [
+        ("Hollow Knight", "$7.49", "https://gg.deals/game/hollow-knight/"),
+        ("Hollow Knight: Silksong", "$19.99", "https://gg.deals/game/hollow-knight-silksong/"),
+        ("Hollow Knight - Official Soundtrack", None,
+         "https://gg.deals/dlc/hollow-knight-official-soundtrack/"),
+    ]
+
+
+def test_parse_search_results_fallback_links():
+    page = ('<html><body><a class="full-link" aria-label="Go to: Celeste" href="/game/celeste/"></a>'
+            '<span class="price">$4.99</span></body></html>')
+    assert parse_search_results(page, base_url="http://localhost:8765") == [
+        ("Celeste", "$4.99", "http://localhost:8765/game/celeste/"),
+    ]
+
+
+def test_parse_search_results_game_list_rows():
+    page = ('<html><body><div class="game-list-results"><div>'
+            '<a class="full-link" aria-label="Go to: Celeste" href="/game/celeste/"></a>'
+            '<div class="price-wrap"><span class="price">$4.99</span></div></div>'
+            '<div><span class="game-info-title">Celeste Farewell</span>'
+            '<span class="price">$0.99</span></div></div>'
+            '<div class="list-items"><div><a class="full-link" aria-label="Go to: Hades" '
+            'href="/game/hades/"></a></div></div>'
+            '<span class="price">$9.99</span></body></html>')
+    assert parse_search_results(page, base_url="http://localhost:8765") == [
+        ("Celeste", "$4.99", "http://localhost:8765/game/celeste/"),
+        ("Celeste Farewell", "$0.99", None),
+        ("Hades", None, "http://localhost:8765/game/hades/"),
+    ]
+
+
+def test_boxes_win_over_game_list_rows():
+    page = ('<div class="game-list"><div class="hoverable-box">'
+            '<a class="full-link" aria-label="Go to: Celeste" href="/game/celeste/"></a>'
+            '<span class="price">$4.99</span></div></div>')
+    assert parse_search_results(page, base_url="http://localhost:8765") == [
+        ("Celeste", "$4.99", "http://localhost:8765/game/celeste/"),
+    ]
+
+
+def test_parse_game_price_reads_the_header_box():
+    assert parse_game_price(_fixture("game_page.html")) == "$7.49"
+    assert parse_game_price(_fixture("search_results.html")) is None
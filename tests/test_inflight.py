@@ -0,0 +1,114 @@
+import threading
+import time
+
+from inflight import SingleFlight
+
+
+def _wait_for_followers(flight, key, n):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call.followers >= n:
+                return
+        time.sleep(0.01)
+    raise AssertionError("followers never joined")
+
+
+def _run_followers(flight, key, n, fn, accept, results):
+    threads = [threading.Thread(target=lambda: results.append(flight.do(key, fn, accept)))
+               for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def test_followers_share_the_leader_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return "price"
+
+    results = []
+    threads = _run_followers(flight, "celeste", 1, fn, None, results)
+    _wait_for_followers(flight, "celeste", 0)
+    threads += _run_followers(flight, "celeste", 3, fn, None, results)
+    _wait_for_followers(flight, "celeste", 3)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [("price", False)] + [("price", True)] * 3
+    assert flight.snapshot() == {"leaders": 1, "shared": 3, "rejected": 0, "in_flight": 0}
+
+
+def test_rejecting_followers_elect_one_new_leader():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def first():
+        calls.append("first")
+        release.wait(5)
+        return "unsure"
+
+    def retry():
+        calls.append("retry")
+        time.sleep(0.3)
+        return "confident"
+
+    results = []
+    threads = _run_followers(flight, "hades", 1, first, None, results)
+    _wait_for_followers(flight, "hades", 0)
+    threads += _run_followers(flight, "hades", 3, retry, lambda v: v != "unsure", results)
+    _wait_for_followers(flight, "hades", 3)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == ["first", "retry"]
+    assert sorted(results) == [("confident", False), ("confident", True), ("confident", True),
+                               ("unsure", False)]
+    assert flight.snapshot()["leaders"] == 2
+
+
+def test_followers_retry_after_the_leader_raises():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def broken():
+        calls.append("broken")
+        release.wait(5)
+        raise RuntimeError("page load failed")
+
+    def works():
+        calls.append("works")
+        time.sleep(0.3)
+        return "price"
+
+    errors, results = [], []
+
+    def lead():
+        try:
+            flight.do("doom", broken)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lead)]
+    threads[0].start()
+    _wait_for_followers(flight, "doom", 0)
+    threads += _run_followers(flight, "doom", 2, works, None, results)
+    _wait_for_followers(flight, "doom", 2)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(errors) == 1
+    assert calls == ["broken", "works"]
+    assert sorted(results) == [("price", False), ("price", True)]
@@ -0,0 +1,84 @@
+import os
+import threading
+
+import pytest
+
+import checkpoint
+from jobs import JobScheduler
+
+
+def _job_files(tmp_path, job_id):
+    results = str(tmp_path / f"{job_id}_results.json")
+    files = [str(tmp_path / f"{job_id}_progress.json")] + checkpoint.run_files(results)
+    for path in files:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{}")
+    return files
+
+
+def _run(scheduler, tmp_path, job_id, **kwargs):
+    job = scheduler.submit(job_id, job_id=job_id, store=_job_files(tmp_path, job_id), **kwargs)
+    if job.thread is not None:
+        job.thread.join(5)
+    return job
+
+
+def test_pruned_jobs_have_their_files_deleted(tmp_path):
+    pruned = []
+
+    def on_prune(job):
+        pruned.append(job.id)
+        checkpoint.remove_files(job.store)
+
+    scheduler = JobScheduler(lambda job: "completed", budget=2, max_finished=1, on_prune=on_prune)
+    first = _run(scheduler, tmp_path, "first")
+    second = _run(scheduler, tmp_path, "second")
+    assert pruned == []
+    _run(scheduler, tmp_path, "third")
+
+    assert pruned == ["first"]
+    assert not any(os.path.exists(path) for path in first.store)
+    assert all(os.path.exists(path) for path in second.store)
+    assert scheduler.get("first") is None
+
+
+def test_active_jobs_are_never_pruned(tmp_path):
+    release = threading.Event()
+    pruned = []
+    scheduler = JobScheduler(lambda job: release.wait(5) and "completed", budget=1, max_finished=0,
+                             on_prune=lambda job: pruned.append(job.id))
+    running = scheduler.submit("running", store=_job_files(tmp_path, "running"))
+    queued = scheduler.submit("queued", store=_job_files(tmp_path, "queued"))
+    assert pruned == []
+    release.set()
+    running.thread.join(5)
+    queued.thread.join(5)
+    scheduler.submit("next", store=_job_files(tmp_path, "next")).thread.join(5)
+    assert sorted(pruned) == sorted([running.id, queued.id])
+
+
+def test_a_failing_cleanup_does_not_break_submit(tmp_path):
+    def on_prune(job):
+        raise OSError("disk gone")
+
+    scheduler = JobScheduler(lambda job: "completed", max_finished=0, on_prune=on_prune)
+    _run(scheduler, tmp_path, "first")
+    assert _run(scheduler, tmp_path, "second").status == "completed"
+
+
+def test_app_deletes_pruned_job_files_but_not_tab_files(tmp_path):
+    pytest.importorskip("flask")
+    import app
+
+    store = app._new_store("job", str(tmp_path / "job_results.json"), str(tmp_path / "job_progress.json"))
+    files = [store["progress_file"]] + checkpoint.run_files(store["results_file"])
+    for path in files:
+        open(path, "w").close()
+    app._drop_job_files(type("Job", (), {"store": store})())
+    assert not any(os.path.exists(path) for path in files)
+
+    tab = app.TABS["trader"]
+    tab_files = [tab["progress_file"]] + checkpoint.run_files(tab["results_file"])
+    before = [os.path.exists(path) for path in tab_files]
+    app._drop_job_files(type("Job", (), {"store": tab})())
+    assert [os.path.exists(path) for path in tab_files] == before
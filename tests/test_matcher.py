@@ -0,0 +1,101 @@
+import itertools
+import re
+from difflib import SequenceMatcher
+
+import pytest
+
+import matcher
+import scraper
+
+KERNELS = ["lcs", pytest.param("rapidfuzz", marks=pytest.mark.skipif(
+    matcher._Indel is None, reason="rapidfuzz is not installed"))]
+
+TITLES = [
+    "", "   ", "PC", "2", "—",
+    "Pokémon Legends: Arceus", "Pokemon Legends Arceus", "Ōkami HD", "Café Owner Simulator",
+    "ニーア オートマタ", "NieR:Automata", "NieR: Automata - Game of the YoRHa Edition",
+    "Final Fantasy VII", "Final Fantasy VIII", "FINAL FANTASY VII REMAKE", "Final Fantasy 7",
+    "Grand Theft Auto V", "Grand Theft Auto IV", "Grand Theft Auto V: Premium Edition",
+    "The Witcher 3: Wild Hunt", "The Witcher 3: Wild Hunt - Game of the Year Edition",
+    "Tom Clancy's Rainbow Six® Siege", "Tom Clancys Rainbow Six Siege Deluxe Edition",
+    "Resident Evil 2", "Resident Evil 2 (2019)", "Resident Evil 4", "XCOM® 2", "XCOM 2 PS4",
+    "Portal", "Portal 2", "DOOM (1993)", "DOOM Eternal", "Half-Life: Alyx", "Half Life Alyx",
+    "Street Fighter 6 - Deluxe Edition PS5", "Halo: The Master Chief Collection (PC)",
+]
+
+
+def legacy_normalize(name):
+    """normalize_name as it was before matcher.py."""
+    s = name.lower()
+    s = re.sub(r'\b(ps[345]|xbox|switch|pc|mac|linux)\b', '', s)
+    s = re.sub(r'[^\w\s]', ' ', s)
+    s = re.sub(r'\s+', ' ', s).strip()
+    return s
+
+
+def legacy_similarity(search_name, result_name):
+    """name_similarity as it was before matcher.py."""
+    a = legacy_normalize(search_name)
+    b = legacy_normalize(result_name)
+    if a == b:
+        return 1.0
+    if a in b or b in a:
+        return max(0.85, SequenceMatcher(None, a, b).ratio())
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def legacy_best(query, page):
+    """The old result loop: skip unnamed items, keep the first top score, stop at 0.95."""
+    best_i, best_score = None, 0.0
+    for i, name in enumerate(page):
+        if not name:
+            continue
+        score = legacy_similarity(query, name)
+        if score > best_score:
+            best_i, best_score = i, score
+        if score >= 0.95:
+            break
+    return best_i, best_score
+
+
+def lcs_length(a, b):
+    prev = [0] * (len(b) + 1)
+    for ch in a:
+        row = [0]
+        for j, other in enumerate(b):
+            row.append(prev[j] + 1 if ch == other else max(prev[j + 1], row[j]))
+        prev = row
+    return prev[-1]
+
+
+PAIRS = list(itertools.product(TITLES, repeat=2))
+
+
+@pytest.mark.parametrize("search,result", PAIRS)
+def test_scores_match_legacy_name_similarity(search, result):
+    expected = legacy_similarity(search, result)
+    assert matcher.similarity(search, result) == expected
+    assert scraper.name_similarity(search, result) == expected
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_lcs_bound_is_exact_and_never_below_the_score(kernel):
+    for search in TITLES:
+        query = matcher.Query(search, kernel=kernel)
+        for result in TITLES:
+            b = matcher.normalize(result)
+            total = len(query.norm) + len(b)
+            expected = 2.0 * lcs_length(query.norm, b) / total if total else 1.0
+            assert query.lcs_ratio(b) == pytest.approx(expected)
+            ratio = SequenceMatcher(None, query.norm, b).ratio()
+            assert query.lcs_ratio(b) >= ratio - 1e-12
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("search", TITLES)
+def test_best_picks_what_the_legacy_loop_picked(kernel, search):
+    query = matcher.Query(search, kernel=kernel)
+    # Rotations put the right answer early, late, or after a near miss
+    for start in range(0, len(TITLES), 4):
+        page = (TITLES[start:] + TITLES[:start])[:8]
+        assert query.best(page) == legacy_best(search, page)
@@ -0,0 +1,41 @@
+import pytest
+
+import metrics
+
+
+def test_scraper_counters_are_registered_with_help_text():
+    text = metrics.prometheus_text()
+    for name in ("bytes_transferred_total", "coalesced_total"):
+        assert name in metrics.COUNTERS
+        assert f"# HELP ggdeals_{name} {metrics.COUNTERS[name]}" in text
+        assert f"# TYPE ggdeals_{name} counter" in text
+
+
+def _histogram(samples):
+    hist = metrics.Histogram()
+    for seconds in samples:
+        hist.observe(seconds)
+    return hist
+
+
+def test_quantiles_are_not_bucket_upper_bounds():
+    summary = _histogram([0.00001] * 100).summary()
+    assert summary["mean_ms"] == summary["p50_ms"] == summary["p95_ms"] == 0.01
+
+
+def test_quantiles_interpolate_within_the_bucket():
+    summary = _histogram([i / 1000 for i in range(1, 101)]).summary()
+    assert summary["p50_ms"] == pytest.approx(50.0, abs=2.5)
+    assert summary["p95_ms"] == pytest.approx(95.0, abs=2.5)
+
+
+def test_quantiles_past_the_last_bucket_and_empty():
+    assert _histogram([40.0, 45.0]).quantile(0.95) <= 45.0
+    assert metrics.Histogram().summary()["p50_ms"] is None
+
+
+def test_merged_histograms_keep_their_range():
+    fast, slow = _histogram([0.0002] * 10), _histogram([0.2] * 10)
+    fast.merge(slow)
+    assert (fast.min, fast.max) == (0.0002, 0.2)
+    assert 0.0002 <= fast.quantile(0.5) <= fast.quantile(0.95) <= 0.2
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+import paths
+import price_cache
+import scraper
+
+
+def _fresh_default(monkeypatch, tmp_path):
+    monkeypatch.setattr(price_cache, "_default_cache", None)
+    monkeypatch.setattr(price_cache, "cache_file", lambda: str(tmp_path / "price_cache.db"))
+
+
+def test_cache_file_lives_in_the_scraper_data_dir():
+    assert scraper.BASE_DIR == paths.BASE_DIR
+    assert price_cache.cache_file() == os.path.join(paths.BASE_DIR, "price_cache.db")
+
+
+def test_cache_does_not_import_the_scraper():
+    code = "import sys, price_cache; price_cache.cache_file(); print('scraper' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=paths.BASE_DIR,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
+
+
+def test_hits_are_batched_but_still_count_for_eviction(monkeypatch, tmp_path):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(price_cache.time, "time", lambda: next(clock))
+    cache = price_cache.PriceCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.put("a", "A", "$1", None, 1.0)
+    cache.put("b", "B", "$1", None, 1.0)
+    assert cache.get("a") == ("A", "$1", None, 1.0)
+    assert cache._touched  # not written yet
+    cache.put("c", "C", "$1", None, 1.0)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    cache.close()
+
+
+def test_pending_hits_flush_at_the_batch_size(monkeypatch, tmp_path):
+    monkeypatch.setattr(price_cache, "TOUCH_BATCH", 2)
+    cache = price_cache.PriceCache(str(tmp_path / "cache.db"))
+    for name in ("a", "b"):
+        cache.put(name, name.upper(), "$1", None, 1.0)
+    cache.get("a")
+    assert len(cache._touched) == 1
+    cache.get("b")
+    assert not cache._touched
+    cache.close()
+
+
+def test_defaults_without_settings(monkeypatch, tmp_path):
+    _fresh_default(monkeypatch, tmp_path)
+    monkeypatch.delenv("GG_DEALS_CACHE_TTL", raising=False)
+    monkeypatch.delenv("GG_DEALS_CACHE_MAX_ENTRIES", raising=False)
+    cache = price_cache.get_cache()
+    assert (cache.ttl, cache.max_entries) == (price_cache.DEFAULT_TTL, price_cache.DEFAULT_MAX_ENTRIES)
+    assert cache.path == str(tmp_path / "price_cache.db")
+
+
+def test_environment_settings(monkeypatch, tmp_path):
+    _fresh_default(monkeypatch, tmp_path)
+    monkeypatch.setenv("GG_DEALS_CACHE_TTL", "0")
+    monkeypatch.setenv("GG_DEALS_CACHE_MAX_ENTRIES", "500")
+    cache = price_cache.get_cache()
+    assert cache.ttl is None
+    assert cache.max_entries == 500
+
+
+def test_bad_environment_value_falls_back(monkeypatch, tmp_path):
+    _fresh_default(monkeypatch, tmp_path)
+    monkeypatch.setenv("GG_DEALS_CACHE_TTL", "six hours")
+    assert price_cache.get_cache().ttl == price_cache.DEFAULT_TTL
+
+
+def test_configure_cache_overrides_and_evicts(monkeypatch, tmp_path):
+    _fresh_default(monkeypatch, tmp_path)
+    cache = price_cache.configure_cache(ttl=60, max_entries=2)
+    assert cache is price_cache.get_cache()
+    assert cache.ttl == 60
+    for name in ("a", "b", "c"):
+        cache.put(name, name.upper(), "$1", None, 1.0)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    price_cache.configure_cache(max_entries=0)
+    assert (cache.ttl, cache.max_entries) == (60, 0)
+
+
+def test_cli_cache_options():
+    import cli
+    opts = cli.parse_args(["--cache-ttl=3600", "--cache-max=100"])
+    assert (opts["cache_ttl"], opts["cache_max"]) == (3600, 100)
@@ -0,0 +1,56 @@
+import time
+
+from price_history import PriceHistory
+from scraper import normalize_name, plan_tasks
+
+DAY = 86400
+
+
+def _history(tmp_path):
+    return PriceHistory(str(tmp_path / "history.db"))
+
+
+def _result(name, value):
+    return {"search_name": name, "matched_name": name, "price": f"${value:.2f}",
+            "price_value": value, "url": None, "match_confidence": 1.0}
+
+
+def test_plan_budget_never_drops_titles_without_history(tmp_path):
+    history = _history(tmp_path)
+    now = time.time()
+    history.record(normalize_name("Known"), _result("Known", 10.0), at=now - 90 * DAY)
+    todo = list(enumerate(["Known", "New A", "New B", "New C"]))
+
+    refresh, served = history.plan(todo, normalize_name, budget=1, now=now)
+
+    refreshed = {idx for _, idx, _ in refresh}
+    assert refreshed | {idx for idx, _ in served} == {0, 1, 2, 3}
+    assert {1, 2, 3} <= refreshed
+
+
+def test_plan_budget_caps_titles_with_history(tmp_path):
+    history = _history(tmp_path)
+    now = time.time()
+    names = ["Old", "Older", "Oldest", "New"]
+    for age, name in zip((30, 60, 90), names):
+        history.record(normalize_name(name), _result(name, 10.0), at=now - age * DAY)
+    todo = list(enumerate(names))
+
+    refresh, served = history.plan(todo, normalize_name, budget=1, now=now)
+
+    assert [idx for _, idx, _ in refresh] == [3, 2]
+    assert sorted(idx for idx, _ in served) == [0, 1]
+    assert all("age_seconds" in result for _, result in served)
+
+
+def test_plan_tasks_accounts_for_every_title(tmp_path):
+    history = _history(tmp_path)
+    now = time.time()
+    history.record(normalize_name("Known"), _result("Known", 10.0), at=now - 90 * DAY)
+    todo = list(enumerate(["Known", "New A", "New B", "New C"]))
+
+    tasks, served = plan_tasks(todo, history, refresh="stale", budget=1)
+
+    queued = {idx for idx, _ in tasks.drain()}
+    assert queued | {idx for idx, _ in served} == {0, 1, 2, 3}
+    assert not queued & {idx for idx, _ in served}
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from results_index import ResultsIndex, _sort_value
+
+
+def _result(name, price_value=None, confidence=1.0):
+    return {"search_name": name, "matched_name": name,
+            "price": None if price_value is None else f"${price_value:.2f}",
+            "price_value": price_value, "url": None, "match_confidence": confidence}
+
+
+def test_all_results_carry_their_idx(tmp_path):
+    index = ResultsIndex(str(tmp_path / "tab_results.json"))
+    # A resumed run reports rows out of order and with gaps
+    index.apply([{"idx": 5, "result": _result("Hades", 9.99)},
+                 {"idx": 2, "result": _result("Celeste", 4.99)}])
+    rows = index.all_results()
+    assert [(r["idx"], r["search_name"]) for r in rows] == [(2, "Celeste"), (5, "Hades")]
+
+
+def _brute_order(index, sort, direction):
+    rows = sorted(index._rows.values(), key=lambda r: (_sort_value(r, sort), r.idx))
+    if direction == "desc":
+        rows.reverse()
+    return [r.idx for r in rows]
+
+
+def _brute_stats(index):
+    results = [r.result for r in index._rows.values()]
+    priced = [r["price_value"] for r in results if r["price_value"] is not None and r["price_value"] > 0]
+    return {"total": len(results), "found": sum(1 for r in results if r["price"] is not None),
+            "avg": round(sum(priced) / len(priced), 2) if priced else 0.0,
+            "high": max(priced) if priced else 0.0}
+
+
+def test_orders_and_stats_stay_correct_as_rows_change(tmp_path):
+    rng = random.Random(7)
+    index = ResultsIndex(str(tmp_path / "tab_results.json"))
+    names = [f"Game {n:03d}" for n in range(60)]
+    for step in range(300):
+        if step % 25 == 24:
+            index.remove(rng.choice(names))
+        else:
+            batch = []
+            for _ in range(rng.randint(1, 4)):
+                idx = rng.randrange(60)
+                value = rng.choice([None, 0.0, round(rng.uniform(0.5, 60), 2), 19.99])
+                batch.append({"idx": idx, "result": _result(names[idx], value, rng.choice([0.5, 0.9, 1.0]))})
+            index.apply(batch)
+        sort = rng.choice(["idx", "name", "price", "confidence"])
+        direction = rng.choice(["asc", "desc"])
+        expected = _brute_order(index, sort, direction)
+        page = index.query(limit=0, sort=sort, direction=direction)
+        assert [r["idx"] for r in page["rows"]] == expected
+        stats, brute = page["stats"], _brute_stats(index)
+        # avg comes from a running sum: float drift may flip the last rounded cent
+        assert stats["avg"] == pytest.approx(brute.pop("avg"), abs=0.011)
+        assert dict(stats, avg=None) == dict(brute, avg=None)
+        offset, limit = rng.randrange(70), rng.randrange(1, 20)
+        page = index.query(offset=offset, limit=limit, sort=sort, direction=direction)
+        assert [r["idx"] for r in page["rows"]] == expected[offset:offset + limit]
+        assert page["total"] == len(expected)
+        assert page["value"] == pytest.approx(sum(r["price_value"] for r in index.all_results()
+                                          if r["price_value"] is not None and r["price_value"] > 0), abs=0.011)
+        found = index.query(offset=1, limit=limit, show="found", sort=sort, direction=direction)
+        priced = [i for i in expected if index._rows[i].result["price"] is not None]
+        assert [r["idx"] for r in found["rows"]] == priced[1:1 + limit]
@@ -0,0 +1,58 @@
+import json
+
+import checkpoint
+from results_index import ResultsIndex
+from results_log import ResultsLog, delete_results, load_results, log_path
+
+
+def _result(name, price="$1.00"):
+    return {"search_name": name, "matched_name": name, "price": price, "price_value": 1.0,
+            "url": None, "match_confidence": 1.0}
+
+
+def _stopped_run(tmp_path, games, finished):
+    """A stopped run: manifest, the JSON written at stop time and the log kept for resume."""
+    out = str(tmp_path / "tab_results.json")
+    run = checkpoint.new_run(out, games)
+    log = ResultsLog(log_path(out), fsync="never")
+    for idx in finished:
+        log.append(idx, _result(games[idx]))
+    log.close()
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump([_result(games[i]) for i in finished], f)
+    checkpoint.mark_run(out, run, "stopped")
+    return out
+
+
+def test_deleted_row_stays_gone_after_reload_and_resume(tmp_path):
+    games = ["Celeste", "Hades", "Frostpunk", "Terraria"]
+    out = _stopped_run(tmp_path, games, finished=[0, 1, 2])
+
+    assert delete_results(out, "Hades") == 2
+
+    assert [r["search_name"] for r in load_results(out)] == ["Celeste", "Frostpunk"]
+    index = ResultsIndex(out)
+    index.refresh()
+    assert [r["search_name"] for r in index.all_results()] == ["Celeste", "Frostpunk"]
+
+    led = checkpoint.ledger(out)
+    assert sorted(led["done"]) == [0, 2]
+    assert led["pending"] == [3]            # resuming must not scrape "Hades" again
+    assert led["deleted"] == {1}
+    assert checkpoint.summary(out)["done"] == 3
+
+
+def test_resume_skips_deleted_rows(tmp_path):
+    import scraper
+
+    games = ["Celeste", "Hades", "Frostpunk"]
+    out = _stopped_run(tmp_path, games, finished=[0, 1])
+    delete_results(out, "Hades")
+    run, results_dict, todo, log = scraper.prepare_run(output_file=out, resume=True)
+    log.close()
+    assert sorted(results_dict) == [0]
+    assert todo == [(2, "Frostpunk")]
+
+
+def test_delete_without_any_results(tmp_path):
+    assert delete_results(str(tmp_path / "none_results.json"), "Hades") is None
@@ -0,0 +1,78 @@
+import time
+from queue import Queue
+
+import pytest
+
+from retry import RetryScheduler
+
+
+def test_backoff_doubles_up_to_the_cap():
+    retries = RetryScheduler(base_delay=2.0, max_delay=10.0, jitter=0.0)
+    assert [retries.delay(n) for n in (1, 2, 3, 4, 5)] == [2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+def test_jitter_stays_within_its_band():
+    retries = RetryScheduler(base_delay=4.0, jitter=0.5)
+    delays = [retries.delay(1) for _ in range(200)]
+    assert all(2.0 <= d <= 6.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_failed_schedules_until_out_of_attempts_then_dead_letters():
+    dead = []
+    retries = RetryScheduler(max_attempts=3, base_delay=1.0, jitter=0.0, on_dead=dead.append)
+    info = {"error": "Timed out", "error_type": "TimeoutException"}
+    assert retries.attempt(7) == 1
+    assert retries.failed(7, "Hades", info) == 1.0
+    assert retries.attempt(7) == 2
+    assert retries.failed(7, "Hades", info) == 2.0
+    assert retries.pending() == 2
+    assert retries.failed(7, "Hades", info) is None
+    assert retries.pending() == 2  # giving up schedules nothing
+    assert retries.dead == dead
+    entry = dead[0]
+    assert (entry["idx"], entry["game"], entry["attempts"]) == (7, "Hades", 3)
+    assert (entry["error"], entry["error_type"]) == ("Timed out", "TimeoutException")
+
+
+def test_single_attempt_dead_letters_at_once():
+    retries = RetryScheduler(max_attempts=1)
+    assert retries.failed(0, "Hades", {"error": "boom"}) is None
+    assert retries.pending() == 0 and len(retries.dead) == 1
+
+
+def test_retries_come_due_in_backoff_order():
+    retries = RetryScheduler(base_delay=0.05, jitter=0.0)
+    retries.failed(1, "Slow", {})
+    time.sleep(0.06)
+    assert retries.pop_due() == (1, "Slow")
+    retries.failed(1, "Slow", {})    # second failure: 0.1 s
+    retries.failed(2, "Quick", {})   # first failure: 0.05 s
+    assert retries.pop_due() is None
+    assert 0.0 < retries.wait_time() <= 0.05
+    time.sleep(0.12)
+    assert [retries.pop_due(), retries.pop_due(), retries.pop_due()] == [(2, "Quick"), (1, "Slow"), None]
+    assert retries.wait_time() is None
+
+
+def test_next_prefers_due_retries_and_waits_for_scheduled_ones():
+    retries = RetryScheduler(base_delay=0.05, jitter=0.0)
+    tasks = Queue()
+    tasks.put((5, "Celeste"))
+    retries.failed(1, "Hades", {})
+    started = time.monotonic()
+    assert retries.next(tasks, lambda: False) == (5, "Celeste")
+    assert retries.next(tasks, lambda: False) == (1, "Hades")
+    assert time.monotonic() - started >= 0.04
+    assert retries.next(tasks, lambda: False) is None
+
+
+def test_next_returns_none_once_stopped():
+    retries = RetryScheduler(base_delay=30.0, jitter=0.0)
+    retries.failed(1, "Hades", {})
+    assert retries.next(Queue(), lambda: True) is None
+
+
+@pytest.mark.parametrize("max_attempts", [0, -2])
+def test_at_least_one_attempt(max_attempts):
+    assert RetryScheduler(max_attempts=max_attempts).max_attempts == 1
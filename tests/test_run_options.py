@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+import async_engine
+import checkpoint
+import scraper
+from results_log import ResultsLog, log_path
+
+BAD_OPTIONS = [
+    {"engine": "htpp"},
+    {"extract": "xpath"},
+    {"speculate": "maybe"},
+    {"profile": "tiny"},
+    {"refresh": "stale-ish"},
+    {"refresh": "stale", "use_cache": False},
+    {"fsync": "sometimes"},
+]
+
+
+def _stopped_run(tmp_path):
+    out = str(tmp_path / "tab_results.json")
+    run = checkpoint.new_run(out, ["Celeste", "Hades"])
+    log = ResultsLog(log_path(out), fsync="never")
+    log.append(0, {"search_name": "Celeste", "price": "$4.99"})
+    log.close()
+    checkpoint.mark_run(out, run, "stopped")
+    return out
+
+
+def _snapshot(out):
+    with open(checkpoint.manifest_path(out), encoding="utf-8") as f:
+        manifest = json.load(f)
+    with open(log_path(out), encoding="utf-8") as f:
+        return manifest, f.read()
+
+
+@pytest.mark.parametrize("entry", [scraper.scrape_prices, async_engine.scrape_prices],
+                         ids=["threads", "async"])
+@pytest.mark.parametrize("options", BAD_OPTIONS, ids=lambda o: ",".join(f"{k}={v}" for k, v in o.items()))
+def test_bad_options_leave_a_resumable_run_alone(tmp_path, entry, options):
+    out = _stopped_run(tmp_path)
+    before = _snapshot(out)
+    kwargs = dict({"use_cache": False}, **options)
+    with pytest.raises(ValueError):
+        entry(games_list=["Terraria"], output_file=out, progress_file=False, **kwargs)
+    assert _snapshot(out) == before
+    assert checkpoint.summary(out)["resumable"]
@@ -0,0 +1,64 @@
+import pytest
+
+import scraper
+from retry import RetryScheduler
+
+
+class Browsers:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.leased = self.released = 0
+
+    def lease(self):
+        self.leased += 1
+        return "driver"
+
+    def release(self, driver, info):
+        self.released += 1
+        return self.alive
+
+
+def _lookup(monkeypatch, error=None, browser=True):
+    def lookup_game(game_name, get_driver, **kwargs):
+        if browser:
+            get_driver()
+            get_driver()
+        info = {"error": error} if error else {}
+        return {"search_name": game_name, "price": None if error else "$1"}, info
+
+    monkeypatch.setattr(scraper, "lookup_game", lookup_game)
+
+
+@pytest.mark.parametrize("browser", [True, False])
+def test_browser_is_leased_once_and_only_when_needed(monkeypatch, browser):
+    _lookup(monkeypatch, browser=browser)
+    browsers = Browsers()
+    result, info = scraper.process_game(0, "Hades", browsers.lease, browsers.release)
+    assert result["price"] == "$1"
+    assert browsers.leased == browsers.released == (1 if browser else 0)
+
+
+def test_dead_driver_is_counted(monkeypatch):
+    _lookup(monkeypatch, error="crashed")
+    browsers, stats = Browsers(alive=False), {}
+    scraper.process_game(0, "Hades", browsers.lease, browsers.release, stats=stats)
+    assert stats["drivers_replaced"] == 1
+
+
+def test_failures_are_requeued_until_out_of_attempts(monkeypatch):
+    _lookup(monkeypatch, error="timeout")
+    browsers, stats = Browsers(), {}
+    retries = RetryScheduler(max_attempts=2, base_delay=0.0)
+    assert scraper.process_game(3, "Hades", browsers.lease, browsers.release,
+                                retries=retries, stats=stats) is None
+    result, info = scraper.process_game(3, "Hades", browsers.lease, browsers.release,
+                                        retries=retries, stats=stats)
+    assert info["error"] == "timeout"
+    assert (stats["retries"], stats["dead_letters"]) == (1, 1)
+
+
+def test_without_retries_a_failure_is_returned(monkeypatch):
+    _lookup(monkeypatch, error="timeout")
+    browsers = Browsers()
+    result, info = scraper.process_game(0, "Hades", browsers.lease, browsers.release)
+    assert info["error"] == "timeout"
@@ -0,0 +1,179 @@
+"""Local index of gg.deals titles seen in past lookups.
+
+Every confident match is remembered as a title (normalized matched name ->
+name, game page URL) plus aliases: the normalized search name and its
+simplified retry query.  A later lookup of any alias resolves straight to
+the known game page without a search.  Titles also feed a trigram inverted
+index used for autocomplete (``suggest``).
+
+Entries live in price_cache.db next to the price cache and never expire
+(game slugs are stable); on first use the index is seeded from the cache.
+"""
+import sqlite3
+import threading
+
+from matcher import Query, normalize, simplify_query
+from price_cache import cache_file
+
+# Below this a match is kept as a title, but the search name is not trusted as an alias
+ALIAS_MIN_CONFIDENCE = 0.85
+
+
+class Title:
+    __slots__ = ("key", "name", "url", "confidence", "direct")
+
+    def __init__(self, key, name, url, confidence=1.0, direct=None):
+        self.key = key
+        self.name = name
+        self.url = url
+        self.confidence = confidence
+        self.direct = direct  # None = untried, True/False = game page parse worked
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or cache_file(), check_same_thread=False)
+        self._titles = {}    # key -> Title
+        self._aliases = {}   # alias key -> (title key, confidence)
+        self._grams = {}     # trigram -> set of title keys
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS titles ("
+                " key TEXT PRIMARY KEY, name TEXT NOT NULL, url TEXT NOT NULL, direct INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS aliases ("
+                " alias TEXT PRIMARY KEY, key TEXT NOT NULL, confidence REAL NOT NULL)"
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self):
+        rows = self._conn.execute("SELECT key, name, url, direct FROM titles").fetchall()
+        if not rows:
+            self._seed_from_cache()
+            rows = self._conn.execute("SELECT key, name, url, direct FROM titles").fetchall()
+        for key, name, url, direct in rows:
+            self._index(Title(key, name, url, direct=None if direct is None else bool(direct)))
+        for alias, key, confidence in self._conn.execute("SELECT alias, key, confidence FROM aliases"):
+            if key in self._titles:
+                self._aliases[alias] = (key, confidence)
+
+    def _seed_from_cache(self):
+        """Import matches from the price cache (its keys are normalized search names)."""
+        try:
+            rows = self._conn.execute(
+                "SELECT key, matched_name, url, confidence FROM prices"
+                " WHERE matched_name IS NOT NULL AND url IS NOT NULL"
+            ).fetchall()
+        except sqlite3.OperationalError:  # no cache table yet
+            return
+        for search_key, name, url, confidence in rows:
+            self._store(search_key, name, url, confidence or 0.0)
+        self._conn.commit()
+
+    def _index(self, title):
+        self._titles[title.key] = title
+        for gram in _trigrams(title.key):
+            self._grams.setdefault(gram, set()).add(title.key)
+
+    def _store(self, search_key, name, url, confidence):
+        """Upsert a title and its aliases (caller holds the lock and commits)."""
+        key = normalize(name)
+        if not key:
+            return None
+        title = self._titles.get(key)
+        if title is None or title.url != url:
+            title = Title(key, name, url)
+            self._index(title)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO titles (key, name, url, direct) VALUES (?, ?, ?, NULL)",
+                (key, name, url),
+            )
+        aliases = {key: 1.0}
+        if confidence >= ALIAS_MIN_CONFIDENCE and search_key:
+            aliases[search_key] = confidence
+        for alias, conf in aliases.items():
+            if self._aliases.get(alias, (None, -1.0))[1] <= conf:
+                self._aliases[alias] = (key, conf)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO aliases (alias, key, confidence) VALUES (?, ?, ?)",
+                    (alias, key, conf),
+                )
+        return title
+
+    def add(self, search_name, matched_name, url, confidence):
+        """Remember a lookup result; the search name and its simplified form become aliases."""
+        if not matched_name or not url:
+            return
+        with self._lock:
+            self._store(normalize(search_name), matched_name, url, confidence)
+            simplified = normalize(simplify_query(search_name))
+            self._store(simplified, matched_name, url, confidence)
+            self._conn.commit()
+
+    def resolve(self, game_name):
+        """Return the known Title for a search name (or its simplified form), else None."""
+        with self._lock:
+            for alias in (normalize(game_name), normalize(simplify_query(game_name))):
+                hit = self._aliases.get(alias)
+                if hit is not None:
+                    t = self._titles[hit[0]]
+                    return Title(t.key, t.name, t.url, hit[1], t.direct)
+        return None
+
+    def mark_direct(self, key, ok):
+        """Record whether the game page of a title could be parsed directly."""
+        with self._lock:
+            title = self._titles.get(key)
+            if title is None or title.direct == ok:
+                return
+            title.direct = ok
+            self._conn.execute("UPDATE titles SET direct = ? WHERE key = ?", (int(ok), key))
+            self._conn.commit()
+
+    def suggest(self, q, limit=10):
+        """Autocomplete: known titles ranked by trigram overlap, then similarity."""
+        key = normalize(q)
+        if not key:
+            return []
+        with self._lock:
+            counts = {}
+            for gram in _trigrams(key):
+                for k in self._grams.get(gram, ()):
+                    counts[k] = counts.get(k, 0) + 1
+            shortlist = sorted(counts, key=counts.get, reverse=True)[: limit * 5]
+            titles = [self._titles[k] for k in shortlist]
+        query = Query(q)
+        ranked = sorted(
+            titles,
+            key=lambda t: (not t.key.startswith(key), -query.score(t.name), t.name),
+        )
+        return [{"name": t.name, "url": t.url} for t in ranked[:limit]]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._titles)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide title index shared by all tabs."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = TitleIndex()
+        return _default_index